@@ -8,15 +8,19 @@ REST API для интеграции StudioCore с внешними систем
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import json
 import os
 import logging
 import time
 from collections import defaultdict
-from typing import Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from fastapi import FastAPI, HTTPException, Depends, status, Request
 from fastapi.security import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
 from studiocore.core_v6 import StudioCoreV6
@@ -53,6 +57,200 @@ app.add_middleware(
 # Инициализация ядра
 core = StudioCoreV6()
 
+# Пул анализа: core.analyze синхронный и тяжёлый, поэтому выполняется вне event loop,
+# чтобы один долгий анализ не блокировал остальные запросы (включая /health).
+ANALYSIS_BACKEND = os.getenv("ANALYSIS_BACKEND", "thread").strip().lower()  # thread | process
+ANALYSIS_WORKERS = max(1, int(os.getenv("ANALYSIS_WORKERS", min(4, os.cpu_count() or 1))))
+ANALYSIS_MAX_CONCURRENCY = max(1, int(os.getenv("ANALYSIS_MAX_CONCURRENCY", ANALYSIS_WORKERS)))
+ANALYSIS_TIMEOUT = float(os.getenv("ANALYSIS_TIMEOUT", 60))  # seconds
+ANALYSIS_BATCH_MAX_ITEMS = max(1, int(os.getenv("ANALYSIS_BATCH_MAX_ITEMS", 500)))
+ANALYSIS_BATCH_TIMEOUT = float(os.getenv("ANALYSIS_BATCH_TIMEOUT", ANALYSIS_TIMEOUT * 10))  # seconds
+# Потоковый батч на process-бэкенде уходит в рабочий процесс частями по столько текстов
+ANALYSIS_STREAM_CHUNK = max(1, int(os.getenv("ANALYSIS_STREAM_CHUNK", ANALYSIS_WORKERS)))
+
+_worker_core: Optional[StudioCoreV6] = None
+
+
+def _init_analysis_worker() -> None:
+    """Process-pool initializer: one StudioCoreV6 per worker process."""
+    global _worker_core
+    _worker_core = StudioCoreV6()
+
+
+def _analyze_in_worker(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    if _worker_core is None:
+        _init_analysis_worker()
+    return _worker_core.analyze(**kwargs)
+
+
+def _analyze_batch_in_worker(texts: List[str], kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if _worker_core is None:
+        _init_analysis_worker()
+    return list(_worker_core.analyze_many(texts, **kwargs))
+
+
+def _create_analysis_pool() -> Executor:
+    if ANALYSIS_BACKEND == "process":
+        return ProcessPoolExecutor(max_workers=ANALYSIS_WORKERS, initializer=_init_analysis_worker)
+    return ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS, thread_name_prefix="studiocore-api")
+
+
+_analysis_pool = _create_analysis_pool()
+# Ограничение одновременных анализов; слот освобождается, когда анализ реально завершился
+_analysis_slots = asyncio.Semaphore(ANALYSIS_MAX_CONCURRENCY)
+
+
+async def _run_in_pool(fn: Callable[..., Any], *args: Any, timeout: float) -> Any:
+    """
+    Run ``fn(*args)`` in the analysis pool under the concurrency limit and a timeout.
+
+    ``timeout`` — общий дедлайн на ожидание слота и сам анализ: если слот не
+    освободился вовремя — 503, если анализ не успел — 504.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        await asyncio.wait_for(_analysis_slots.acquire(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning("No free analysis slot within %.1fs", timeout)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"All analysis workers are busy, no slot within {timeout:g} seconds",
+        )
+    try:
+        future = loop.run_in_executor(_analysis_pool, fn, *args)
+    except BaseException:
+        _analysis_slots.release()
+        raise
+    future.add_done_callback(lambda _f: _analysis_slots.release())
+
+    try:
+        # shield: по таймауту отвечаем клиенту, но не отменяем уже идущий анализ
+        return await asyncio.wait_for(asyncio.shield(future), timeout=max(0.0, deadline - loop.time()))
+    except asyncio.TimeoutError:
+        logger.warning("Analysis timed out after %.1fs", timeout)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=f"Analysis timed out after {timeout:g} seconds",
+        )
+
+
+async def run_analysis(**kwargs: Any) -> Dict[str, Any]:
+    """
+    Выполнить core.analyze в пуле анализа, не блокируя event loop.
+
+    Raises:
+        HTTPException: 503, если за ANALYSIS_TIMEOUT не освободился слот пула;
+            504, если анализ не уложился в ANALYSIS_TIMEOUT
+    """
+    if ANALYSIS_BACKEND == "process":
+        return await _run_in_pool(_analyze_in_worker, kwargs, timeout=ANALYSIS_TIMEOUT)
+    return await _run_in_pool(functools.partial(core.analyze, **kwargs), timeout=ANALYSIS_TIMEOUT)
+
+
+async def run_batch_analysis(texts: List[str], **kwargs: Any) -> List[Dict[str, Any]]:
+    """core.analyze_many целиком в пуле анализа (элементы параллельны внутри ядра)."""
+    if ANALYSIS_BACKEND == "process":
+        return await _run_in_pool(_analyze_batch_in_worker, texts, kwargs, timeout=ANALYSIS_BATCH_TIMEOUT)
+    return await _run_in_pool(
+        lambda: list(core.analyze_many(texts, **kwargs)), timeout=ANALYSIS_BATCH_TIMEOUT
+    )
+
+
+async def stream_batch_analysis(texts: List[str], **kwargs: Any):
+    """
+    NDJSON-поток результатов батча.
+
+    Бэкенд тот же, что у ``run_batch_analysis``: при ``ANALYSIS_BACKEND=process``
+    батч считается в рабочем процессе частями по ``ANALYSIS_STREAM_CHUNK``
+    текстов, иначе элементы ``core.analyze_many`` забираются в пуле анализа.
+    Весь поток, включая ожидание слота пула, ограничен ``ANALYSIS_BATCH_TIMEOUT``:
+    по истечении оставшиеся элементы приходят с ``ok: false``. Слот пула занят, пока реально идёт
+    расчёт (в том числе после таймаута или отключения клиента).
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + ANALYSIS_BATCH_TIMEOUT
+    emitted: set = set()
+    pending: Optional[asyncio.Future] = None
+
+    if ANALYSIS_BACKEND == "process":
+        chunk_starts = iter(range(0, len(texts), ANALYSIS_STREAM_CHUNK))
+        iterator = None
+
+        def next_step() -> Optional[asyncio.Future]:
+            start = next(chunk_starts, None)
+            if start is None:
+                return None
+            chunk = texts[start:start + ANALYSIS_STREAM_CHUNK]
+            future = loop.run_in_executor(_analysis_pool, _analyze_batch_in_worker, chunk, kwargs)
+            # Индексы внутри части — относительные
+            return asyncio.ensure_future(_offset_items(future, start))
+    else:
+        iterator = core.analyze_many(texts, **kwargs)
+
+        def next_step() -> Optional[asyncio.Future]:
+            future = loop.run_in_executor(_analysis_pool, next, iterator, None)
+            return asyncio.ensure_future(_as_item_list(future))
+
+    try:
+        await asyncio.wait_for(_analysis_slots.acquire(), timeout=max(0.0, deadline - loop.time()))
+    except asyncio.TimeoutError:
+        logger.warning("No free analysis slot for batch stream within %.1fs", ANALYSIS_BATCH_TIMEOUT)
+        if iterator is not None:
+            iterator.close()
+        error = f"All analysis workers are busy, no slot within {ANALYSIS_BATCH_TIMEOUT:g} seconds"
+        for index in range(len(texts)):
+            yield json.dumps({"index": index, "ok": False, "error": error}, ensure_ascii=False) + "\n"
+        return
+    try:
+        while True:
+            pending = next_step()
+            if pending is None:
+                break
+            try:
+                items = await asyncio.wait_for(asyncio.shield(pending), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                logger.warning("Batch stream timed out after %.1fs", ANALYSIS_BATCH_TIMEOUT)
+                error = f"Batch timed out after {ANALYSIS_BATCH_TIMEOUT:g} seconds"
+                for index in range(len(texts)):
+                    if index not in emitted:
+                        yield json.dumps({"index": index, "ok": False, "error": error}, ensure_ascii=False) + "\n"
+                break
+            pending = None
+            if items is None:
+                break
+            for item in items:
+                emitted.add(item["index"])
+                yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+    finally:
+        if pending is not None and not pending.done():
+            # Расчёт ещё идёт: слот (и генератор ядра) освобождаются по его завершении
+            def _finish(_future: asyncio.Future) -> None:
+                if iterator is not None:
+                    iterator.close()
+                _analysis_slots.release()
+
+            pending.add_done_callback(_finish)
+        else:
+            if iterator is not None:
+                iterator.close()
+            _analysis_slots.release()
+
+
+async def _as_item_list(future: Any) -> Optional[List[Dict[str, Any]]]:
+    item = await future
+    return None if item is None else [item]
+
+
+async def _offset_items(future: Any, offset: int) -> List[Dict[str, Any]]:
+    items = await future
+    return [{**item, "index": item["index"] + offset} for item in items]
+
+
+@app.on_event("shutdown")
+def _shutdown_analysis_pool() -> None:
+    _analysis_pool.shutdown(wait=False, cancel_futures=True)
+
 # Task 4.1: Rate Limiting - Simple in-memory rate limiter (60 req/min per IP)
 _rate_limit_store: dict[str, list[float]] = defaultdict(list)
 RATE_LIMIT_REQUESTS = 60
@@ -158,6 +356,40 @@ class AnalyzeRequest(BaseModel):
         return v
 
 
+class BatchAnalyzeRequest(BaseModel):
+    """Запрос на пакетный анализ текстов."""
+
+    texts: List[str] = Field(..., description="Тексты для анализа", min_length=1)
+    preferred_gender: Optional[str] = Field(
+        "auto", description="Предпочтительный пол вокала"
+    )
+    ordered: bool = Field(
+        True, description="Порядок результатов как во входе (иначе — по мере готовности)"
+    )
+    stream: bool = Field(
+        False, description="Отдавать результаты потоком (application/x-ndjson)"
+    )
+
+    @field_validator("texts")
+    @classmethod
+    def validate_texts(cls, v):
+        if len(v) > ANALYSIS_BATCH_MAX_ITEMS:
+            raise ValueError(f"Batch size must not exceed {ANALYSIS_BATCH_MAX_ITEMS} texts")
+        for text in v:
+            if not text or len(text) > 16000:
+                raise ValueError("Each text must contain 1..16000 characters")
+        return v
+
+    @field_validator("preferred_gender")
+    @classmethod
+    def validate_gender(cls, v):
+        if v not in ["auto", "male", "female", "neutral", "mixed"]:
+            raise ValueError(
+                "preferred_gender must be one of: auto, male, female, neutral, mixed"
+            )
+        return v
+
+
 class AnalyzeResponse(BaseModel):
     """Ответ с результатами анализа."""
 
@@ -210,8 +442,8 @@ async def analyze_text(
         if request.mood:
             kwargs["mood"] = request.mood
 
-        # Выполнение анализа
-        result = core.analyze(text=request.text, **kwargs)
+        # Выполнение анализа (в пуле, event loop остаётся свободным)
+        result = await run_analysis(text=request.text, **kwargs)
 
         # Проверка результата
         if not result.get("ok", True):
@@ -222,6 +454,8 @@ async def analyze_text(
 
         return AnalyzeResponse(ok=True, result=result)
 
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"Validation error: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -233,6 +467,52 @@ async def analyze_text(
         )
 
 
+@app.post("/analyze/batch")
+async def analyze_batch(
+    request: BatchAnalyzeRequest, api_key: Optional[str] = Depends(verify_api_key)
+):
+    """
+    Пакетный анализ: тексты анализируются параллельно в пуле ядра.
+
+    Ошибка одного элемента не прерывает батч: элемент возвращается с
+    ``ok: false`` и ``error``. При ``stream: true`` результаты отдаются
+    построчно (NDJSON) по мере готовности.
+
+    Args:
+        request: Запрос со списком текстов и параметрами
+        api_key: API ключ (опционально)
+
+    Returns:
+        ``{"ok": true, "count": N, "items": [{"index", "ok", "result" | "error"}, ...]}``
+    """
+    kwargs = {"ordered": request.ordered}
+    if request.preferred_gender and request.preferred_gender != "auto":
+        kwargs["preferred_gender"] = request.preferred_gender
+
+    if request.stream:
+        return StreamingResponse(
+            stream_batch_analysis(request.texts, **kwargs),
+            media_type="application/x-ndjson",
+        )
+
+    try:
+        items = await run_batch_analysis(request.texts, **kwargs)
+        return {
+            "ok": True,
+            "count": len(items),
+            "failed": sum(1 for item in items if not item.get("ok")),
+            "items": items,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception(f"Batch analysis error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal server error: {str(e)}",
+        )
+
+
 @app.post("/analyze/lyrics-prompt")
 async def get_lyrics_prompt(
     request: AnalyzeRequest, api_key: Optional[str] = Depends(verify_api_key)
@@ -252,7 +532,7 @@ async def get_lyrics_prompt(
         if request.preferred_gender and request.preferred_gender != "auto":
             kwargs["preferred_gender"] = request.preferred_gender
 
-        result = core.analyze(text=request.text, **kwargs)
+        result = await run_analysis(text=request.text, **kwargs)
 
         if not result.get("ok", True):
             raise HTTPException(
@@ -268,6 +548,8 @@ async def get_lyrics_prompt(
 
         return {"lyrics_prompt": lyrics_prompt}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"Error getting lyrics prompt: {e}")
         raise HTTPException(
@@ -294,7 +576,7 @@ async def get_style_prompt(
         if request.preferred_gender and request.preferred_gender != "auto":
             kwargs["preferred_gender"] = request.preferred_gender
 
-        result = core.analyze(text=request.text, **kwargs)
+        result = await run_analysis(text=request.text, **kwargs)
 
         if not result.get("ok", True):
             raise HTTPException(
@@ -310,6 +592,8 @@ async def get_style_prompt(
 
         return {"style_prompt": style_prompt}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.exception(f"Error getting style prompt: {e}")
         raise HTTPException(
@@ -0,0 +1,151 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Immutable per-request view of the normalized text.
+
+Раньше каждый движок заново делал ``text.lower()``, ``split("\\n")`` и
+токенизацию одного и того же текста. ``AnalysisContext`` строится один раз
+на запрос и лениво (при первом обращении) вычисляет общие представления:
+нижний регистр, таблицу строк, токены со смещениями, поток токенов разметки
+(``lyrics_lexer``), таблицу секций (``section_table``) и гистограмму
+классов символов. Движки принимают как ``str``, так и ``AnalysisContext``
+(см. ``as_context``), поэтому публичные API не меняются.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Tuple, Union
+
+if TYPE_CHECKING:
+    from .lyrics_lexer import TokenStream
+    from .section_table import SectionTable
+
+_WORD_RE = re.compile(r"\b\w+\b")
+
+
+@dataclass(frozen=True)
+class AnalysisContext:
+    """Shared, read-only text representations for one analysis request."""
+
+    text: str
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    @cached_property
+    def lowered(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def digest(self) -> str:
+        """md5 of the text — the key used by the engine caches."""
+        return hashlib.md5(self.text.encode("utf-8")).hexdigest()
+
+    # --- line table -----------------------------------------------------
+    @cached_property
+    def lines(self) -> Tuple[str, ...]:
+        return tuple(self.text.split("\n"))
+
+    @cached_property
+    def nonempty_lines(self) -> Tuple[str, ...]:
+        """Lines with content, not stripped (``[l for l in lines if l.strip()]``)."""
+        return tuple(line for line in self.lines if line.strip())
+
+    @cached_property
+    def stripped_lines(self) -> Tuple[str, ...]:
+        """Stripped lines with content."""
+        return tuple(line.strip() for line in self.nonempty_lines)
+
+    # --- tokens ---------------------------------------------------------
+    @cached_property
+    def word_spans(self) -> Tuple[Tuple[int, int], ...]:
+        """``(start, end)`` offsets of ``\\b\\w+\\b`` tokens in ``text``."""
+        return tuple(m.span() for m in _WORD_RE.finditer(self.text))
+
+    @cached_property
+    def words(self) -> Tuple[str, ...]:
+        return tuple(self.text[start:end] for start, end in self.word_spans)
+
+    @cached_property
+    def lowered_words(self) -> Tuple[str, ...]:
+        """``\\b\\w+\\b`` tokens of ``lowered`` (lower() may change token boundaries)."""
+        return tuple(_WORD_RE.findall(self.lowered))
+
+    @cached_property
+    def whitespace_tokens(self) -> Tuple[str, ...]:
+        """``text.split()`` — equivalent to ``re.findall(r"[^\\s]+", text)``."""
+        return tuple(self.text.split())
+
+    @cached_property
+    def tokens(self) -> "TokenStream":
+        """Markup token stream (sections, commands, BPM header, keys, hints)."""
+        # lyrics_lexer → text_utils → analysis_context: импорт при обращении
+        from .lyrics_lexer import lex
+
+        return lex(self.text)
+
+    @cached_property
+    def section_table(self) -> "SectionTable":
+        """Parsed sections with line ranges, content hashes and duplicate groups."""
+        from .section_table import section_table
+
+        return section_table(self)
+
+    # --- character classes ---------------------------------------------
+    @cached_property
+    def char_counts(self) -> Counter:
+        return Counter(self.text)
+
+    @cached_property
+    def char_classes(self) -> Dict[str, int]:
+        """Histogram: cyrillic / latin / digit / space / punct / other."""
+        histogram = {"cyrillic": 0, "latin": 0, "digit": 0, "space": 0, "punct": 0, "other": 0}
+        for ch, count in self.char_counts.items():
+            if "Ѐ" <= ch <= "ӿ":
+                histogram["cyrillic"] += count
+            elif ch.isascii() and ch.isalpha():
+                histogram["latin"] += count
+            elif ch.isdigit():
+                histogram["digit"] += count
+            elif ch.isspace():
+                histogram["space"] += count
+            elif unicodedata.category(ch).startswith("P"):
+                histogram["punct"] += count
+            else:
+                histogram["other"] += count
+        return histogram
+
+
+TextOrContext = Union[str, AnalysisContext]
+
+
+def as_context(text: TextOrContext) -> AnalysisContext:
+    """Return ``text`` itself if it already is a context, otherwise wrap it."""
+    if isinstance(text, AnalysisContext):
+        return text
+    return AnalysisContext(text or "")
+
+
+def context_text(text: TextOrContext) -> str:
+    """Plain string behind ``text`` (for engines that only need the raw text)."""
+    return text.text if isinstance(text, AnalysisContext) else text
+
+
+__all__ = ["AnalysisContext", "TextOrContext", "as_context", "context_text"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -0,0 +1,213 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Declarative dependency graph for the analysis pipeline.
+
+Каждый движок описывается узлом с явными входами (имена других узлов или
+исходных значений, например ``raw``). Узел запускается сразу, как только
+готовы все его входы, а не по окончании всего предыдущего батча: например,
+integrity стартует, как только готовы emotion и tlp, не дожидаясь rde_* или
+tone. Для каждого узла фиксируется время выполнения, а узлы с ``skip_if``
+могут быть пропущены без вызова движка.
+
+Таймаут узла отсчитывается с момента, когда пул начал его выполнять, а не
+с отправки: узел, стоящий в очереди занятого пула, не теряет своё время.
+Время узла (``timings_ms``) меряется внутри рабочего потока / процесса и не
+включает ожидание в очереди.
+Если падает обязательный узел, ещё не стартовавшие узлы отменяются до того,
+как ошибка будет проброшена вызывающему.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .parallel_module_executor import ParallelModuleExecutor, _reset_process_pool, _timed_call, in_worker_thread
+
+log = logging.getLogger(__name__)
+
+# Как часто проверять, стартовали ли узлы из очереди пула (их таймаут ещё не идёт)
+_QUEUE_POLL_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class AnalysisNode:
+    """One engine call: ``fn(*[value of each input])`` → output stored under ``name``."""
+
+    name: str
+    fn: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    default: Any = None
+    skip_if: Optional[Callable[..., bool]] = None
+    required: bool = False
+    timeout: Optional[float] = None
+
+
+@dataclass
+class GraphRun:
+    """Outputs and per-node diagnostics of a single graph execution."""
+
+    outputs: Dict[str, Any]
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.outputs.get(name, default)
+
+
+class AnalysisGraph:
+    """Validated set of nodes executed in dependency order on the module executor."""
+
+    def __init__(self, nodes: Sequence[AnalysisNode], seeds: Sequence[str] = ()) -> None:
+        self.nodes: Dict[str, AnalysisNode] = {}
+        for node in nodes:
+            if node.name in self.nodes or node.name in seeds:
+                raise ValueError(f"Duplicate graph node: {node.name}")
+            self.nodes[node.name] = node
+        self.seeds = tuple(seeds)
+        self.dependents: Dict[str, List[str]] = {name: [] for name in (*self.seeds, *self.nodes)}
+        for node in self.nodes.values():
+            for dep in node.inputs:
+                if dep not in self.dependents:
+                    raise ValueError(f"Node {node.name} depends on unknown input: {dep}")
+                self.dependents[dep].append(node.name)
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        remaining = {name: set(node.inputs) - set(self.seeds) for name, node in self.nodes.items()}
+        order: List[str] = []
+        ready = [name for name, deps in remaining.items() if not deps]
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self.dependents[name]:
+                remaining[dependent].discard(name)
+                if not remaining[dependent] and dependent not in order and dependent not in ready:
+                    ready.append(dependent)
+        if len(order) != len(self.nodes):
+            cyclic = sorted(set(self.nodes) - set(order))
+            raise ValueError(f"Dependency cycle between graph nodes: {cyclic}")
+        return order
+
+    # ------------------------------------------------------------------
+    def run(self, seeds: Dict[str, Any], executor: Optional[ParallelModuleExecutor] = None) -> GraphRun:
+        """Execute the graph; nodes start as soon as their inputs are resolved."""
+        missing = [name for name in self.seeds if name not in seeds]
+        if missing:
+            raise ValueError(f"Missing graph seeds: {missing}")
+
+        executor = executor or ParallelModuleExecutor(backend="inline")
+        inline = executor.backend == "inline" or in_worker_thread()
+        run = GraphRun(outputs={})
+        values: Dict[str, Any] = dict(seeds)
+        waiting: Dict[str, Set[str]] = {
+            name: set(node.inputs) - set(values) for name, node in self.nodes.items()
+        }
+        ready: List[str] = [name for name in self.order if not waiting[name]]
+        # future → (узел, время отправки, таймаут, дедлайн или None, пока узел в очереди)
+        running: Dict[Future, Tuple[AnalysisNode, float, float, Optional[float]]] = {}
+
+        def finish(node: AnalysisNode, value: Any, elapsed: float) -> None:
+            values[node.name] = value
+            run.outputs[node.name] = value
+            run.timings_ms[node.name] = round(elapsed * 1000, 2)
+            for dependent in self.dependents[node.name]:
+                waiting[dependent].discard(node.name)
+                if not waiting[dependent]:
+                    ready.append(dependent)
+
+        def fail(node: AnalysisNode, exc: BaseException, started: float) -> None:
+            if node.required:
+                raise exc
+            log.warning(f"[AnalysisGraph] Узел {node.name} завершился с ошибкой: {exc}")
+            run.failed.append(node.name)
+            # Время упавшего / просроченного узла — от отправки до обнаружения ошибки
+            finish(node, node.default, time.perf_counter() - started)
+
+        def start(node: AnalysisNode) -> None:
+            args = tuple(values[dep] for dep in node.inputs)
+            started = time.perf_counter()
+            if node.skip_if is not None and node.skip_if(*args):
+                run.skipped.append(node.name)
+                finish(node, node.default, time.perf_counter() - started)
+                return
+            if not inline:
+                try:
+                    future = executor.submit((node.name, node.fn, args, {}), timed=True)
+                except RuntimeError:
+                    pass  # пул остановлен — выполняем inline
+                else:
+                    timeout = node.timeout or executor.module_timeouts.get(node.name, executor.timeout)
+                    running[future] = (node, started, timeout, None)
+                    return
+            try:
+                value, elapsed = _timed_call(node.fn, *args)
+            except Exception as exc:
+                fail(node, exc, started)
+            else:
+                finish(node, value, elapsed)
+
+        try:
+            while ready or running:
+                while ready:
+                    start(self.nodes[ready.pop(0)])
+                if not running:
+                    break
+
+                now = time.monotonic()
+                for future, (node, started, timeout, deadline) in list(running.items()):
+                    if deadline is None and (future.running() or future.done()):
+                        running[future] = (node, started, timeout, now + timeout)
+                deadlines = [deadline for _, _, _, deadline in running.values() if deadline is not None]
+                wait_for = max(0.0, min(deadlines) - now) if deadlines else None
+                if len(deadlines) < len(running):
+                    wait_for = _QUEUE_POLL_SECONDS if wait_for is None else min(wait_for, _QUEUE_POLL_SECONDS)
+                done, _ = wait(list(running), timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, started, _, _ = running.pop(future)
+                    try:
+                        value, elapsed = future.result()
+                    except BrokenProcessPool:
+                        log.warning(f"[AnalysisGraph] Пул процессов упал на узле {node.name}, выполняем inline")
+                        _reset_process_pool()
+                        try:
+                            value, elapsed = _timed_call(node.fn, *(values[dep] for dep in node.inputs))
+                        except Exception as exc:
+                            fail(node, exc, started)
+                            continue
+                    except Exception as exc:
+                        fail(node, exc, started)
+                        continue
+                    finish(node, value, elapsed)
+
+                now = time.monotonic()
+                for future, (node, started, timeout, deadline) in list(running.items()):
+                    if deadline is not None and now >= deadline:
+                        running.pop(future)
+                        executor.abandon(future)
+                        fail(node, TimeoutError(f"timeout after {timeout}s"), started)
+        except BaseException:
+            # Обязательный узел упал: не стартовавшие узлы отменяем, результаты
+            # уже выполняющихся отбрасываются
+            for future in running:
+                executor.cancel(future)
+            raise
+
+        return run
+
+
+__all__ = ["AnalysisNode", "AnalysisGraph", "GraphRun"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
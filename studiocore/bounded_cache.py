@@ -0,0 +1,228 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Shared bounded cache facility.
+
+Единый механизм кэширования вместо разрозненных неограниченных ``dict``
+(``LyricMeter._cache``, ``TruthLovePainEngine._cache``,
+``EmotionEngine._cache``), которые росли без предела в долгоживущем
+процессе. Каждое пространство имён (namespace) имеет свою ёмкость, политику
+вытеснения (LRU / LFU), необязательный TTL и лимит по оценке памяти;
+доступ потокобезопасен, статистика доступна через ``cache_stats()``.
+
+Параметры берутся из ``DEFAULT_CONFIG["caches"][namespace]`` (с откатом на
+``DEFAULT_CONFIG["caches"]["default"]``).
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .config import DEFAULT_CONFIG
+
+POLICIES = ("lru", "lfu")
+
+_MISSING = object()
+
+
+def estimate_size(obj: Any, _depth: int = 0) -> int:
+    """Rough recursive ``sys.getsizeof`` for dicts / lists / tuples / sets / strings."""
+    size = sys.getsizeof(obj)
+    if _depth > 6:
+        return size
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += estimate_size(key, _depth + 1) + estimate_size(value, _depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+class BoundedCache:
+    """Thread-safe bounded cache with LRU or LFU eviction and optional TTL."""
+
+    def __init__(
+        self,
+        namespace: str,
+        capacity: int = 1024,
+        policy: str = "lru",
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        size_of: Callable[[Any], int] = estimate_size,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown cache policy: {policy!r}")
+        self.namespace = namespace
+        self.capacity = max(1, int(capacity))
+        self.policy = policy
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._size_of = size_of
+        # key -> (stored_at, size, frequency, value); порядок = давность использования
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    # ------------------------------------------------------------------
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds
+
+    def _drop(self, key: Hashable) -> None:
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict_one(self, keep: Hashable) -> None:
+        # ``keep`` — только что записанный ключ, его не вытесняем
+        candidates = (key for key in self._entries if key != keep)
+        if self.policy == "lfu":
+            # Наименьшая частота; при равенстве — самая давно использованная
+            victim = min(candidates, key=lambda k: self._entries[k][2])
+        else:
+            victim = next(candidates)
+        self._drop(victim)
+        self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            stored_at, size, freq, value = entry
+            if self._expired(stored_at):
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries[key] = (stored_at, size, freq + 1, value)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> bool:
+        """Store ``value``; returns False if it alone exceeds ``max_bytes``."""
+        size = self._size_of(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic(), size, 1, value)
+            self._bytes += size
+            while len(self._entries) > self.capacity or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._evict_one(keep=key)
+        return True
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries[key][3]
+            self._drop(key)
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry[0])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def memory_estimate(self) -> int:
+        """Tracked bytes when ``max_bytes`` is set, otherwise a fresh estimate."""
+        with self._lock:
+            if self.max_bytes is not None:
+                return self._bytes
+            return sum(self._size_of(entry[3]) for entry in self._entries.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "namespace": self.namespace,
+                "policy": self.policy,
+                "entries": len(self._entries),
+                "capacity": self.capacity,
+                "ttl_seconds": self.ttl_seconds,
+                "bytes": self.memory_estimate(),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+_CACHES: Dict[str, BoundedCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def cache_settings(namespace: str) -> Dict[str, Any]:
+    caches = DEFAULT_CONFIG.get("caches", {}) or {}
+    settings = dict(caches.get("default", {}) or {})
+    settings.update(caches.get(namespace, {}) or {})
+    return settings
+
+
+def get_cache(namespace: str, **overrides: Any) -> BoundedCache:
+    """Return the shared cache for ``namespace``; created on first use from config."""
+    with _CACHES_LOCK:
+        cache = _CACHES.get(namespace)
+        if cache is None:
+            settings = cache_settings(namespace)
+            settings.update(overrides)
+            cache = BoundedCache(namespace, **settings)
+            _CACHES[namespace] = cache
+        return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    return {cache.namespace: cache.stats() for cache in caches}
+
+
+def clear_caches() -> None:
+    with _CACHES_LOCK:
+        caches = list(_CACHES.values())
+    for cache in caches:
+        cache.clear()
+
+
+__all__ = ["BoundedCache", "estimate_size", "get_cache", "cache_stats", "clear_caches"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -12,6 +12,7 @@ from typing import Any, Dict, Sequence
 from .emotion_profile import EmotionVector
 
 from .logical_engines import BPMEngine as _CoreBPMEngine
+from .syllables import syllable_counts
 
 
 class BPMEngine(_CoreBPMEngine):
@@ -23,16 +24,8 @@ class BPMEngine(_CoreBPMEngine):
         if not text_lines:
             return 90
 
-        def syllable_count(s: str) -> int:
-            vowels = "aeiouyауоыиэяюёе"
-            return max(1, sum(1 for ch in s.lower() if ch in vowels))
-
-        total_syllables = 0
-        total_words = 0
-        for ln in text_lines:
-            words = ln.split()
-            total_words += len(words)
-            total_syllables += syllable_count(ln)
+        total_syllables = sum(syllable_counts(text_lines))
+        total_words = sum(len(ln.split()) for ln in text_lines)
 
         avg_syllables_per_word = total_syllables / max(total_words, 1)
         avg_len = sum(len(ln) for ln in text_lines) / max(len(text_lines), 1)
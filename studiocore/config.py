@@ -15,6 +15,7 @@ StudioCore Configuration Loader
 
 import os
 import json
+import hashlib
 import logging
 from dataclasses import dataclass
 
@@ -30,7 +31,23 @@ VERSION_LIMITS = {"v3": 200, "v3.5": 200, "v4": 500, "v5": 1000}
 
 
 class ConfigAccessor(dict):
-    """Dict helper that also exposes attribute access for config keys."""
+    """
+    Dict helper that also exposes attribute access for config keys.
+
+    Вложенные секции тоже ``ConfigAccessor``: любое изменение конфига через
+    словарные методы (в том числе во время работы и в тестах) сбрасывает кэш
+    ``config_fingerprint``. Списки внутри конфига при изменении на месте
+    отслеживаются только явным ``invalidate_config_fingerprint()``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for key, value in dict.items(self):
+            dict.__setitem__(self, key, self._wrap(value))
+
+    @staticmethod
+    def _wrap(value):
+        return ConfigAccessor(value) if type(value) is dict else value
 
     def __getattr__(self, item):
         try:
@@ -38,6 +55,41 @@ class ConfigAccessor(dict):
         except KeyError as exc:  # pragma: no cover - attribute passthrough
             raise AttributeError(item) from exc
 
+    def __setitem__(self, key, value):
+        super().__setitem__(key, self._wrap(value))
+        invalidate_config_fingerprint()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        invalidate_config_fingerprint()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        invalidate_config_fingerprint()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        invalidate_config_fingerprint()
+        return item
+
+    def clear(self):
+        super().clear()
+        invalidate_config_fingerprint()
+
 
 DEFAULT_CONFIG = ConfigAccessor(
     {
@@ -137,6 +189,39 @@ DEFAULT_CONFIG = ConfigAccessor(
             "DENSITY_GLOBAL_WEIGHT": 0.35,
             "COMMA_BREAKS_MULTIPLIER": 0.8,
         },
+        # Executor for PARALLEL_BATCH_A / B (см. parallel_module_executor.py)
+        # backend: "thread" | "process" | "inline"; env STUDIOCORE_EXECUTOR_BACKEND
+        "executor": {
+            "backend": "thread",
+            "max_workers": 8,
+            "timeout": 30.0,
+            "process_workers": 0,  # 0 → os.cpu_count()
+            # Одновременных элементов StudioCoreV6.analyze_many (отдельный пул)
+            "batch_workers": 2,
+        },
+        # LRU + TTL кэш готовых результатов StudioCoreV6.analyze (см. result_cache.py)
+        # env STUDIOCORE_RESULT_CACHE=0 отключает кэш
+        "result_cache": {
+            "enabled": True,
+            "max_entries": 256,
+            "max_bytes": 32 * 1024 * 1024,
+            "ttl_seconds": 900.0,
+        },
+        # Общие ограниченные кэши движков (см. bounded_cache.py)
+        # policy: "lru" | "lfu"; ttl_seconds: None — без TTL
+        "caches": {
+            "default": {"capacity": 1024, "policy": "lru", "ttl_seconds": None},
+            "tlp": {"capacity": 2048},
+            "emotion.auto": {"capacity": 4096},
+            "rhythm.analysis": {"capacity": 256},
+            # Секции по хэшу тела: правка одного куплета не пересчитывает остальные
+            "rhythm.sections": {"capacity": 2048},
+            "lexicon.scan": {"capacity": 1024},
+            # Потоки токенов lyrics_lexer по md5 текста
+            "lyrics.lexer": {"capacity": 256},
+            # SectionTable по md5 текста (разбор секций один раз на текст)
+            "sections.table": {"capacity": 256},
+        },
         # Task 4.2: Punctuation weights (moved from rhythm.py)
         "PUNCT_WEIGHTS": {
             "!": 0.6,
@@ -291,6 +376,34 @@ def load_config(path: str = "studio_config.json") -> dict:
     return data
 
 
+_CONFIG_FINGERPRINT = None
+
+
+def config_fingerprint() -> str:
+    """
+    Short SHA-256 digest of ``DEFAULT_CONFIG`` (part of the result - cache key).
+
+    Считается один раз и кэшируется: сериализация всего конфига на каждый
+    ``AnalysisResultCache.make_key`` не нужна. Кэш сбрасывает любое изменение
+    ``DEFAULT_CONFIG`` (см. ``ConfigAccessor``).
+    """
+    global _CONFIG_FINGERPRINT
+
+    fingerprint = _CONFIG_FINGERPRINT
+    if fingerprint is None:
+        payload = json.dumps(DEFAULT_CONFIG, sort_keys=True, default=str, ensure_ascii=False)
+        fingerprint = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        _CONFIG_FINGERPRINT = fingerprint
+    return fingerprint
+
+
+def invalidate_config_fingerprint() -> None:
+    """Drop the cached ``config_fingerprint`` (called on every ``DEFAULT_CONFIG`` change)."""
+    global _CONFIG_FINGERPRINT
+
+    _CONFIG_FINGERPRINT = None
+
+
 # === Imported from core_v6 (MAXI FIX v7 — Part 3) ===
 KEYWORD_MAP = [
     ("melancholy_dark", ["готик", "darkwave", "мрак", "тьма", "темн"]),
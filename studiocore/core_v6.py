@@ -8,13 +8,22 @@ StudioCore V6 - Adapter wrapper around monolith with v6 features
 """
 
 from __future__ import annotations
+import copy
 import logging
 import sys
-from typing import Any, Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 try:
     from . import get_core
     from .monolith_v4_3_1 import StudioCore as MonolithStudioCore
+    from .parallel_module_executor import (
+        executor_settings,
+        in_batch_thread,
+        in_worker_thread,
+        submit_batch_item,
+    )
+    from .result_cache import AnalysisResultCache
 except ImportError:
     # Handle direct execution
     import os
@@ -22,6 +31,15 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from studiocore import get_core
     from studiocore.monolith_v4_3_1 import StudioCore as MonolithStudioCore
+    from studiocore.parallel_module_executor import (
+        executor_settings,
+        in_batch_thread,
+        in_worker_thread,
+        submit_batch_item,
+    )
+    from studiocore.result_cache import AnalysisResultCache
+
+log = logging.getLogger(__name__)
 
 
 class StudioCoreV6:
@@ -47,6 +65,15 @@ class StudioCoreV6:
         except ImportError:
             self._hge = None
 
+        # Кэш готовых результатов (None, если выключен в конфиге)
+        self._result_cache = AnalysisResultCache.from_config()
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit / miss / size counters of the result cache."""
+        if self._result_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._result_cache.stats()}
+
     def analyze(
         self,
         text: str,
@@ -58,6 +85,14 @@ class StudioCoreV6:
         Analyze text and return comprehensive results.
         Compatible with StudioCore monolith analyze() signature.
         """
+        cache_key = None
+        if self._result_cache is not None and isinstance(text, str):
+            cache_key = AnalysisResultCache.make_key(text, preferred_gender, semantic_hints, version)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                log.debug("[StudioCoreV6] Результат взят из кэша")
+                return cached
+
         result = self._core.analyze(
             text=text,
             preferred_gender=preferred_gender,
@@ -94,11 +129,126 @@ class StudioCoreV6:
                         result["style"] = style
                 except (AttributeError, TypeError, ValueError) as e:
                     # Логируем ошибку, но не прерываем выполнение
-                    log = logging.getLogger(__name__)
                     log.warning(f"HybridGenreEngine.resolve() failed: {e}")
         
+        # Ошибки (ok=False) не кэшируем
+        if cache_key is not None and isinstance(result, dict) and result.get("ok", True) is not False:
+            self._result_cache.put(cache_key, result)
         return result
 
+    # ------------------------------------------------------------------
+    # Batch analysis
+    # ------------------------------------------------------------------
+    def _analyze_batch_job(
+        self, text: str, options: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """One batch item; errors are captured so they never break the batch."""
+        try:
+            result = self.analyze(text, **options)
+        except Exception as e:
+            log.warning(f"[StudioCoreV6] Ошибка анализа элемента батча: {e}")
+            return None, f"{type(e).__name__}: {e}"
+        if not isinstance(result, dict):
+            return None, f"Unexpected result type: {type(result).__name__}"
+        if result.get("ok", True) is False:
+            return None, str(result.get("error") or "Analysis failed")
+        return result, None
+
+    def analyze_many(
+        self,
+        texts: Iterable[str],
+        preferred_gender: str = "auto",
+        version: Optional[str] = None,
+        semantic_hints: Optional[Dict[str, Any]] = None,
+        *,
+        ordered: bool = True,
+        max_in_flight: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze many texts concurrently on the bounded batch pool.
+
+        Yields one item per input: ``{"index", "ok", "result"}`` or
+        ``{"index", "ok": False, "error"}``. With ``ordered=True`` items come
+        in input order, otherwise as soon as each one completes. Identical
+        texts in a batch are analyzed once; a failing item does not affect
+        the others. At most ``executor.batch_workers`` items run at a time;
+        their engine nodes share the module pool with single requests.
+        """
+        texts = list(texts)
+        options = {
+            "preferred_gender": preferred_gender,
+            "version": version,
+            "semantic_hints": semantic_hints,
+        }
+        # Одинаковые тексты (после нормализации) считаем один раз
+        groups: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            key = AnalysisResultCache.make_key(str(text or ""), preferred_gender, semantic_hints, version)
+            groups.setdefault(key, []).append(index)
+        jobs = list(groups.values())
+
+        settings = executor_settings()
+        # Вложенный батч (из потока пула) выполняется inline, чтобы не ждать сам себя
+        inline = settings["backend"] == "inline" or in_worker_thread() or in_batch_thread()
+        window = max(1, max_in_flight or int(settings["batch_workers"]) * 2)
+
+        def items_for(indices: List[int], result: Optional[Dict[str, Any]], error: Optional[str]):
+            for position, index in enumerate(indices):
+                if error is not None:
+                    yield {"index": index, "ok": False, "error": error}
+                else:
+                    payload = result if position == 0 else copy.deepcopy(result)
+                    yield {"index": index, "ok": True, "result": payload}
+
+        def run_jobs() -> Iterator[Tuple[List[int], Optional[Dict[str, Any]], Optional[str]]]:
+            pending = iter(jobs)
+            running: Dict[Future, List[int]] = {}
+
+            def submit_next() -> bool:
+                indices = next(pending, None)
+                if indices is None:
+                    return False
+                try:
+                    running[submit_batch_item(self._analyze_batch_job, texts[indices[0]], options)] = indices
+                except RuntimeError:
+                    # Пул остановлен — этот элемент выполняем inline
+                    future: Future = Future()
+                    future.set_result(self._analyze_batch_job(texts[indices[0]], options))
+                    running[future] = indices
+                return True
+
+            while len(running) < window and submit_next():
+                pass
+            while running:
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    indices = running.pop(future)
+                    result, error = future.result()
+                    yield indices, result, error
+                    submit_next()
+
+        if inline:
+            completed = (
+                (indices, *self._analyze_batch_job(texts[indices[0]], options)) for indices in jobs
+            )
+        else:
+            completed = run_jobs()
+
+        if not ordered:
+            for indices, result, error in completed:
+                yield from items_for(indices, result, error)
+            return
+
+        # Выдаём по порядку: готовые элементы ждут, пока не выйдут предыдущие
+        buffered: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+        for indices, result, error in completed:
+            for item in items_for(indices, result, error):
+                buffered[item["index"]] = item
+            while next_index in buffered:
+                yield buffered.pop(next_index)
+                next_index += 1
+
 
 def main():
     """Self-test entry point for core_v6.py"""
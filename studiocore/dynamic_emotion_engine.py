@@ -13,10 +13,11 @@ an explicit ``emotion_profile`` interface for the new dynamic genre router.
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Mapping
 
 from .logical_engines import EmotionEngine
 from .emotion import TruthLovePainEngine
+from .engine_registry import get_engine
 
 
 class DynamicEmotionEngine:
@@ -29,8 +30,8 @@ class DynamicEmotionEngine:
         emotion_engine: EmotionEngine | None = None,
         tlp_engine: TruthLovePainEngine | None = None,
     ) -> None:
-        self._emotion_engine = emotion_engine or EmotionEngine()
-        self._tlp_engine = tlp_engine or TruthLovePainEngine()
+        self._emotion_engine = emotion_engine or get_engine("emotion.logical")
+        self._tlp_engine = tlp_engine or get_engine("tlp")
 
     def emotion_profile(self, text: str) -> Dict[str, float]:
         """Return a normalised 7 - axis emotion vector.
@@ -42,7 +43,26 @@ class DynamicEmotionEngine:
         text = text or ""
         emotion_scores = self._emotion_engine.emotion_detection(text) or {}
         tlp_scores = self._tlp_engine.analyze(text) if text.strip() else {}
+        return self._profile(emotion_scores, tlp_scores)
 
+    def emotion_profile_from(
+        self,
+        emotions: Mapping[str, float] | None,
+        tlp: Mapping[str, float] | None,
+    ) -> Dict[str, float]:
+        """Same vector as ``emotion_profile`` from already computed payloads.
+
+        ``emotions`` — ``AutoEmotionalAnalyzer.analyze(text)``, ``tlp`` —
+        ``TruthLovePainEngine.analyze(text)`` (результаты Phase 1 ядра), так что
+        ни детектор эмоций, ни TLP повторно по тексту не запускаются.
+        """
+
+        emotion_scores = self._emotion_engine.refine_detection(dict(emotions or {})) or {}
+        return self._profile(emotion_scores, tlp or {})
+
+    def _profile(
+        self, emotion_scores: Mapping[str, float], tlp_scores: Mapping[str, float]
+    ) -> Dict[str, float]:
         raw_vector = {
             "joy": float(emotion_scores.get("joy", 0.0)),
             "sadness": float(emotion_scores.get("sadness", 0.0)),
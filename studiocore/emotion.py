@@ -13,14 +13,16 @@ import os
 import re
 import math
 import threading
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 import logging
 
 from studiocore.emotion_profile import EmotionVector
 from studiocore.emotion_dictionary_extended import EmotionLexiconExtended
 from studiocore.structures import PhraseEmotionPacket
+from .analysis_context import TextOrContext, as_context
 from .config import DEFAULT_CONFIG
+from .lexicon_matcher import LexiconMatcher
 
 # StudioCore Signature Block (Do Not Remove)
 # Author: Сергей Бауэр (@Sbauermaner)
@@ -33,6 +35,15 @@ from .config import DEFAULT_CONFIG
 # Получаем логгер для этого модуля
 log = logging.getLogger(__name__)
 
+# NumPy: матричный путь проекции на кластеры и оценки жанров / BPM (без него — циклы по словарям)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+    log.debug("[Emotion Model] numpy not available, cluster / genre scoring will use dict loops")
+
 # === Весовые карты ===
 PUNCT_WEIGHTS = {
     "!": 0.6,
@@ -45,6 +56,33 @@ PUNCT_WEIGHTS = {
     ";": 0.1,
 }
 EMOJI_WEIGHTS = {ch: 0.5 for ch in "❤💔💖🔥😭😢✨🌌🌅🌙🌈☀⚡💫"}
+# Только символы с весом: сумма по ним в порядке текста равна сумме по всем символам
+_PUNCT_CHARS_RE = re.compile("[" + re.escape("".join(ch for ch in PUNCT_WEIGHTS if len(ch) == 1)) + "]")
+_EMOJI_CHARS_RE = re.compile("[" + re.escape("".join(EMOJI_WEIGHTS)) + "]")
+# Телесность / сенсуальность: снижает фоновый "peace" в AutoEmotionalAnalyzer
+SENSUAL_WORDS_RE = re.compile(
+    r"\b(тело|прикосновен|обнима|объятия|наслажден|мягк|шелк|плотск|сенсуальн|touch|embrace|body|sensual|tender|soft|silk|pleasure)\b",
+    re.I,
+)
+
+def lexicon_fields() -> Dict[str, list]:
+    """All TLP + EMO_FIELDS stems by field ("tlp.truth", ..., "emo.joy", ...)."""
+    fields: Dict[str, list] = {
+        "tlp.truth": TruthLovePainEngine.TRUTH_WORDS,
+        "tlp.love": TruthLovePainEngine.LOVE_WORDS,
+        "tlp.pain": TruthLovePainEngine.PAIN_WORDS,
+    }
+    for field_name, tokens in AutoEmotionalAnalyzer.EMO_FIELDS.items():
+        if tokens:
+            fields[f"emo.{field_name}"] = tokens
+    return fields
+
+
+def _shared_lexicon_matcher():
+    from .engine_registry import get_engine
+
+    return get_engine("lexicon.matcher")
+
 
 # =====================================================
 # 💠 Truth × Love × Pain Engine (v3 Словари)
@@ -320,21 +358,23 @@ class TruthLovePainEngine:  # <-- v15: Оригинальное имя
     ]
 
     def __init__(self):
-        # Компилируем регекспы один раз для скорости
-        self.TRUTH = re.compile(r"(" + "|".join(self.TRUTH_WORDS) + r")", re.I)
-        self.LOVE = re.compile(r"(" + "|".join(self.LOVE_WORDS) + r")", re.I)
-        self.PAIN = re.compile(r"(" + "|".join(self.PAIN_WORDS) + r")", re.I)
+        # Общий автомат по словарям TLP и EMO_FIELDS (один проход по тексту
+        # вместо отдельного findall на каждую ось)
+        self._matcher = _shared_lexicon_matcher()
         log.debug(
             f"TLP Engine (v15) инициализирован с {len(self.TRUTH_WORDS)} + {len(self.LOVE_WORDS)} + {len(self.PAIN_WORDS)} словами."
         )
 
-    def analyze(self, text: str) -> Dict[str, float]:
+    def analyze(self, text: TextOrContext) -> Dict[str, float]:
         log.debug("Вызов функции: TruthLovePainEngine.analyze")
-        s = text.lower()
+        s = as_context(text).lowered
+        return self.score_hits(s, self._matcher.count(s))
 
-        truth_hits = len(self.TRUTH.findall(s))
-        love_hits = len(self.LOVE.findall(s))
-        pain_hits = len(self.PAIN.findall(s))
+    def score_hits(self, s: str, hits: Dict[str, int]) -> Dict[str, float]:
+        """TLP profile of lowered text ``s`` from precomputed lexicon counts (``LexiconMatcher.count``)."""
+        truth_hits = hits["tlp.truth"]
+        love_hits = hits["tlp.love"]
+        pain_hits = hits["tlp.pain"]
 
         total = truth_hits + love_hits + pain_hits
 
@@ -375,10 +415,9 @@ class TruthLovePainEngine:  # <-- v15: Оригинальное имя
         This method is kept for backward compatibility.
         """
         # Import here to avoid circular dependencies
-        from .tlp_engine import TruthLovePainEngine as TLPEngine
+        from .engine_registry import get_engine
 
-        tlp_engine = TLPEngine()
-        return tlp_engine.export_emotion_vector(text)
+        return get_engine("tlp").export_emotion_vector(text)
 
 
 # =====================================================
@@ -514,12 +553,9 @@ class AutoEmotionalAnalyzer:  # <-- v15: Оригинальное имя
     }
 
     def __init__(self):
-        self.LEXICON = {}
-        for field, tokens in self.EMO_FIELDS.items():
-            if tokens:
-                # v13: Компилируем регекспы для *корней* слов (быстрее и
-                # точнее)
-                self.LEXICON[field] = re.compile(r"(" + "|".join(tokens) + r")", re.I)
+        # v13: поиск по *корням* слов; все поля — один общий автомат с TLP
+        self.LEXICON_FIELDS = [field_name for field_name, tokens in self.EMO_FIELDS.items() if tokens]
+        self._matcher = _shared_lexicon_matcher()
         log.debug("AutoEmotionalAnalyzer (v15) инициализирован.")
 
     def _softmax(self, scores: Dict[str, float]) -> Dict[str, float]:
@@ -536,30 +572,55 @@ class AutoEmotionalAnalyzer:  # <-- v15: Оригинальное имя
         total = sum(exps.values()) or 1.0
         return {k: exps[k] / total for k in scores}
 
-    def analyze(self, text: str) -> Dict[str, float]:
+    def analyze(self, text: TextOrContext) -> Dict[str, float]:
         log.debug("Вызов функции: AutoEmotionalAnalyzer.analyze")
-        s = text.lower()
+        s = as_context(text).lowered
+        return self.score_hits(s, self._matcher.count(s))
 
+    def score_hits(self, s: str, field_hits: Dict[str, int]) -> Dict[str, float]:
+        """Emotion scores of lowered text ``s`` from precomputed lexicon counts (``LexiconMatcher.count``)."""
+        return self.score_counts(
+            self.raw_energy(s), field_hits, lambda: len(SENSUAL_WORDS_RE.findall(s))
+        )
+
+    def raw_energy(self, s: str) -> float:
+        """Punctuation + emoji weight of ``s`` (additive over concatenated fragments)."""
+        punct_energy = sum(PUNCT_WEIGHTS[ch] for ch in _PUNCT_CHARS_RE.findall(s))
+        emoji_energy = sum(EMOJI_WEIGHTS[ch] for ch in _EMOJI_CHARS_RE.findall(s))
+        return punct_energy + emoji_energy
+
+    def segment_hits(self, lowered_segments: Sequence[str]) -> List[Dict[str, int]]:
+        """Lexicon counts for several lowered texts from one automaton scan."""
+        return self._matcher.count_segments(lowered_segments)
+
+    def score_counts(
+        self,
+        raw_energy: float,
+        field_hits: Dict[str, int],
+        sensual_words: Callable[[], int],
+    ) -> Dict[str, float]:
+        """
+        Scores from additive counts: ``raw_energy`` (``raw_energy``), lexicon hits and
+        a lazy count of ``SENSUAL_WORDS_RE`` (нужен только при доминирующем "peace").
+        """
         # 1️⃣ Энергия пунктуации и эмодзи
-        punct_energy = sum(PUNCT_WEIGHTS.get(ch, 0.0) for ch in s)
-        emoji_energy = sum(EMOJI_WEIGHTS.get(ch, 0.0) for ch in s)
-        energy = min(1.0, (punct_energy + emoji_energy) ** 0.7)
+        energy = min(1.0, raw_energy ** 0.7)
         log.debug(f"Энергия пунктуации / эмодзи: {energy:.2f}")
 
         # 2️⃣ Подсчёт совпадений по токенам
         scores: Dict[str, float] = {}
         total_hits = 0
-        for field, pattern in self.LEXICON.items():
-            hits = len(pattern.findall(s))
-            scores[field] = float(hits)
+        for field_name in self.LEXICON_FIELDS:
+            hits = field_hits[f"emo.{field_name}"]
+            scores[field_name] = float(hits)
             total_hits += hits
 
         log.debug(f"Хиты по эмоциям (raw): {scores}")
 
         # 3️⃣ Усиление (Amplification)
         if energy > 0.1 and total_hits > 0:
-            for field in scores:
-                scores[field] *= 1 + energy**2
+            for field_name in scores:
+                scores[field_name] *= 1 + energy**2
             log.debug(f"Хиты по эмоциям (усиленные): {scores}")
 
         # 4️⃣ Нормализация (softmax)
@@ -573,14 +634,7 @@ class AutoEmotionalAnalyzer:  # <-- v15: Оригинальное имя
         # 6️⃣ Снижаем вес "peace" для текстов с высокой телесностью или сенсуальностью
         # чтобы "тишина / вечер" не перетягивали эмоцию
         if normalized.get("peace", 0) > 0.5:
-            sensual_words = len(
-                re.findall(
-                    r"\b(тело|прикосновен|обнима|объятия|наслажден|мягк|шелк|плотск|сенсуальн|touch|embrace|body|sensual|tender|soft|silk|pleasure)\b",
-                    s,
-                    re.I,
-                )
-            )
-            if sensual_words > 2:
+            if sensual_words() > 2:
                 # Снижаем peace и перераспределяем на sensual
                 peace_value = normalized.get("peace", 0)
                 normalized["peace"] = max(0.1, peace_value * 0.3)  # Снижаем на 70%
@@ -749,24 +803,203 @@ def load_emotion_model() -> Dict[str, Any]:
             return _EMOTION_MODEL_CACHE
 
 
+@dataclass
+class EmotionModelIndex:
+    """
+    Precomputed lookups over the base emotions of ``emotion_model_v1.json``.
+
+    ``token_matcher`` — один автомат по токенам эмоций (``cosmic_wonder`` →
+    ``"cosmic wonder"``), дающий те же счётчики, что ``re.findall(re.escape(token))``;
+    ``bucket_targets`` — индексы эмоций, содержащих имя корзины (``"joy" in emotion``).
+
+    Плотные матрицы модели (строятся один раз, если доступен numpy):
+    ``membership`` — эмоция × кластер (сколько раз эмоция входит в кластер),
+    ``genre_bias`` — кластер × жанр, ``bpm_delta`` — вектор по кластерам.
+    Жанры идут в порядке первого появления по кластерам модели — в том же
+    порядке их выдаёт ``EmotionEngine.compute_genre_scores``.
+    """
+
+    emotions: Tuple[str, ...]
+    token_matcher: LexiconMatcher
+    _buckets: Dict[str, Tuple[int, ...]] = field(default_factory=dict, repr=False)
+    clusters: Tuple[str, ...] = ()
+    cluster_sizes: Tuple[int, ...] = ()
+    genres: Tuple[str, ...] = ()
+    membership: Any = field(default=None, repr=False)
+    genre_bias: Any = field(default=None, repr=False)
+    bpm_delta: Any = field(default=None, repr=False)
+
+    @classmethod
+    def from_model(cls, model: Dict[str, Any], buckets: Tuple[str, ...] = ()) -> "EmotionModelIndex":
+        emotions = sorted(
+            {emotion for cluster in model.get("clusters", {}).values() for emotion in cluster.get("emotions", [])}
+        )
+        matcher = LexiconMatcher(
+            {emotion: [emotion.replace("_", " ")] for emotion in emotions},
+            ignore_case=False,
+            escaped=True,
+        )
+        index = cls(tuple(emotions), matcher)
+        for bucket in buckets:
+            index.bucket_targets(bucket)
+        index._build_matrices(model.get("clusters", {}))
+        return index
+
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-ready index tables (see ``lexicon_snapshot``); matrices only if built."""
+        state: Dict[str, Any] = {
+            "emotions": list(self.emotions),
+            "token_matcher": self.token_matcher.to_state(),
+            "buckets": {bucket: list(targets) for bucket, targets in self._buckets.items()},
+            "clusters": list(self.clusters),
+            "cluster_sizes": list(self.cluster_sizes),
+            "genres": list(self.genres),
+        }
+        if self.has_matrices:
+            state["membership"] = self.membership.tolist()
+            state["genre_bias"] = self.genre_bias.tolist()
+            state["bpm_delta"] = self.bpm_delta.tolist()
+        return state
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any], model: Dict[str, Any]) -> "EmotionModelIndex":
+        """Restore ``to_state()``; matrices missing from the snapshot are rebuilt from ``model``."""
+        index = cls(
+            tuple(state["emotions"]),
+            LexiconMatcher.from_state(state["token_matcher"]),
+            {bucket: tuple(targets) for bucket, targets in state["buckets"].items()},
+        )
+        if not NUMPY_AVAILABLE or "membership" not in state:
+            index._build_matrices(model.get("clusters", {}))
+            return index
+        index.clusters = tuple(state["clusters"])
+        index.cluster_sizes = tuple(state["cluster_sizes"])
+        index.genres = tuple(state["genres"])
+        index.membership = np.asarray(state["membership"], dtype=float).reshape(len(index.emotions), len(index.clusters))
+        index.genre_bias = np.asarray(state["genre_bias"], dtype=float).reshape(len(index.clusters), len(index.genres))
+        index.bpm_delta = np.asarray(state["bpm_delta"], dtype=float)
+        return index
+
+    def _build_matrices(self, model_clusters: Dict[str, Any]) -> None:
+        self.clusters = tuple(model_clusters)
+        self.cluster_sizes = tuple(len(c.get("emotions", [])) for c in model_clusters.values())
+        genres: Dict[str, int] = {}
+        for cluster_model in model_clusters.values():
+            for genre in cluster_model.get("genre_bias", {}):
+                genres.setdefault(genre, len(genres))
+        self.genres = tuple(genres)
+        if not NUMPY_AVAILABLE:
+            return
+
+        emotion_ids = {emotion: i for i, emotion in enumerate(self.emotions)}
+        membership = np.zeros((len(self.emotions), len(self.clusters)))
+        genre_bias = np.zeros((len(self.clusters), len(self.genres)))
+        bpm_delta = np.zeros(len(self.clusters))
+        for c, cluster_model in enumerate(model_clusters.values()):
+            for emotion in cluster_model.get("emotions", []):
+                membership[emotion_ids[emotion], c] += 1.0
+            for genre, bias in cluster_model.get("genre_bias", {}).items():
+                genre_bias[c, genres[genre]] += float(bias)
+            bpm_delta[c] = float(cluster_model.get("bpm_delta", 0.0))
+        self.membership = membership
+        self.genre_bias = genre_bias
+        self.bpm_delta = bpm_delta
+
+    def bucket_targets(self, bucket: str) -> Tuple[int, ...]:
+        targets = self._buckets.get(bucket)
+        if targets is None:
+            targets = tuple(i for i, emotion in enumerate(self.emotions) if bucket in emotion)
+            self._buckets[bucket] = targets
+        return targets
+
+    def token_hits(self, lowered: str) -> List[int]:
+        """Keyword hits per base emotion, aligned with ``emotions``."""
+        counts = self.token_matcher.count(lowered)
+        return [counts[emotion] for emotion in self.emotions]
+
+    def token_hits_many(self, lowered_texts: Sequence[str]) -> List[List[int]]:
+        """``token_hits`` for several texts from one scan of the automaton."""
+        return [
+            [counts[emotion] for emotion in self.emotions]
+            for counts in self.token_matcher.count_segments(lowered_texts)
+        ]
+
+    @property
+    def has_matrices(self) -> bool:
+        return self.membership is not None
+
+    def project_matrix(self, raw_matrix: Any) -> Any:
+        """N×E raw vectors (columns = ``emotions``) → N×C cluster projection (rounded to 3)."""
+        raw = np.atleast_2d(np.asarray(raw_matrix, dtype=float))
+        sizes = np.asarray(self.cluster_sizes, dtype=float)
+        totals = raw @ self.membership
+        # Пустой кластер → 0.0, как в project_to_clusters
+        projected = np.divide(totals, np.maximum(sizes, 1.0))
+        projected[:, sizes == 0] = 0.0
+        return np.round(projected, 3)
+
+    def genre_scores_from_clusters(self, cluster_matrix: Any) -> Any:
+        """N×C cluster projections → N×G genre scores (columns = ``genres``), each row max - normalised."""
+        scores = np.atleast_2d(np.asarray(cluster_matrix, dtype=float)) @ self.genre_bias
+        if not scores.size:
+            return scores
+        row_max = scores.max(axis=1, keepdims=True)
+        positive = row_max[:, 0] > 0
+        normalised = np.zeros_like(scores)
+        normalised[positive] = np.round(scores[positive] / row_max[positive], 3)
+        return normalised
+
+    def genre_scores_matrix(self, raw_matrix: Any) -> Any:
+        """N×E raw vectors → N×G genre scores (projection and scoring in two products)."""
+        return self.genre_scores_from_clusters(self.project_matrix(raw_matrix))
+
+    def bpm_deltas(self, cluster_matrix: Any) -> Any:
+        """N×C cluster projections → N model ``bpm_delta`` sums (before the 0.25 weight)."""
+        return np.atleast_2d(np.asarray(cluster_matrix, dtype=float)) @ self.bpm_delta
+
+
+_EMOTION_INDEX_CACHE: Optional[EmotionModelIndex] = None
+
+
+def emotion_index_buckets() -> Tuple[str, ...]:
+    # Корзины AutoEmotionalAnalyzer известны заранее; остальные индексируются при первом обращении
+    return tuple(AutoEmotionalAnalyzer.EMO_FIELDS) + ("peace", "sensual")
+
+
+def load_emotion_model_index() -> EmotionModelIndex:
+    """Index over the cached emotion model (built once per process)."""
+    global _EMOTION_INDEX_CACHE
+
+    model = load_emotion_model()
+    with _EMOTION_MODEL_LOCK:
+        if _EMOTION_INDEX_CACHE is None:
+            buckets = emotion_index_buckets()
+            # Готовые таблицы из снимка (если он есть и собран из тех же данных)
+            from .lexicon_snapshot import snapshot_entry, source_digest
+
+            state = snapshot_entry("emotion.model_index", source_digest(model, buckets))
+            if state is not None:
+                _EMOTION_INDEX_CACHE = EmotionModelIndex.from_state(state, model)
+            else:
+                _EMOTION_INDEX_CACHE = EmotionModelIndex.from_model(model, buckets)
+        return _EMOTION_INDEX_CACHE
+
+
 class EmotionEngine:
     """Emotion inference pipeline that maps raw cues → clusters → genre / BPM / key."""
 
     def __init__(self) -> None:
-        self.lexicon = EmotionLexiconExtended()
-        self.auto_analyzer = AutoEmotionalAnalyzer()
-        self.tlp_engine = TruthLovePainEngine()
+        from .engine_registry import get_engine
+
+        # Под-движки без состояния — общие на процесс; _phrase_packets остаётся своим
+        self.lexicon: EmotionLexiconExtended = get_engine("emotion.lexicon")
+        self.auto_analyzer: AutoEmotionalAnalyzer = get_engine("emotion.auto")
+        self.tlp_engine: TruthLovePainEngine = get_engine("tlp")
         self._model = load_emotion_model()
-        self._base_emotions = self._collect_base_emotions()
+        self._index = load_emotion_model_index()
+        self._base_emotions = list(self._index.emotions)
         self._phrase_packets: list[PhraseEmotionPacket] = []
 
-    def _collect_base_emotions(self) -> list[str]:
-        clusters = self._model.get("clusters", {})
-        emotions: list[str] = []
-        for cluster in clusters.values():
-            emotions.extend(cluster.get("emotions", []))
-        return sorted(set(emotions))
-
     def reset_phrase_packets(self) -> None:
         """Reset the internal phrase packet buffer."""
 
@@ -780,9 +1013,63 @@ class EmotionEngine:
     def analyze_phrase(self, phrase: str) -> PhraseEmotionPacket:
         """Phrase - level analyzer that leverages the v1 emotion model."""
 
-        safe_phrase = phrase or ""
-        normalized = " ".join(safe_phrase.lower().strip().split())
+        return self.analyze_phrases([phrase])[0]
 
+    def analyze_phrases(self, phrases: Sequence[str]) -> List[PhraseEmotionPacket]:
+        """
+        Batch form of ``analyze_phrase`` (same packets, same order).
+
+        Словари TLP / EMO и токены модели сканируются один раз по всем фразам
+        секции (``LexiconMatcher.count_segments``), а попадания раздаются фразам
+        по смещению — вместо отдельного прохода каждого движка по каждой фразе;
+        проекция на кластеры — ``project_to_clusters_many`` по всем фразам сразу.
+        """
+
+        prepared = [(phrase or "", " ".join((phrase or "").lower().strip().split())) for phrase in phrases]
+        lowered = [normalized.lower() for _, normalized in prepared if normalized]
+
+        tlp_matcher = self.tlp_engine._matcher
+        auto_matcher = self.auto_analyzer._matcher
+        tlp_hits = tlp_matcher.count_segments(lowered)
+        auto_hits = tlp_hits if auto_matcher is tlp_matcher else auto_matcher.count_segments(lowered)
+        token_hits = self._index.token_hits_many(lowered)
+
+        base_vectors: List[Dict[str, float]] = []
+        tlp_profiles: List[Dict[str, float]] = []
+        for i, s in enumerate(lowered):
+            base_vectors.append(
+                self._raw_emotion_vector(s, token_hits[i], self.auto_analyzer.score_hits(s, auto_hits[i]))
+            )
+            tlp_profiles.append(self.tlp_engine.score_hits(s, tlp_hits[i]))
+        # Проекция всех фраз секции на кластеры — одно матричное произведение
+        cluster_vectors = self.project_to_clusters_many(base_vectors)
+
+        packets: List[PhraseEmotionPacket] = []
+        scanned = 0
+        for safe_phrase, normalized in prepared:
+            if not normalized:
+                packets.append(self._phrase_packet(safe_phrase, normalized, None, None, None))
+                continue
+            packets.append(
+                self._phrase_packet(
+                    safe_phrase,
+                    normalized,
+                    base_vectors[scanned],
+                    cluster_vectors[scanned],
+                    tlp_profiles[scanned],
+                )
+            )
+            scanned += 1
+        return packets
+
+    def _phrase_packet(
+        self,
+        safe_phrase: str,
+        normalized: str,
+        base_vector: Optional[Dict[str, float]],
+        cluster_vector: Optional[Dict[str, float]],
+        tlp_profile: Optional[Dict[str, float]],
+    ) -> PhraseEmotionPacket:
         # Semantic role detection (early to avoid failures later)
         semantic_role = "statement"
         if any(marker in safe_phrase.lower() for marker in ("как", "словно", "будто")):
@@ -798,9 +1085,6 @@ class EmotionEngine:
             weight = 0.05
             impact_zone = "mixed"
         else:
-            base_vector = self.build_raw_emotion_vector(normalized)
-            cluster_vector = self.project_to_clusters(base_vector)
-
             # Normalize cluster values if they exceed 1.0
             max_cluster = max(cluster_vector.values()) if cluster_vector else 0.0
             if max_cluster > 1.0:
@@ -808,8 +1092,6 @@ class EmotionEngine:
                     k: round(v / max_cluster, 3) for k, v in cluster_vector.items()
                 }
 
-            tlp_profile = self.tlp_engine.analyze(normalized)
-
             base_energy = min(1.0, sum(base_vector.values())) if base_vector else 0.0
             weight = max(base_energy, max_cluster)
             if weight <= 0:
@@ -841,34 +1123,43 @@ class EmotionEngine:
         self._phrase_packets.append(packet)
         return packet
 
-    def build_raw_emotion_vector(self, text: str) -> Dict[str, float]:
-        """Build normalized raw emotion scores (0..1) for atomic emotions."""
+    def build_raw_emotion_vector(
+        self, text: TextOrContext, auto_scores: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """
+        Build normalized raw emotion scores (0..1) for atomic emotions.
 
-        lowered = text.lower()
-        raw_scores: Dict[str, float] = {emotion: 0.0 for emotion in self._base_emotions}
+        ``auto_scores`` — уже посчитанный ``AutoEmotionalAnalyzer.analyze`` этого
+        же текста (например, узел "emotion" графа запроса): анализатор не
+        вызывается повторно.
+        """
+        ctx = as_context(text)
+        # Direct keyword matching against the model emotions (один проход автомата)
+        token_hits = self._index.token_hits(ctx.lowered)
+        # Heuristic analyzer (joy / sadness / etc.) mapped onto similar tokens
+        if auto_scores is None:
+            auto_scores = self.auto_analyzer.analyze(ctx)
+        return self._raw_emotion_vector(ctx.text, token_hits, auto_scores)
 
-        # Direct keyword matching against the model emotions
-        for emotion in self._base_emotions:
-            token = emotion.replace("_", " ")
-            pattern = re.escape(token)
-            hits = len(re.findall(pattern, lowered))
-            raw_scores[emotion] += float(hits)
+    def _raw_emotion_vector(
+        self, text: str, token_hits: List[int], auto_scores: Dict[str, float]
+    ) -> Dict[str, float]:
+        index = self._index
+        scores = [float(hits) for hits in token_hits]
 
         # Lexicon - driven boosts
         lexicon_result = self.lexicon.get_emotion(text)
         for bucket, active in lexicon_result.get("emotions", {}).items():
             if not active:
                 continue
-            for emotion in self._base_emotions:
-                if bucket in emotion:
-                    raw_scores[emotion] += 1.0
+            for i in index.bucket_targets(bucket):
+                scores[i] += 1.0
 
-        # Heuristic analyzer (joy / sadness / etc.) mapped onto similar tokens
-        auto_scores = self.auto_analyzer.analyze(text)
         for bucket, value in auto_scores.items():
-            for emotion in self._base_emotions:
-                if bucket in emotion:
-                    raw_scores[emotion] += float(value) * 2.0
+            for i in index.bucket_targets(bucket):
+                scores[i] += float(value) * 2.0
+
+        raw_scores: Dict[str, float] = dict(zip(index.emotions, scores))
 
         max_score = max(raw_scores.values()) if raw_scores else 0.0
         if max_score <= 0:
@@ -878,7 +1169,29 @@ class EmotionEngine:
             for emotion, score in raw_scores.items()
         }
 
+    def _raw_matrix(self, raws: Sequence[Dict[str, float]]) -> Any:
+        return np.array([[raw.get(e, 0.0) for e in self._index.emotions] for raw in raws], dtype=float)
+
+    def _cluster_row(self, clusters: Dict[str, float]) -> Any:
+        return np.array([[clusters.get(name, 0.0) for name in self._index.clusters]], dtype=float)
+
     def project_to_clusters(self, raw: Dict[str, float]) -> Dict[str, float]:
+        """Raw emotion vector → cluster means (``membership.T @ raw`` / cluster sizes)."""
+        if not self._index.has_matrices:
+            return self._project_to_clusters_dict(raw)
+        return self.project_to_clusters_many([raw])[0]
+
+    def project_to_clusters_many(self, raws: Sequence[Dict[str, float]]) -> List[Dict[str, float]]:
+        """``project_to_clusters`` for many raw vectors (N×E @ E×C in one product)."""
+        index = self._index
+        if not raws:
+            return []
+        if not index.has_matrices:
+            return [self._project_to_clusters_dict(raw) for raw in raws]
+        projected = index.project_matrix(self._raw_matrix(raws))
+        return [dict(zip(index.clusters, (float(v) for v in row))) for row in projected]
+
+    def _project_to_clusters_dict(self, raw: Dict[str, float]) -> Dict[str, float]:
         clusters = self._model.get("clusters", {})
         projected: Dict[str, float] = {}
         for cluster_name, cluster_model in clusters.items():
@@ -891,6 +1204,32 @@ class EmotionEngine:
         return projected
 
     def compute_genre_scores(self, clusters: Dict[str, float]) -> Dict[str, float]:
+        """
+        Cluster projection → genre scores (``genre_bias.T @ clusters``), max - normalised.
+
+        Матричный путь выдаёт все жанры модели; отсутствующие во входе кластеры
+        считаются нулевыми.
+        """
+        index = self._index
+        if not index.has_matrices:
+            return self._genre_scores_dict(clusters)
+        scores = index.genre_scores_from_clusters(self._cluster_row(clusters))[0]
+        return dict(zip(index.genres, (float(v) for v in scores)))
+
+    def compute_genre_scores_batch(self, raw_vectors: Sequence[Dict[str, float]]) -> List[Dict[str, float]]:
+        """
+        Genre scores for many raw vectors at once (N×E → N×C → N×G, два матричных
+        произведения); строка ``i`` — ``compute_genre_scores(project_to_clusters(raw_i))``.
+        """
+        index = self._index
+        if not raw_vectors:
+            return []
+        if not index.has_matrices:
+            return [self._genre_scores_dict(self._project_to_clusters_dict(raw)) for raw in raw_vectors]
+        scores = index.genre_scores_matrix(self._raw_matrix(raw_vectors))
+        return [dict(zip(index.genres, (float(v) for v in row))) for row in scores]
+
+    def _genre_scores_dict(self, clusters: Dict[str, float]) -> Dict[str, float]:
         genre_scores: Dict[str, float] = {}
         model_clusters = self._model.get("clusters", {})
         for cluster_name, value in clusters.items():
@@ -935,15 +1274,21 @@ class EmotionEngine:
         bpm += hope * 15.0
         bpm += awe * 10.0
 
+        bpm += self._bpm_delta(clusters) * 0.25
+
+        bpm = max(60.0, min(190.0, bpm))
+        return round(bpm, 2)
+
+    def _bpm_delta(self, clusters: Dict[str, float]) -> float:
+        """Model ``bpm_delta`` weighted by the projection (``bpm_delta @ clusters``)."""
+        if self._index.has_matrices:
+            return float(self._index.bpm_deltas(self._cluster_row(clusters))[0])
         model_clusters = self._model.get("clusters", {})
         delta = 0.0
         for cluster_name, value in clusters.items():
             cluster_model = model_clusters.get(cluster_name, {})
             delta += value * float(cluster_model.get("bpm_delta", 0.0))
-        bpm += delta * 0.25
-
-        bpm = max(60.0, min(190.0, bpm))
-        return round(bpm, 2)
+        return delta
 
     def compute_key_and_mode(self, clusters: Dict[str, float]) -> Dict[str, str]:
         sadness = (
@@ -969,9 +1314,13 @@ class EmotionEngine:
         return key_info
 
     def build_emotion_profile(
-        self, text: str, legacy_context: Optional[Dict[str, Any]] = None
+        self,
+        text: TextOrContext,
+        legacy_context: Optional[Dict[str, Any]] = None,
+        *,
+        auto_scores: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
-        raw = self.build_raw_emotion_vector(text)
+        raw = self.build_raw_emotion_vector(text, auto_scores)
         clusters = self.project_to_clusters(raw)
         genre_scores = self.compute_genre_scores(clusters)
         bpm = self.compute_bpm_base(clusters)
@@ -997,6 +1346,10 @@ __all__ = [
     "EmotionEngineV2",
     "EmotionSignal",
     "load_emotion_model",
+    "load_emotion_model_index",
+    "emotion_index_buckets",
+    "EmotionModelIndex",
+    "lexicon_fields",
 ]
 
 # StudioCore Signature Block (Do Not Remove)
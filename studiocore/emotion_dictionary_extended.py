@@ -17,7 +17,13 @@
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
+
+from .text_utils import OTHER_SCRIPT, detect_scripts, stem_script
+
+# Семейства ключевых слов в порядке проверки (порядок ключей внутри семейства
+# задаёт приоритет, как в прежних циклах ``any(word in text ...)``)
+_FAMILIES = ("emotion_words", "drama_levels", "speech_registers", "tone_markers")
 
 
 class EmotionLexiconExtended:
@@ -65,44 +71,94 @@ class EmotionLexiconExtended:
             "low": ["шёпот", "тихо", "лёгкий", "мягкий"],
         }
 
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """
+        Keyword table over all families (call again after editing the lists).
+
+        Каждое уникальное слово хранится один раз со списком групп, куда оно
+        входит, и числом повторов в маркерах интенсивности; слова разложены по
+        алфавиту (``text_utils.stem_script``).
+        """
+        index: Dict[str, Dict[str, Any]] = {}
+        for family in _FAMILIES:
+            for key, words in getattr(self, family).items():
+                for word in words:
+                    entry = index.setdefault(word, {"groups": [], "intensity": {}})
+                    entry["groups"].append((family, key))
+        for level, words in self.intensity_markers.items():
+            for word in words:
+                entry = index.setdefault(word, {"groups": [], "intensity": {}})
+                # Повтор слова в списке — повтор text.count(word) в сумме
+                entry["intensity"][level] = entry["intensity"].get(level, 0) + 1
+
+        self._index_by_script: Dict[str, List[Tuple[str, List[Tuple[str, str]], Dict[str, int]]]] = {}
+        for word, entry in index.items():
+            self._index_by_script.setdefault(stem_script(word), []).append(
+                (word, entry["groups"], entry["intensity"])
+            )
+
+    def _scan(self, lowered: str) -> Tuple[set, Dict[str, int]]:
+        """One pass over the keyword table: matched ``(family, key)`` groups and intensity hits."""
+        matched: set = set()
+        intensity = {level: 0 for level in self.intensity_markers}
+        scripts = detect_scripts(lowered) | {OTHER_SCRIPT}
+        for script in scripts:
+            for word, groups, levels in self._index_by_script.get(script, ()):
+                if levels:
+                    count = lowered.count(word)
+                    if not count:
+                        continue
+                    for level, repeats in levels.items():
+                        intensity[level] += count * repeats
+                elif matched.issuperset(groups) or word not in lowered:
+                    # Группы уже найдены (как ранний выход any()) или слова нет
+                    continue
+                matched.update(groups)
+        return matched, intensity
+
     def get_emotion(self, text: str) -> Dict[str, Any]:
         lowered = text.lower()
+        # Один проход по таблице слов отвечает на все семейства сразу; слова
+        # других алфавитов (весь словарь для латинского текста) не ищутся
+        matched, intensity = self._scan(lowered)
 
         buckets = {
-            emotion: any(word in lowered for word in words)
-            for emotion, words in self.emotion_words.items()
+            emotion: ("emotion_words", emotion) in matched
+            for emotion in self.emotion_words
         }
 
         return {
             "emotions": buckets,
-            "register": self._detect_register(lowered),
-            "tone": self._detect_tone(lowered),
-            "drama_level": self._detect_drama_level(lowered),
-            "intensity": self._estimate_intensity(lowered),
+            "register": self._first_match(matched, "speech_registers"),
+            "tone": self._first_match(matched, "tone_markers"),
+            "drama_level": self._first_match(matched, "drama_levels"),
+            "intensity": self._intensity_from_hits(intensity, lowered),
         }
 
-    def _detect_drama_level(self, text: str) -> str:
-        for level, keywords in self.drama_levels.items():
-            if any(word in text for word in keywords):
-                return level
+    def _first_match(self, matched: set, family: str) -> str:
+        for key in getattr(self, family):
+            if (family, key) in matched:
+                return key
         return "neutral"
 
+    def _detect_drama_level(self, text: str) -> str:
+        return self._first_match(self._scan(text)[0], "drama_levels")
+
     def _detect_register(self, text: str) -> str:
-        for register, keywords in self.speech_registers.items():
-            if any(word in text for word in keywords):
-                return register
-        return "neutral"
+        return self._first_match(self._scan(text)[0], "speech_registers")
 
     def _detect_tone(self, text: str) -> str:
-        for tone, keywords in self.tone_markers.items():
-            if any(word in text for word in keywords):
-                return tone
-        return "neutral"
+        return self._first_match(self._scan(text)[0], "tone_markers")
 
     def _estimate_intensity(self, text: str) -> float:
-        high_hits = sum(text.count(word) for word in self.intensity_markers["high"])
-        medium_hits = sum(text.count(word) for word in self.intensity_markers["medium"])
-        low_hits = sum(text.count(word) for word in self.intensity_markers["low"])
+        return self._intensity_from_hits(self._scan(text)[1], text)
+
+    def _intensity_from_hits(self, hits: Dict[str, int], text: str) -> float:
+        high_hits = hits.get("high", 0)
+        medium_hits = hits.get("medium", 0)
+        low_hits = hits.get("low", 0)
 
         punctuation_bonus = min(text.count("!") / 5, 1.0) * 0.2
         base = high_hits * 0.3 + medium_hits * 0.15 + low_hits * 0.05
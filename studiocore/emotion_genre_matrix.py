@@ -7,7 +7,15 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    # Без numpy оценка идёт по таблице правил циклом (_genre_bias_rules)
+    np = None
+    NUMPY_AVAILABLE = False
 
 _GENRES = (
     "rock_metal",
@@ -21,93 +29,162 @@ _GENRES = (
     "pop",
 )
 
-
-def _clamp(value: float, lo: float = 0.0, hi: float = 1.0) -> float:
-    return max(lo, min(hi, value))
-
-
-def compute_genre_bias(emotion_vector: Dict[str, float]) -> Dict[str, float]:
-    """Translate a 7 - axis emotion vector into macro - genre biases.
-
-    Biases are normalised to ``[0.0, 1.0]`` and start from a neutral baseline of
-    ``1.0``.  Variant A rules intentionally allow strong emotional signals to
-    dominate textual routing.
-    """
-
-    bias = {genre: 1.0 for genre in _GENRES}
-    vector = emotion_vector or {}
-
-    anger = float(vector.get("anger", 0.0))
-    sadness = float(vector.get("sadness", 0.0))
-    awe = float(vector.get("awe", 0.0))
-    joy = float(vector.get("joy", 0.0))
-    pain = float(vector.get("pain", 0.0))
-    love = float(vector.get("love", 0.0))
-
+# Правила Variant A в табличном виде: ось → (линейные веса, (порог, веса выше порога)).
+# Из таблицы один раз строятся матрицы ось × жанр для матричного пути; порядок осей
+# и жанров внутри оси — порядок применения в цикловом пути без numpy.
+_RULES: Tuple[Tuple[str, Tuple[Tuple[str, float], ...], Tuple[float, Tuple[Tuple[str, float], ...]]], ...] = (
     # anger ↑ metal / industrial / hip - hop, ↓ jazz / folk / pop
     # На основе базы: HARD (rock / metal) - преимущественно minor, быстрый BPM
-    bias["rock_metal"] += 0.65 * anger  # Увеличено: более сильная связь
-    bias["hip_hop"] += 0.55 * anger  # Увеличено
-    bias["jazz"] -= 0.45 * anger  # Усилено вычитание: jazz только major
-    bias["folk"] -= 0.35 * anger  # Усилено
-    bias["pop"] -= 0.35 * anger  # Усилено
-
+    (
+        "anger",
+        (
+            ("rock_metal", 0.65),  # Увеличено: более сильная связь
+            ("hip_hop", 0.55),  # Увеличено
+            ("jazz", -0.45),  # Усилено вычитание: jazz только major
+            ("folk", -0.35),  # Усилено
+            ("pop", -0.35),  # Усилено
+        ),
+        (0.5, ()),
+    ),
     # sadness ↑ gothic / darkwave / neofolk, ↓ EDM / pop
     # На основе базы: CINEMATIC - преимущественно minor, медленный BPM
-    bias["gothic"] += 0.60 * sadness  # Увеличено
-    bias["folk"] += 0.28 * sadness  # Слегка увеличено
-    bias["edm"] -= 0.38 * sadness  # Усилено: EDM очень быстрый (134.9 BPM)
-    bias["pop"] -= 0.28 * sadness  # Слегка увеличено
-
+    (
+        "sadness",
+        (
+            ("gothic", 0.60),  # Увеличено
+            ("folk", 0.28),  # Слегка увеличено
+            ("edm", -0.38),  # Усилено: EDM очень быстрый (134.9 BPM)
+            ("pop", -0.28),  # Слегка увеличено
+        ),
+        (0.5, ()),
+    ),
     # awe ↑ orchestral / cinematic, ↓ hip - hop / edm
     # На основе базы: CINEMATIC - преимущественно minor, медленный BPM (80.0)
     # Цвета epic / awe: #8A2BE2, #4B0082, #FF00FF, #40E0D0 → cinematic жанры
-    bias["orchestral"] += 0.70 * awe  # Увеличено
-    bias["hip_hop"] -= 0.28 * awe  # Слегка усилено
-    bias["edm"] -= 0.22 * awe  # Слегка усилено
-    # Дополнительный boost для cinematic при высоком awe (цвета epic указывают
-    # на cinematic)
-    if awe > 0.5:
-        # Дополнительный boost для высокого awe
-        bias["orchestral"] += 0.18 * (awe - 0.5)
-
+    (
+        "awe",
+        (
+            ("orchestral", 0.70),  # Увеличено
+            ("hip_hop", -0.28),  # Слегка усилено
+            ("edm", -0.22),  # Слегка усилено
+        ),
+        # Дополнительный boost для cinematic при высоком awe (цвета epic указывают
+        # на cinematic)
+        (0.5, (("orchestral", 0.18),)),
+    ),
     # joy ↑ pop / funk / electronic, ↓ gothic / doom
     # На основе базы: POP / EDM - быстрый BPM, преимущественно major
     # Цвета joy: #FFD93D, #FFD700, #FFFF00, #FFF59D → electronic / pop жанры
-    bias["pop"] += 0.60 * joy  # Увеличено
-    bias["edm"] += 0.38 * joy  # Увеличено
-    bias["gothic"] -= 0.45 * joy  # Усилено: gothic преимущественно minor
-    # Дополнительный boost для pop / edm при высоком joy (цвета joy указывают
-    # на pop / electronic)
-    if joy > 0.5:
-        # Дополнительный boost для высокого joy
-        bias["pop"] += 0.15 * (joy - 0.5)
-        # Дополнительный boost для высокого joy
-        bias["edm"] += 0.12 * (joy - 0.5)
-
+    (
+        "joy",
+        (
+            ("pop", 0.60),  # Увеличено
+            ("edm", 0.38),  # Увеличено
+            ("gothic", -0.45),  # Усилено: gothic преимущественно minor
+        ),
+        # Дополнительный boost для pop / edm при высоком joy (цвета joy указывают
+        # на pop / electronic)
+        (0.5, (("pop", 0.15), ("edm", 0.12))),
+    ),
     # pain ↑ darkwave / gothic, ↓ pop
     # На основе базы: GOTHIC - преимущественно minor, медленный BPM
-    bias["gothic"] += 0.55 * pain  # Увеличено
-    bias["pop"] -= 0.50 * pain  # Усилено: pop преимущественно major
-
+    (
+        "pain",
+        (
+            ("gothic", 0.55),  # Увеличено
+            ("pop", -0.50),  # Усилено: pop преимущественно major
+        ),
+        (0.5, ()),
+    ),
     # love ↑ ballad / folk, ↓ metal
     # На основе базы: LYRICAL / SOFT - преимущественно major, медленный / средний BPM
     # Цвета love: #FF7AA2, #FFC0CB, #FFB6C1, #FFE4E1, #C2185B → lyrical / soft
     # жанры
-    bias["folk"] += 0.45 * love  # Увеличено
-    bias["chanson"] += 0.25 * love  # Увеличено
-    # Усилено: rock_metal преимущественно minor
-    bias["rock_metal"] -= 0.40 * love
-    # Дополнительный boost для lyrical жанров (цвета love указывают на лирику)
-    if love > 0.5:
-        # Дополнительный boost для высокого love
-        bias["chanson"] += 0.15 * (love - 0.5)
+    (
+        "love",
+        (
+            ("folk", 0.45),  # Увеличено
+            ("chanson", 0.25),  # Увеличено
+            ("rock_metal", -0.40),  # Усилено: rock_metal преимущественно minor
+        ),
+        # Дополнительный boost для lyrical жанров (цвета love указывают на лирику)
+        (0.5, (("chanson", 0.15),)),
+    ),
+)
+
+_AXES = tuple(axis for axis, _, _ in _RULES)
+
+
+def _clamp(value: float, lo: float = 0.0, hi: float = 1.0) -> float:
+    return max(lo, min(hi, value))
+
+
+def _genre_bias_rules(emotion_vector: Dict[str, float]) -> Dict[str, float]:
+    """Dict - loop form of ``compute_genre_bias`` (fallback without numpy)."""
+
+    bias = {genre: 1.0 for genre in _GENRES}
+    vector = emotion_vector or {}
+
+    for axis, linear, (threshold, extra) in _RULES:
+        value = float(vector.get(axis, 0.0))
+        for genre, weight in linear:
+            bias[genre] += weight * value
+        if value > threshold:
+            for genre, weight in extra:
+                bias[genre] += weight * (value - threshold)
 
     normalized = {genre: round(_clamp(value), 3) for genre, value in bias.items()}
     return normalized
 
 
-__all__ = ["compute_genre_bias"]
+def _rule_matrices() -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """Axis × genre matrices of linear and above - threshold weights, plus thresholds."""
+    genre_ids = {genre: g for g, genre in enumerate(_GENRES)}
+    linear_w = np.zeros((len(_AXES), len(_GENRES)))
+    extra_w = np.zeros((len(_AXES), len(_GENRES)))
+    thresholds = np.zeros(len(_AXES))
+    for a, (_, linear, (threshold, extra)) in enumerate(_RULES):
+        thresholds[a] = threshold
+        for genre, weight in linear:
+            linear_w[a, genre_ids[genre]] += weight
+        for genre, weight in extra:
+            extra_w[a, genre_ids[genre]] += weight
+    return linear_w, extra_w, thresholds
+
+
+_RULE_MATRICES = _rule_matrices() if NUMPY_AVAILABLE else None
+
+
+def compute_genre_bias(emotion_vector: Dict[str, float]) -> Dict[str, float]:
+    """Translate a 7 - axis emotion vector into macro - genre biases.
+
+    Biases are normalised to ``[0.0, 1.0]`` and start from a neutral baseline of
+    ``1.0``.  Variant A rules intentionally allow strong emotional signals to
+    dominate textual routing.
+    """
+
+    return compute_genre_bias_batch([emotion_vector])[0]
+
+
+def compute_genre_bias_batch(emotion_vectors: Sequence[Dict[str, float]]) -> List[Dict[str, float]]:
+    """``compute_genre_bias`` for N vectors at once (N×axes → N×genres in one product)."""
+
+    if not emotion_vectors:
+        return []
+    if _RULE_MATRICES is None:
+        return [_genre_bias_rules(vector) for vector in emotion_vectors]
+
+    linear_w, extra_w, thresholds = _RULE_MATRICES
+    values = np.array(
+        [[float((vector or {}).get(axis, 0.0)) for axis in _AXES] for vector in emotion_vectors],
+        dtype=float,
+    )
+    bias = 1.0 + values @ linear_w + np.maximum(values - thresholds, 0.0) @ extra_w
+    bias = np.round(np.clip(bias, 0.0, 1.0), 3)
+    return [dict(zip(_GENRES, (float(v) for v in row))) for row in bias]
+
+
+__all__ = ["compute_genre_bias", "compute_genre_bias_batch"]
 
 # StudioCore Signature Block (Do Not Remove)
 # Author: Сергей Бауэр (@Sbauermaner)
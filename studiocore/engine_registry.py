@@ -0,0 +1,137 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Process-wide registry of shared engine instances.
+
+Раньше ``VocalProfileRegistry``, ``RhythmDynamicsEmotionEngine``,
+``DynamicEmotionEngine``, ``emotion.EmotionEngine`` и ядро каждый раз
+создавали свои ``AutoEmotionalAnalyzer`` / ``TruthLovePainEngine`` и заново
+компилировали большие регулярные выражения словарей. Реестр выдаёт один
+экземпляр на процесс для движков без состояния запроса (после ``__init__``
+они только читают свои скомпилированные словари; кэши уже общие, см.
+``bounded_cache``).
+
+Движки с состоянием между вызовами (например, ``emotion.EmotionEngine`` с
+``_phrase_packets``) в реестр не попадают — они создаются как раньше, но
+берут свои под-движки отсюда.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+log = logging.getLogger(__name__)
+
+
+def _auto_emotional_analyzer() -> Any:
+    from .emotion import AutoEmotionalAnalyzer
+
+    return AutoEmotionalAnalyzer()
+
+
+def _truth_love_pain_engine() -> Any:
+    # Подкласс из tlp_engine: те же результаты analyze() + общий кэш и хелперы
+    from .tlp_engine import TruthLovePainEngine
+
+    return TruthLovePainEngine()
+
+
+def _tone_sync_engine() -> Any:
+    from .tone import ToneSyncEngine
+
+    return ToneSyncEngine()
+
+
+def _rde_engine() -> Any:
+    from .rde_engine import RhythmDynamicsEmotionEngine
+
+    return RhythmDynamicsEmotionEngine()
+
+
+def _logical_emotion_engine() -> Any:
+    from .logical_engines import EmotionEngine
+
+    return EmotionEngine()
+
+
+def _lexicon_matcher() -> Any:
+    # Один автомат Aho–Corasick на словари TLP и EMO_FIELDS (из снимка, если он актуален)
+    from .emotion import lexicon_fields
+    from .lexicon_snapshot import matcher_from_snapshot
+
+    return matcher_from_snapshot("lexicon.matcher", lexicon_fields())
+
+
+def _emotion_lexicon() -> Any:
+    from .emotion_dictionary_extended import EmotionLexiconExtended
+
+    return EmotionLexiconExtended()
+
+
+_FACTORIES: Dict[str, Callable[[], Any]] = {
+    "emotion.auto": _auto_emotional_analyzer,
+    "tlp": _truth_love_pain_engine,
+    "tone": _tone_sync_engine,
+    "rde": _rde_engine,
+    "emotion.logical": _logical_emotion_engine,
+    "emotion.lexicon": _emotion_lexicon,
+    "lexicon.matcher": _lexicon_matcher,
+}
+_INSTANCES: Dict[str, Any] = {}
+# RLock: фабрики сами запрашивают под-движки (rde → tlp, emotion.logical → emotion.auto)
+_REGISTRY_LOCK = threading.RLock()
+
+
+def register_engine(name: str, factory: Callable[[], Any], *, replace: bool = False) -> None:
+    """Register a factory for ``name``; ``replace=True`` also drops a built instance."""
+    with _REGISTRY_LOCK:
+        if name in _FACTORIES and not replace:
+            raise ValueError(f"Engine already registered: {name}")
+        _FACTORIES[name] = factory
+        _INSTANCES.pop(name, None)
+
+
+def get_engine(name: str) -> Any:
+    """Return the shared instance for ``name``, building it on first use."""
+    instance = _INSTANCES.get(name)
+    if instance is not None:
+        return instance
+    with _REGISTRY_LOCK:
+        instance = _INSTANCES.get(name)
+        if instance is None:
+            factory = _FACTORIES.get(name)
+            if factory is None:
+                raise KeyError(f"Unknown engine: {name}")
+            log.debug(f"[EngineRegistry] Создаём общий экземпляр: {name}")
+            instance = factory()
+            _INSTANCES[name] = instance
+        return instance
+
+
+def registered_engines() -> List[str]:
+    with _REGISTRY_LOCK:
+        return sorted(_FACTORIES)
+
+
+def built_engines() -> List[str]:
+    with _REGISTRY_LOCK:
+        return sorted(_INSTANCES)
+
+
+def reset_engines() -> None:
+    """Drop built instances (tests / hot reload of lexicons)."""
+    with _REGISTRY_LOCK:
+        _INSTANCES.clear()
+
+
+__all__ = ["register_engine", "get_engine", "registered_engines", "built_engines", "reset_engines"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -16,6 +16,7 @@ StudioCore v5 — Integrity Scan Engine
 import re
 from statistics import mean
 from typing import Dict, Any, Optional
+from .analysis_context import TextOrContext, as_context
 from .emotion import AutoEmotionalAnalyzer, TruthLovePainEngine
 
 
@@ -43,13 +44,15 @@ class IntegrityScanEngine:
 
     def analyze(
         self, 
-        text: str,
+        text: TextOrContext,
         # Task 2.2: Добавлены опциональные параметры для устранения повторных анализов
         emotions: Optional[Dict[str, float]] = None,
         tlp: Optional[Dict[str, float]] = None,
     ) -> Dict[str, Any]:
-        lines = [line for line in text.split("\n") if line.strip()]
-        words = re.findall(r"[^\s]+", text)
+        ctx = as_context(text)
+        text = ctx.text
+        lines = ctx.nonempty_lines
+        words = ctx.whitespace_tokens
         sents = re.split(r"[.!?]+", text)
 
         form = {
@@ -80,7 +83,7 @@ class IntegrityScanEngine:
         ref_words = set(
             "i me my myself я мне меня сам себя думаю чувствую знаю понимаю мы наш нас together united мы все".split()
         )
-        tokens = set(re.findall(r"[a - zA - Zа - яА - ЯёЁ]+", text.lower()))
+        tokens = set(re.findall(r"[a - zA - Zа - яА - ЯёЁ]+", ctx.lowered))
         reflection = len(tokens & ref_words) / max(1, len(tokens))
         ego_density = len([w for w in tokens if w in {"я", "i", "my", "me"}]) / max(
             1, len(tokens)
@@ -0,0 +1,327 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Single-pass multi-pattern lexicon matcher (Aho–Corasick).
+
+Раньше TLP компилировал три огромных регулярных выражения, а
+AutoEmotionalAnalyzer — по одному на каждое поле ``EMO_FIELDS``, и каждый
+``analyze`` делал отдельный ``findall`` по всему тексту для каждого поля.
+``LexiconMatcher`` строит один автомат по всем корням всех полей и за один
+проход по тексту выдаёт счётчики по полям.
+
+Счётчики совпадают с ``len(re.compile("(" + "|".join(stems) + ")", re.I).findall(text))``:
+- совпадения ищутся слева направо и не перекрываются внутри поля;
+- в одной позиции побеждает первый корень в порядке списка (как в альтернации
+  регулярного выражения), а не самый длинный;
+- регистр сравнивается по правилам ``re.IGNORECASE`` (включая
+  дополнительные эквивалентности вида ``s``/``ſ``, ``в``/``ᲀ``).
+
+Маршрутизация по алфавиту: автомат помнит алфавиты своих корней
+(``text_utils.stem_script``) и не сканирует текст, в свёрнутой форме которого
+нет ни одного из них (например, английские токены модели эмоций на русском
+тексте). Стоимость самого прохода от числа алфавитов не зависит, поэтому
+автомат не делится на части: смешанный текст по-прежнему сканируется один раз.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from bisect import bisect_right
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
+
+from .bounded_cache import get_cache
+from .text_utils import OTHER_SCRIPT, detect_scripts, stem_script
+
+_REGEX_META = set("\\.^$*+?{}[]|()")
+
+
+class _FoldTable(dict):
+    """``str.translate`` table: text char → canonical lexicon char (computed on first sight)."""
+
+    def __init__(self, classes: Sequence[Tuple[str, "re.Pattern[str]"]]) -> None:
+        super().__init__()
+        self._classes = classes
+        self._lock = threading.Lock()
+
+    @property
+    def canonical(self) -> List[str]:
+        return [canonical for canonical, _ in self._classes]
+
+    @classmethod
+    def from_canonical(cls, canonical: Sequence[str], entries: Mapping[int, int]) -> "_FoldTable":
+        table = cls([(ch, re.compile(re.escape(ch), re.I)) for ch in canonical])
+        table.update(entries)
+        return table
+
+    def __missing__(self, codepoint: int) -> int:
+        ch = chr(codepoint)
+        folded = codepoint
+        for canonical, pattern in self._classes:
+            if pattern.fullmatch(ch):
+                folded = ord(canonical)
+                break
+        with self._lock:
+            self[codepoint] = folded
+        return folded
+
+
+class LexiconMatcher:
+    """Aho–Corasick automaton over literal stems tagged with their field(s)."""
+
+    def __init__(
+        self,
+        lexicon: Mapping[str, Sequence[str]],
+        ignore_case: bool = True,
+        escaped: bool = False,
+    ) -> None:
+        """
+        ``escaped=True`` — корни сравниваются как ``re.escape(stem)`` (любые символы
+        допустимы); иначе корень не должен содержать метасимволов регулярных выражений.
+        """
+        self.fields: Tuple[str, ...] = tuple(lexicon)
+        self.ignore_case = ignore_case
+
+        stems: List[str] = []
+        for field_stems in lexicon.values():
+            for stem in field_stems:
+                if not stem:
+                    raise ValueError("Empty lexicon stem")
+                if not escaped and _REGEX_META & set(stem):
+                    raise ValueError(f"Lexicon stem is not a literal: {stem!r}")
+                stems.append(stem)
+        self._fold = self._build_fold_table(stems) if ignore_case else {}
+
+        # stem (после свёртки регистра) → [(field index, приоритет в поле)]
+        self._stem_ids: Dict[str, int] = {}
+        self._stem_lengths: List[int] = []
+        self._stem_tags: List[List[Tuple[int, int]]] = []
+        for field_index, field_stems in enumerate(lexicon.values()):
+            seen = set()
+            for priority, stem in enumerate(field_stems):
+                key = stem.translate(self._fold) if ignore_case else stem
+                if key in seen:
+                    continue  # повтор в том же поле: в альтернации побеждает первый
+                seen.add(key)
+                stem_id = self._stem_ids.get(key)
+                if stem_id is None:
+                    stem_id = len(self._stem_lengths)
+                    self._stem_ids[key] = stem_id
+                    self._stem_lengths.append(len(key))
+                    self._stem_tags.append([])
+                self._stem_tags[stem_id].append((field_index, priority))
+        self.scripts = frozenset(stem_script(key) for key in self._stem_ids)
+        self._build_automaton()
+        self._finish()
+
+    def _finish(self) -> None:
+        self._stem_chars = frozenset("".join(self._stem_ids))
+        self._scan_cache = get_cache("lexicon.scan")
+        self._fingerprint = hashlib.md5(
+            repr(sorted((k, v) for k, v in self._stem_ids.items())).encode("utf-8")
+        ).hexdigest()[:12]
+
+    # ------------------------------------------------------------------
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-ready tables of the built automaton (see ``lexicon_snapshot``)."""
+        return {
+            "fields": list(self.fields),
+            "ignore_case": self.ignore_case,
+            "fold": (
+                {"canonical": self._fold.canonical, "entries": {str(k): v for k, v in self._fold.items()}}
+                if self.ignore_case
+                else None
+            ),
+            "stems": list(self._stem_ids),
+            "tags": [[list(tag) for tag in tags] for tags in self._stem_tags],
+            "scripts": sorted(self.scripts),
+            "goto": self._goto,
+            "fail": self._fail,
+            "outputs": [list(out) for out in self._outputs],
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "LexiconMatcher":
+        """Restore a matcher from ``to_state()`` without rebuilding the automaton."""
+        matcher = cls.__new__(cls)
+        matcher.fields = tuple(state["fields"])
+        matcher.ignore_case = bool(state["ignore_case"])
+        fold = state.get("fold")
+        matcher._fold = (
+            _FoldTable.from_canonical(fold["canonical"], {int(k): v for k, v in fold["entries"].items()})
+            if matcher.ignore_case
+            else {}
+        )
+        matcher._stem_ids = {stem: i for i, stem in enumerate(state["stems"])}
+        matcher._stem_lengths = [len(stem) for stem in state["stems"]]
+        matcher._stem_tags = [[tuple(tag) for tag in tags] for tags in state["tags"]]
+        matcher.scripts = frozenset(state["scripts"])
+        matcher._goto = state["goto"]
+        matcher._fail = state["fail"]
+        matcher._outputs = [tuple(out) for out in state["outputs"]]
+        matcher._finish()
+        return matcher
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _build_fold_table(stems: Sequence[str]) -> _FoldTable:
+        """Group lexicon characters into ``re.IGNORECASE`` equivalence classes."""
+        classes: List[Tuple[str, "re.Pattern[str]"]] = []
+        for ch in sorted(set("".join(stems))):
+            if not any(pattern.fullmatch(ch) for _, pattern in classes):
+                classes.append((ch, re.compile(re.escape(ch), re.I)))
+        table = _FoldTable(classes)
+        for ch in sorted(set("".join(stems))):
+            table[ord(ch)]  # прогреваем: символы словаря
+        return table
+
+    def _build_automaton(self) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for key, stem_id in self._stem_ids.items():
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append(stem_id)
+
+        # BFS: ссылки неудачи; выходы состояния дополняются выходами суффикса
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if state else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                queue.append(nxt)
+        self._goto = goto
+        self._fail = fail
+        self._outputs: List[Tuple[int, ...]] = [tuple(out) for out in outputs]
+
+    # ------------------------------------------------------------------
+    def fold(self, text: str) -> str:
+        """Case-fold ``text`` the way the lexicon is stored (length is preserved)."""
+        return text.translate(self._fold) if self.ignore_case else text
+
+    def may_match(self, folded: str) -> bool:
+        """False when the (folded) text contains none of the lexicon's scripts."""
+        return OTHER_SCRIPT in self.scripts or not self.scripts.isdisjoint(detect_scripts(folded))
+
+    def iter_occurrences(self, text: str) -> Iterator[Tuple[int, int]]:
+        """All (possibly overlapping) ``(start, stem_id)`` occurrences in one pass."""
+        return self._occurrences(self.fold(text))
+
+    def _occurrences(self, folded: str) -> Iterator[Tuple[int, int]]:
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        lengths = self._stem_lengths
+        state = 0
+        for end, ch in enumerate(folded, 1):
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            out = outputs[state]
+            if out:
+                for stem_id in out:
+                    yield end - lengths[stem_id], stem_id
+
+    def _field_matches(self, text: str) -> List[List[Tuple[int, int]]]:
+        """Per field: ``(start, end)`` of non-overlapping findall-equivalent matches."""
+        # Для каждого поля и стартовой позиции — корень с наименьшим приоритетом
+        best: List[Dict[int, Tuple[int, int]]] = [{} for _ in self.fields]
+        folded = self.fold(text)
+        if not self.may_match(folded):
+            return [[] for _ in self.fields]
+        lengths = self._stem_lengths
+        for start, stem_id in self._occurrences(folded):
+            length = lengths[stem_id]
+            for field_index, priority in self._stem_tags[stem_id]:
+                current = best[field_index].get(start)
+                if current is None or priority < current[0]:
+                    best[field_index][start] = (priority, length)
+
+        matches: List[List[Tuple[int, int]]] = []
+        for candidates in best:
+            field_matches: List[Tuple[int, int]] = []
+            position = 0
+            for start in sorted(candidates):
+                if start >= position:
+                    end = start + candidates[start][1]
+                    field_matches.append((start, end))
+                    position = end
+            matches.append(field_matches)
+        return matches
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Hit count per field (scan results are cached per text)."""
+        key = (self._fingerprint, hashlib.md5(text.encode("utf-8")).hexdigest())
+        cached = self._scan_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        counts = {
+            field: len(matches) for field, matches in zip(self.fields, self._field_matches(text))
+        }
+        self._scan_cache.put(key, counts)
+        return dict(counts)
+
+    def count_segments(self, segments: Sequence[str], separator: str = "\n") -> List[Dict[str, int]]:
+        """
+        ``[count(s) for s in segments]`` from one scan over ``separator.join(segments)``.
+
+        Совпадение не может пересечь разделитель, если его символов нет ни в одном
+        корне; попадания раздаются сегментам по смещению начала совпадения.
+        """
+        if not separator:
+            raise ValueError("Segment separator must not be empty")
+        if len(segments) <= 1 or self._stem_chars & set(self.fold(separator)):
+            return [self.count(segment) for segment in segments]
+
+        offsets: List[int] = []
+        position = 0
+        for segment in segments:
+            offsets.append(position)
+            position += len(segment) + len(separator)
+
+        counts = [dict.fromkeys(self.fields, 0) for _ in segments]
+        joined = separator.join(segments)
+        for field, matches in zip(self.fields, self._field_matches(joined)):
+            for start, _ in matches:
+                counts[bisect_right(offsets, start) - 1][field] += 1
+        return counts
+
+    def spans(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """Match spans per field, identical to ``[m.span() for m in pattern.finditer(text)]``."""
+        return dict(zip(self.fields, self._field_matches(text)))
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+
+def field_pattern(stems: Sequence[str], flags: int = re.I) -> "re.Pattern[str]":
+    """The reference alternation regex the matcher is equivalent to (tests / fallbacks)."""
+    return re.compile(r"(" + "|".join(stems) + r")", flags)
+
+
+__all__ = ["LexiconMatcher", "field_pattern"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
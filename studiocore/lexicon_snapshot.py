@@ -0,0 +1,206 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Prebuilt lexicon snapshot for fast cold start.
+
+При холодном старте (Hugging Face Spaces, автомасштабируемые контейнеры)
+каждый процесс заново строит автоматы ``LexiconMatcher`` (общий словарь
+TLP / EMO_FIELDS и токены модели эмоций) и матрицы ``EmotionModelIndex``.
+Шаг сборки ``python -m studiocore.lexicon_snapshot [path]`` сохраняет эти
+таблицы в один версионированный файл; при старте они восстанавливаются без
+перестройки.
+
+Формат: первая строка — JSON-заголовок (формат, версия, sha256 тела),
+дальше — JSON-тело ``{"entries": {name: {"source": digest, "state": ...}}}``.
+Проверки:
+- sha256 тела должен совпасть с заголовком (битый / обрезанный файл);
+- ``source`` каждой записи — хэш исходных словарей, версии формата и версии
+  Unicode (от неё зависит свёртка регистра); устаревшая запись игнорируется.
+При любом несовпадении таблицы строятся из исходников, как без снимка.
+
+Путь задаёт ``STUDIOCORE_LEXICON_SNAPSHOT`` (``0`` / ``off`` — не читать
+снимок), по умолчанию ``studiocore/lexicon_snapshot.json``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import unicodedata
+from typing import Any, Dict, Mapping, Optional
+
+from .lexicon_matcher import LexiconMatcher
+
+log = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "studiocore.lexicon_snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_ENV = "STUDIOCORE_LEXICON_SNAPSHOT"
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), "lexicon_snapshot.json")
+
+_LOADED: Dict[str, Dict[str, Any]] = {}
+_LOCK = threading.Lock()
+
+
+def snapshot_path() -> Optional[str]:
+    """Configured snapshot file, or None when snapshots are disabled."""
+    value = os.getenv(SNAPSHOT_ENV)
+    if value is None:
+        return DEFAULT_SNAPSHOT_PATH
+    value = value.strip()
+    if value.lower() in ("", "0", "false", "no", "off"):
+        return None
+    return value
+
+
+def source_digest(*sources: Any) -> str:
+    """Hash of the source data a snapshot entry was built from."""
+    payload = json.dumps(
+        [SNAPSHOT_VERSION, unicodedata.unidata_version, sources],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=list,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, "rb") as fp:
+            header_line = fp.readline()
+            body = fp.read()
+    except FileNotFoundError:
+        log.debug(f"[LexiconSnapshot] Снимок не найден: {path}")
+        return {}
+    except OSError as exc:
+        log.warning(f"[LexiconSnapshot] Не удалось прочитать {path}: {exc}")
+        return {}
+
+    try:
+        header = json.loads(header_line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT:
+        log.warning(f"[LexiconSnapshot] {path}: неизвестный формат, строим из исходников")
+        return {}
+    if header.get("version") != SNAPSHOT_VERSION:
+        log.warning(f"[LexiconSnapshot] {path}: версия {header.get('version')} != {SNAPSHOT_VERSION}, строим из исходников")
+        return {}
+    if hashlib.sha256(body).hexdigest() != header.get("sha256"):
+        log.warning(f"[LexiconSnapshot] {path}: хэш не совпадает, строим из исходников")
+        return {}
+    try:
+        entries = json.loads(body)["entries"]
+    except (ValueError, KeyError, TypeError):
+        log.warning(f"[LexiconSnapshot] {path}: повреждённое тело, строим из исходников")
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def load_snapshot(path: Optional[str] = None) -> Dict[str, Any]:
+    """Validated snapshot entries (read once per path; {} when missing or invalid)."""
+    path = path or snapshot_path()
+    if path is None:
+        return {}
+    with _LOCK:
+        entries = _LOADED.get(path)
+        if entries is None:
+            entries = _read(path)
+            _LOADED[path] = entries
+        return entries
+
+
+def reset_snapshot() -> None:
+    """Forget loaded snapshots (tests / after a rebuild)."""
+    with _LOCK:
+        _LOADED.clear()
+
+
+def snapshot_entry(name: str, digest: str, path: Optional[str] = None) -> Optional[Any]:
+    """State stored under ``name`` if it was built from the same sources (``digest``)."""
+    entry = load_snapshot(path).get(name)
+    if not isinstance(entry, dict):
+        return None
+    if entry.get("source") != digest:
+        log.warning(f"[LexiconSnapshot] Запись {name} устарела, строим из исходников")
+        return None
+    return entry.get("state")
+
+
+def matcher_from_snapshot(
+    name: str,
+    lexicon: Mapping[str, Any],
+    path: Optional[str] = None,
+    **options: Any,
+) -> LexiconMatcher:
+    """``LexiconMatcher(lexicon, **options)``, restored from the snapshot when it is current."""
+    state = snapshot_entry(name, source_digest(lexicon, options), path)
+    if state is not None:
+        try:
+            return LexiconMatcher.from_state(state)
+        except (KeyError, TypeError, ValueError) as exc:
+            log.warning(f"[LexiconSnapshot] Запись {name} не читается ({exc}), строим из исходников")
+    return LexiconMatcher(lexicon, **options)
+
+
+def build_snapshot(path: Optional[str] = None) -> str:
+    """Build every entry from source and write the snapshot atomically; returns the path."""
+    from .emotion import EmotionModelIndex, emotion_index_buckets, lexicon_fields, load_emotion_model
+
+    path = path or snapshot_path() or DEFAULT_SNAPSHOT_PATH
+    fields = lexicon_fields()
+    model = load_emotion_model()
+    buckets = emotion_index_buckets()
+    entries = {
+        "lexicon.matcher": {
+            "source": source_digest(fields, {}),
+            "state": LexiconMatcher(fields).to_state(),
+        },
+        "emotion.model_index": {
+            "source": source_digest(model, buckets),
+            "state": EmotionModelIndex.from_model(model, buckets).to_state(),
+        },
+    }
+    body = json.dumps({"entries": entries}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header = json.dumps(
+        {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION, "sha256": hashlib.sha256(body).hexdigest()}
+    ).encode("utf-8")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(header + b"\n" + body)
+    os.replace(tmp_path, path)
+    with _LOCK:
+        _LOADED.pop(path, None)
+    return path
+
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "SNAPSHOT_ENV",
+    "DEFAULT_SNAPSHOT_PATH",
+    "snapshot_path",
+    "source_digest",
+    "load_snapshot",
+    "reset_snapshot",
+    "snapshot_entry",
+    "matcher_from_snapshot",
+    "build_snapshot",
+]
+
+
+if __name__ == "__main__":
+    written = build_snapshot(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Lexicon snapshot written: {written}")
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -14,20 +14,19 @@ from __future__ import annotations
 
 import hashlib
 import re
+from bisect import bisect_right
 from collections import Counter
 from statistics import mean
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    from typing import Tuple  # noqa: F401
-
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from .color_engine_adapter import EMOTION_COLOR_MAP, get_emotion_colors
-from .emotion import AutoEmotionalAnalyzer
+from .emotion import SENSUAL_WORDS_RE, AutoEmotionalAnalyzer
 
 # Import required engine for EmotionVector
 from .emotion import TruthLovePainEngine
+from .analysis_context import TextOrContext, as_context
+from .bounded_cache import get_cache
+from .engine_registry import get_engine
 from .emotion_profile import EmotionVector
 from .instrument import (
     InstrumentLibrary,
@@ -37,14 +36,14 @@ from .instrument import (
     instrument_rhythm_sync as _instrument_rhythm_sync,
     instrument_selection as _instrument_selection,
 )
+from .lyrics_lexer import COMMAND
 from .rhythm import LyricMeter
-from .text_utils import extract_sections, normalize_text_preserve_symbols
+from .syllables import count_vowels
+from .text_utils import normalize_text_preserve_symbols
 from .tone_sync import ToneSyncEngine
 from .user_override_manager import UserOverrideManager
 
 _SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+")
-_COMMAND_RE = re.compile(r"\[(?P < name > [A - Z_]+)\s*:?\s * (?P < value > [^\]]+)\]")
-_VOWEL_RE = re.compile(r"[aeiouyаеёиоуыэюя]", re.I)
 
 
 def _split_sentences(text: str) -> List[str]:
@@ -58,12 +57,14 @@ def _words(text: str) -> List[str]:
     return re.findall(r"[a - zA - Zа - яА - ЯёЁ]+", text)
 
 
-def _section_texts(text: str) -> List[str]:
-    structured = extract_sections(text)
+def _section_texts(text: TextOrContext) -> List[str]:
+    ctx = as_context(text)
+    text = ctx.text
+    structured = ctx.section_table
     if structured:
         sections = []
         for section in structured:
-            lines = [ln.strip() for ln in section.get("lines", []) if ln.strip()]
+            lines = [ln.strip() for ln in section.lines if ln.strip()]
             if lines:
                 sections.append("\n".join(lines))
         if sections:
@@ -91,9 +92,13 @@ class TextStructureEngine:
         """Clear cached structural metadata to avoid cross - request bleed."""
         self._section_metadata = []
 
-    def auto_section_split(self, text: str) -> List[str]:
+    def auto_section_split(self, text: TextOrContext) -> List[str]:
         self.reset()
-        structured = extract_sections(text)
+        ctx = as_context(text)
+        text = ctx.text
+        # Общая таблица секций запроса; теги ниже меняются — работаем с копией
+        table = ctx.section_table
+        structured = table.as_dicts()
         sections: List[str] = []
         metadata: List[Dict[str, Any]] = []
 
@@ -137,38 +142,10 @@ class TextStructureEngine:
         elif has_user_markers and structured:
             # Если есть пользовательские маркеры, все равно проверяем
             # повторяющиеся секции
-            from .text_utils import _detect_duplicate_sections
-
-            duplicates = _detect_duplicate_sections(structured)
-            if duplicates:
-                # Группируем повторяющиеся секции
-                section_groups: Dict[str, List[int]] = {}
-
-                for i, sec in enumerate(structured):
-                    lines = sec.get("lines", [])
-                    text_content = "\n".join(lines).strip()
-                    normalized = text_content.lower().replace(" ", "").replace("\n", "")
-
-                    if normalized not in section_groups:
-                        section_groups[normalized] = []
-                    section_groups[normalized].append(i)
-
-                # Аннотируем повторяющиеся секции
-                for normalized, indices in section_groups.items():
-                    if len(indices) > 1:
-                        indices.sort()
-                        first_tag = structured[indices[0]].get("tag", "Section")
-                        base_name = (
-                            "Chorus"
-                            if "chorus" in first_tag.lower()
-                            or "припев" in first_tag.lower()
-                            else first_tag.split()[0]
-                            if first_tag.split()
-                            else "Section"
-                        )
-
-                        for idx, sec_idx in enumerate(indices, 1):
-                            structured[sec_idx]["tag"] = f"{base_name} {idx}"
+            # Группы повторов уже посчитаны в таблице (строки секций не менялись)
+            from .text_utils import _annotate_duplicate_sections
+
+            _annotate_duplicate_sections(structured, table.content_groups())
 
         for item in structured:
             lines = item.get("lines", [])
@@ -328,15 +305,94 @@ class TextStructureEngine:
         }
 
 
+class SentenceEmotionStream:
+    """
+    Sentence - level ``AutoEmotionalAnalyzer`` scores from a single pass over the text.
+
+    Словарь сканируется один раз по всем предложениям, после чего по каждому
+    полю строятся префиксные суммы попаданий (а также энергии пунктуации и
+    сенсуальных слов). Оценка предложения или окна предложений ``[start, stop)``
+    — разность префиксов за O(1) по каждому полю; оценка одного предложения
+    совпадает с ``analyzer.analyze(sentence)``.
+    """
+
+    def __init__(self, analyzer: AutoEmotionalAnalyzer, text: str) -> None:
+        self._analyzer = analyzer
+        self.sentences: List[str] = _split_sentences(text)
+        lowered = [sentence.lower() for sentence in self.sentences]
+        self._fields = [f"emo.{field}" for field in analyzer.LEXICON_FIELDS]
+
+        self._hit_prefix: Dict[str, List[int]] = {field: [0] for field in self._fields}
+        for counts in analyzer.segment_hits(lowered):
+            for field in self._fields:
+                prefix = self._hit_prefix[field]
+                prefix.append(prefix[-1] + counts[field])
+
+        # Энергия одного предложения хранится как есть: разность префиксов с плавающей
+        # точкой могла бы разойтись с прямым подсчётом в последнем знаке
+        self._energy = [analyzer.raw_energy(sentence) for sentence in lowered]
+        self._energy_prefix = [0.0]
+        for energy in self._energy:
+            self._energy_prefix.append(self._energy_prefix[-1] + energy)
+
+        offsets: List[int] = []
+        position = 0
+        for sentence in lowered:
+            offsets.append(position)
+            position += len(sentence) + 1
+        sensual = [0] * len(lowered)
+        for match in SENSUAL_WORDS_RE.finditer("\n".join(lowered)):
+            sensual[bisect_right(offsets, match.start()) - 1] += 1
+        self._sensual_prefix = [0]
+        for count in sensual:
+            self._sensual_prefix.append(self._sensual_prefix[-1] + count)
+
+    def __len__(self) -> int:
+        return len(self.sentences)
+
+    def scores(self, start: int, stop: Optional[int] = None) -> Dict[str, float]:
+        """Analyzer scores of sentences ``[start, stop)`` (one sentence by default)."""
+        stop = start + 1 if stop is None else stop
+        if not 0 <= start < stop <= len(self.sentences):
+            raise IndexError(f"Invalid sentence window: [{start}, {stop})")
+        hits = {field: prefix[stop] - prefix[start] for field, prefix in self._hit_prefix.items()}
+        if stop == start + 1:
+            energy = self._energy[start]
+        else:
+            energy = self._energy_prefix[stop] - self._energy_prefix[start]
+        sensual = self._sensual_prefix[stop] - self._sensual_prefix[start]
+        return self._analyzer.score_counts(energy, hits, lambda: sensual)
+
+    def intensity_curve(self, window: int = 1) -> List[float]:
+        """Summed scores of each run of ``window`` consecutive sentences."""
+        if not self.sentences:
+            return []
+        window = max(1, min(window, len(self.sentences)))
+        return [
+            round(sum(self.scores(start, start + window).values()), 3)
+            for start in range(len(self.sentences) - window + 1)
+        ]
+
+
 class EmotionEngine:
     """High - level wrapper above the heuristic emotional analyzers."""
 
     def __init__(self) -> None:
-        self._analyzer = AutoEmotionalAnalyzer()
+        self._analyzer: AutoEmotionalAnalyzer = get_engine("emotion.auto")
         # Initialize TLP for vector calculation
-        self._tlp_engine = TruthLovePainEngine()
+        self._tlp_engine: TruthLovePainEngine = get_engine("tlp")
         # Task 2.1: Cache using text hash to prevent re-analyzing the same text multiple times
-        self._cache: Dict[str, Dict[str, float]] = {}
+        # (общий ограниченный кэш процесса, namespace "emotion.auto")
+        self._cache = get_cache("emotion.auto")
+
+    def _analyze_cached(self, text: str) -> Dict[str, float]:
+        """AutoEmotionalAnalyzer.analyze() through the shared cache (returns a copy)."""
+        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
+        scores = self._cache.get(text_hash)
+        if scores is None:
+            scores = self._analyzer.analyze(text)
+            self._cache.put(text_hash, dict(scores))
+        return dict(scores)
 
     def emotion_detection(self, text: str) -> Dict[str, float]:
         """
@@ -344,13 +400,14 @@ class EmotionEngine:
         MASTER - PATCH v4.0: Добавляем Rage - mode конфликт резолвер.
         """
         # Task 2.1: Use cache with text hash to prevent re-analyzing the same text
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if text_hash in self._cache:
-            emo = self._cache[text_hash].copy()
-        else:
-            emo = self._analyzer.analyze(text)
-            # Cache the result using hash
-            self._cache[text_hash] = emo.copy()
+        return self.refine_detection(self._analyze_cached(text))
+
+    def refine_detection(self, scores: Dict[str, float]) -> Dict[str, float]:
+        """
+        Post - filters of ``emotion_detection`` over ready ``AutoEmotionalAnalyzer``
+        scores (например, из Phase 1 ядра); ``scores`` не изменяется.
+        """
+        emo = dict(scores)
 
         # Мягкий фильтр для дорожной исповеди: sensual не доминирует над sorrow
         # / determination.
@@ -462,36 +519,22 @@ class EmotionEngine:
         """
         return self._tlp_engine.export_emotion_vector(text)
 
-    def emotion_intensity_curve(self, text: str) -> List[float]:
-        sentences = _split_sentences(text)
-        if not sentences:
-            return []
-        curve: List[float] = []
-        # Task 2.1: Cache full text analysis if available using hash
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        full_text_emo = self._cache.get(text_hash)
-        
-        for sentence in sentences:
-            # For sentence-level analysis, we still analyze each sentence separately
-            # but can use cached full text if sentence matches full text
-            if sentence == text and full_text_emo:
-                scores = full_text_emo
-            else:
-                # Cache sentence-level analysis too
-                sentence_hash = hashlib.md5(sentence.encode("utf-8")).hexdigest()
-                if sentence_hash in self._cache:
-                    scores = self._cache[sentence_hash].copy()
-                else:
-                    scores = self._analyzer.analyze(sentence)
-                    self._cache[sentence_hash] = scores.copy()
-            intensity = sum(scores.values())
-            curve.append(round(intensity, 3))
-        return curve
+    def sentence_stream(self, text: str) -> SentenceEmotionStream:
+        """Prefix - sum index of sentence scores (one lexicon pass over ``text``)."""
+        return SentenceEmotionStream(self._analyzer, text)
+
+    def emotion_intensity_curve(self, text: str, *, window: int = 1) -> List[float]:
+        # Один проход словаря по всему тексту вместо analyze() на каждое предложение
+        return self.sentence_stream(text).intensity_curve(window)
 
     def emotion_pivot_points(
-        self, text: str, *, intensity_curve: Sequence[float] | None = None
+        self,
+        text: str,
+        *,
+        intensity_curve: Sequence[float] | None = None,
+        window: int = 1,
     ) -> List[int]:
-        curve = list(intensity_curve or self.emotion_intensity_curve(text))
+        curve = list(intensity_curve or self.emotion_intensity_curve(text, window=window))
         if not curve:
             return []
         indexed = sorted(enumerate(curve), key=lambda item: item[1], reverse=True)
@@ -504,13 +547,7 @@ class EmotionEngine:
             scores = dict(text)
         else:
             # Task 2.1: Use cache with text hash
-            text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-            if text_hash in self._cache:
-                scores = self._cache[text_hash].copy()
-            else:
-                scores = self._analyzer.analyze(text)
-                # Cache the result using hash
-                self._cache[text_hash] = scores.copy()
+            scores = self._analyze_cached(text)
         if not scores:
             return {}
         dominant = max(scores, key=scores.get)
@@ -521,13 +558,7 @@ class EmotionEngine:
             scores = dict(text)
         else:
             # Task 2.1: Use cache with text hash
-            text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-            if text_hash in self._cache:
-                scores = self._cache[text_hash].copy()
-            else:
-                scores = self._analyzer.analyze(text)
-                # Cache the result using hash
-                self._cache[text_hash] = scores.copy()
+            scores = self._analyze_cached(text)
         if not scores:
             return {"conflict": 0.0, "primary": None, "secondary": None}
         ordered = sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -790,7 +821,7 @@ class BPMEngine:
         curve: List[float] = []
         for section in sections:
             words = _words(section)
-            syllables = sum(len(_VOWEL_RE.findall(word)) for word in words)
+            syllables = count_vowels(" ".join(words))
             density = syllables / max(1, len(words))
             curve.append(round(base + (density - 3) * 8, 2))
         return curve
@@ -1051,18 +1082,16 @@ class ZeroPulseEngine:
 class CommandInterpreter:
     """Parse inline commands that control arrangement parameters."""
 
-    def detect_commands_in_text(self, text: str) -> List[Dict[str, Any]]:
-        commands: List[Dict[str, Any]] = []
-        for match in _COMMAND_RE.finditer(text):
-            commands.append(
-                {
-                    "type": match.group("name").lower(),
-                    "value": match.group("value").strip(),
-                    "raw": match.group(0),
-                    "position": match.start(),
-                }
-            )
-        return commands
+    def detect_commands_in_text(self, text: TextOrContext) -> List[Dict[str, Any]]:
+        return [
+            {
+                "type": token.name.lower(),
+                "value": token.value,
+                "raw": token.text,
+                "position": token.start,
+            }
+            for token in as_context(text).tokens.of(COMMAND)
+        ]
 
     def _extract_command(
         self, commands: Iterable[Dict[str, Any]], names: Sequence[str]
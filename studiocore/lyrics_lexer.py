@@ -0,0 +1,231 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+One-pass lexer for lyric markup.
+
+Раньше один и тот же текст сканировали по отдельности: маркеры секций
+(``text_utils._parse_section_marker``, три регулярки на строку), команды
+(``CommandInterpreter.detect_commands_in_text``, ``extract_commands_and_tags``),
+заголовок ``[BPM: ...]`` (дважды в ``LyricMeter``) и тональность
+(``ToneSyncEngine.detect_key``, две регулярки). ``lex`` проходит текст один
+раз и выдаёт типизированный поток токенов; ``AnalysisContext.tokens`` хранит
+его на весь запрос.
+
+Строковые токены (по одному на строку ``text.split("\\n")``):
+    SECTION — маркер секции (``value`` — тег), BLANK — пустая строка,
+    LYRIC — остальные строки.
+Встроенные токены (идут за токеном своей строки, по смещению):
+    TAG        — блок ``[...]`` (неперекрывающиеся, как ``COMMAND_BLOCK_RE``);
+    COMMAND    — ``[NAME: value]`` (``name``, ``value``; как ``_COMMAND_RE``);
+    BPM_HEADER — ``[BPM: 120]`` (``value`` — число; также и COMMAND);
+    KEY        — упоминание тональности ``C``, ``F# minor``, ``[Am]``
+                 (``name`` — нота, ``value`` — лад или "");
+    HINT       — подсказка в круглых скобках (``value`` — содержимое).
+Скобочные токены могут занимать несколько строк (как исходные регулярки);
+``line`` — номер строки, где токен начинается.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from functools import partial
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+from .bounded_cache import get_cache
+from .text_utils import _parse_section_marker
+
+SECTION = "section"
+BLANK = "blank"
+LYRIC = "lyric"
+TAG = "tag"
+COMMAND = "command"
+BPM_HEADER = "bpm_header"
+KEY = "key"
+HINT = "hint"
+
+# Скобки поглощают только открывающий символ (тело — во вложенном
+# просмотре вперёд), поэтому тональности и вложенные скобки внутри блока
+# тоже находятся. Тональность: нота после начала текста, пробела, "[" или "("
+# и перед пробелом / закрывающей скобкой / знаком препинания.
+# Общий первый символ-класс даёт движку быстрый поиск кандидатов
+_INLINE_RE = re.compile(
+    r"[\[(A-Ga-g]"
+    r"(?:(?<=\[)(?=(?P<bracket>[^\]]+)\])"
+    r"|(?<=\()(?=(?P<paren>[^)]+)\))"
+    r"|(?<=[A-Ga-g])(?<![^\s\[(].)(?P<sharp>#?)(?i:\s*(?P<mode>minor|major|maj|min|m|M)?)(?=[\s\]),.!?]|$))"
+)
+_COMMAND_BODY_RE = re.compile(r"(?P<name>[A-Z_]+)\s*:?\s*(?P<value>[^\]]+)")
+_BPM_BODY_RE = re.compile(r"\s*BPM\s*:?\s*(?P<bpm>[0-9]{2,3}(?:\.[0-9]+)?)\s*", re.I)
+
+# Строка может быть маркером секции, только если заканчивается на "]", ")"
+# или двоеточие — остальные строки регулярки маркеров не проверяют
+_MARKER_ENDINGS = frozenset("]):：")
+
+
+class LyricToken(NamedTuple):
+    """One lexed token: ``text[start:end]`` of the given kind."""
+
+    kind: str
+    text: str
+    start: int
+    end: int
+    line: int
+    name: str = ""
+    value: str = ""
+
+
+class TokenStream:
+    """Tokens of one text in document order, with per - kind views."""
+
+    def __init__(
+        self,
+        tokens: Tuple[LyricToken, ...],
+        lines: Tuple[LyricToken, ...],
+        by_kind: Dict[str, Tuple[LyricToken, ...]],
+    ):
+        self.tokens = tokens
+        # По одному SECTION / BLANK / LYRIC токену на строку текста
+        self.lines = lines
+        # Разметка (SECTION и встроенные токены) сгруппирована при разборе
+        self._by_kind = by_kind
+
+    def __iter__(self) -> Iterator[LyricToken]:
+        return iter(self.tokens)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def of(self, kind: str) -> Tuple[LyricToken, ...]:
+        """Tokens of one kind, in order."""
+        found = self._by_kind.get(kind)
+        if found is None:
+            # BLANK / LYRIC — по запросу
+            found = self._by_kind[kind] = tuple(token for token in self.tokens if token.kind == kind)
+        return found
+
+
+# Токены создаются тысячами на текст: прямой tuple.__new__ вместо
+# Python - уровня LyricToken.__new__ / _make
+_token = partial(tuple.__new__, LyricToken)
+
+
+def _inline_tokens(text: str, by_kind: Dict[str, List[LyricToken]]) -> List[LyricToken]:
+    tokens: List[LyricToken] = []
+    tags, commands, headers, hints, keys = (by_kind[kind] for kind in (TAG, COMMAND, BPM_HEADER, HINT, KEY))
+    # Номер строки считается по ходу сканирования (смещения растут)
+    line = 0
+    line_end = text.find("\n")
+    tag_end = command_end = hint_end = 0
+    for match in _INLINE_RE.finditer(text):
+        start = match.start()
+        while 0 <= line_end < start:
+            line += 1
+            line_end = text.find("\n", line_end + 1)
+
+        group = match.lastgroup
+        if group == "bracket":
+            body = match.group(group)
+            end = start + len(body) + 2
+            raw = text[start:end]
+            if start >= tag_end:
+                tag_end = end
+                token = _token((TAG, raw, start, end, line, "", body))
+                tokens.append(token)
+                tags.append(token)
+            command = _COMMAND_BODY_RE.fullmatch(body)
+            if command and start >= command_end:
+                command_end = end
+                token = _token((COMMAND, raw, start, end, line, command.group("name"), command.group("value").strip()))
+                tokens.append(token)
+                commands.append(token)
+            bpm = _BPM_BODY_RE.fullmatch(body)
+            if bpm:
+                token = _token((BPM_HEADER, raw, start, end, line, "", bpm.group("bpm")))
+                tokens.append(token)
+                headers.append(token)
+        elif group == "paren":
+            if start >= hint_end:
+                body = match.group(group)
+                hint_end = start + len(body) + 2
+                token = _token((HINT, text[start:hint_end], start, hint_end, line, "", body))
+                tokens.append(token)
+                hints.append(token)
+        else:
+            note = text[start] + match.group("sharp")
+            token = _token((KEY, match.group(0), start, match.end(), line, note, match.group("mode") or ""))
+            tokens.append(token)
+            keys.append(token)
+    return tokens
+
+
+def _lex(text: str) -> TokenStream:
+    by_kind: Dict[str, List[LyricToken]] = {kind: [] for kind in (SECTION, TAG, COMMAND, BPM_HEADER, KEY, HINT)}
+    inline = _inline_tokens(text, by_kind)
+    sections = by_kind[SECTION]
+    tokens: List[LyricToken] = []
+    lines: List[LyricToken] = []
+    pos = 0
+    next_start = inline[0].start if inline else len(text) + 1
+    offset = 0
+    for index, line in enumerate(text.split("\n")):
+        end = offset + len(line)
+        if not line or line.isspace():
+            token = _token((BLANK, line, offset, end, index, "", ""))
+        else:
+            last = line[-1] if not line[-1].isspace() else line.rstrip()[-1]
+            tag = _parse_section_marker(line) if last in _MARKER_ENDINGS else None
+            if tag:
+                token = _token((SECTION, line, offset, end, index, "", tag))
+                sections.append(token)
+            else:
+                token = _token((LYRIC, line, offset, end, index, "", ""))
+        tokens.append(token)
+        lines.append(token)
+        offset = end + 1
+        # Встроенные токены этой строки — сразу за её строковым токеном
+        while next_start < offset:
+            tokens.append(inline[pos])
+            pos += 1
+            next_start = inline[pos].start if pos < len(inline) else len(text) + 1
+    return TokenStream(tuple(tokens), tuple(lines), {kind: tuple(group) for kind, group in by_kind.items()})
+
+
+def lex(text: str) -> TokenStream:
+    """
+    Lex ``text`` into a ``TokenStream`` (lines and inline markup, in order).
+
+    Поток кэшируется по md5 текста (namespace "lyrics.lexer"): движки,
+    получающие строку, а не ``AnalysisContext``, не разбирают её заново.
+    """
+    text = text or ""
+    cache = get_cache("lyrics.lexer")
+    key = hashlib.md5(text.encode("utf-8")).hexdigest()
+    stream = cache.get(key)
+    if stream is None:
+        stream = _lex(text)
+        cache.put(key, stream)
+    return stream
+
+
+__all__ = [
+    "SECTION",
+    "BLANK",
+    "LYRIC",
+    "TAG",
+    "COMMAND",
+    "BPM_HEADER",
+    "KEY",
+    "HINT",
+    "LyricToken",
+    "TokenStream",
+    "lex",
+]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -33,7 +33,8 @@ MONOLITH_VERSION = DEFAULT_CONFIG.MONOLITH_VERSION
 STUDIOCORE_VERSION = DEFAULT_CONFIG.STUDIOCORE_VERSION
 
 # v16: ИСПРАВЛЕН ImportError
-from .text_utils import normalize_text_preserve_symbols, extract_raw_blocks
+from .text_utils import normalize_text_preserve_symbols
+from .analysis_context import AnalysisContext, TextOrContext
 
 # v15: Исправлен ImportError (возвращаем оригинальные имена)
 from .emotion import AutoEmotionalAnalyzer, TruthLovePainEngine
@@ -48,6 +49,8 @@ from .rhythm import LyricMeter
 from .style import PatchedStyleMatrix
 from .color_engine_adapter import ColorEngineAdapter
 from .rde_engine import RhythmDynamicsEmotionEngine
+from .engine_registry import get_engine
+from .request_memo import RequestMemo, memo_key
 # Task 18.1: Import conflict resolution classes
 from .consistency_v8 import ConsistencyLayerV8
 from .genre_conflict_resolver import GenreConflictResolver
@@ -268,7 +271,7 @@ class AdaptiveVocalAllocator:
         self._vocal_registry = VocalProfileRegistry()
 
     def analyze(
-        self, emo: Dict[str, float], tlp: Dict[str, float], bpm: int, text: str
+        self, emo: Dict[str, float], tlp: Dict[str, float], bpm: int, text: TextOrContext
     ) -> Dict[str, Any]:
         """Заменяет заглушку на полноценный аллокатор вокала (V6 Logic)."""
         # Task 2.3: Передаем emotions и tlp в get() для устранения повторных анализов
@@ -401,11 +404,11 @@ class StudioCore:
 
         # === PHASE 1: EmotionEngine ===
         log.debug("Загрузка: EmotionEngine (AutoEmotionalAnalyzer)")
-        self.emotion = AutoEmotionalAnalyzer()
+        self.emotion: AutoEmotionalAnalyzer = get_engine("emotion.auto")
         
         # === PHASE 2: TLPEngine ===
         log.debug("Загрузка: TLPEngine (TruthLovePainEngine)")
-        self.tlp = TruthLovePainEngine()
+        self.tlp: TruthLovePainEngine = get_engine("tlp")
 
         # === PHASE 3: RhythmEngine ===
         log.debug("Загрузка: RhythmEngine (PatchedLyricMeter)")
@@ -441,7 +444,7 @@ class StudioCore:
 
         # === PHASE 9: ToneEngine ===
         log.debug("Загрузка: ToneEngine (ToneSyncEngine)")
-        self.tone = ToneSyncEngine()
+        self.tone: ToneSyncEngine = get_engine("tone")
         
         # === PHASE 10: VocalAllocator ===
         log.debug("Загрузка: VocalAllocator (AdaptiveVocalAllocator)")
@@ -453,7 +456,7 @@ class StudioCore:
         
         # === PHASE 12: RDEEngine ===
         log.debug("Загрузка: RDEEngine (RhythmDynamicsEmotionEngine)")
-        self.rde_engine = RhythmDynamicsEmotionEngine()
+        self.rde_engine: RhythmDynamicsEmotionEngine = get_engine("rde")
         
         # === PHASE 13: GenreDatabase ===
         log.debug("Загрузка: GenreDatabase (GenreDatabaseLoader)")
@@ -1254,6 +1257,66 @@ class StudioCore:
         
         return result
 
+    def _build_analysis_nodes(self) -> List["AnalysisNode"]:
+        """
+        Declarative description of Phases 1-3: each engine with its inputs.
+
+        Outputs are stored under the node name; ``default`` replaces the output
+        of a failed or timed-out node (the same fallbacks the batches used).
+        """
+        from .analysis_graph import AnalysisNode
+
+        def rhythm(ctx, emotions, tlp):
+            cf = tlp.get("conscious_frequency") if tlp else None
+            # Rhythm требует emotions и tlp из Phase 1
+            return self.rhythm.analyze(ctx, emotions=emotions, tlp=tlp, cf=cf)
+
+        def vocal(emotions, tlp, rhythm_analysis, ctx):
+            bpm = int(round(rhythm_analysis.get("global_bpm", DEFAULT_CONFIG.FALLBACK_BPM)))
+            return self.vocal_allocator.analyze(emotions, tlp, bpm, ctx)
+
+        def integrity(ctx, emotions, tlp):
+            return self.integrity.analyze(ctx, emotions=emotions, tlp=tlp)
+
+        def color(emotions, tlp):
+            return self.color_engine.resolve_color_wave({"emotions": emotions, "tlp": tlp, "style": {}})
+
+        def dynamic_emotion(emotions, tlp):
+            # Эмоции и TLP уже посчитаны в Phase 1 — движок их только нормализует
+            return self.dynamic_emotion_engine.emotion_profile_from(emotions, tlp)
+
+        def emotion_profile(ctx, emotions):
+            from .emotion import EmotionEngine
+
+            # EmotionEngine хранит _phrase_packets — новый экземпляр на запрос
+            # (под-движки общие, см. engine_registry). AutoEmotionalAnalyzer
+            # уже отработал в узле "emotion" — его оценки не считаются заново
+            return EmotionEngine().build_emotion_profile(ctx, auto_scores=emotions)
+
+        return [
+            # Phase 1: независимые движки
+            AnalysisNode("emotion", self.emotion.analyze, ("ctx",), default={"neutral": 1.0}),
+            AnalysisNode("tone", self.tone.detect_key, ("ctx",)),
+            AnalysisNode("tlp", self.tlp.analyze, ("ctx",), default={}),
+            AnalysisNode("rde_resonance", self.rde_engine.calc_resonance, ("ctx",), default=0.5),
+            AnalysisNode("rde_fracture", self.rde_engine.calc_fracture, ("ctx",), default=0.5),
+            AnalysisNode("rde_entropy", self.rde_engine.calc_entropy, ("ctx",), default=0.5),
+            # Phase 2: критическая зависимость от emotion и tlp
+            AnalysisNode("rhythm", rhythm, ("ctx", "emotion", "tlp"), required=True),
+            # Phase 3: зависимые движки
+            AnalysisNode("vocal", vocal, ("emotion", "tlp", "rhythm", "ctx"), default={}),
+            AnalysisNode("integrity", integrity, ("ctx", "emotion", "tlp"), default={}),
+            AnalysisNode("color", color, ("emotion", "tlp")),
+            AnalysisNode(
+                "dynamic_emotion",
+                dynamic_emotion,
+                ("emotion", "tlp"),
+                skip_if=lambda _emotions, _tlp: self.dynamic_emotion_engine is None,
+            ),
+            # Кластеры / genre_scores для genre_selection в Phase 5
+            AnalysisNode("emotion_profile", emotion_profile, ("ctx", "emotion")),
+        ]
+
     def _apply_quantum_jitter(self, value: float, intensity: float = 0.08) -> float:
         """
         Adds random variation to break static analysis loops.
@@ -1309,9 +1372,12 @@ class StudioCore:
 
         # 0.3: normalize_text
         raw = normalize_text_preserve_symbols(text)
-        
-        # 0.4: extract_blocks
-        text_blocks = extract_raw_blocks(raw)
+
+        # Общее неизменяемое представление текста для всех движков запроса
+        ctx = AnalysisContext(raw)
+
+        # 0.4: extract_blocks (блоки из общей таблицы секций запроса)
+        text_blocks = list(ctx.section_table.blocks)
 
         # Section Analysis (выполняется после extract_blocks)
         section_result = self._analyze_sections(text_blocks, preferred_gender)
@@ -1319,64 +1385,46 @@ class StudioCore:
         voice_hint = section_result.get("user_voice_hint")
 
         # ============================================================
-        # PHASE 1: PARALLEL_BATCH_A
-        # Независимые движки. Запускать одновременно.
+        # PHASES 1-3: ANALYSIS GRAPH
+        # Движки описаны узлами с явными входами; узел стартует, как только
+        # готовы его входы (integrity ждёт только emotion и tlp, а не rde_* / tone).
+        #   Phase 1 (PARALLEL_BATCH_A): emotion, tone, tlp, rde_resonance, rde_fracture, rde_entropy
+        #   Phase 2 (SEQUENTIAL_DEPENDENT): rhythm ← emotion, tlp
+        #   Phase 3 (PARALLEL_BATCH_B): vocal ← rhythm; integrity, color, dynamic_emotion ← emotion, tlp
         # ============================================================
-        from .parallel_module_executor import ParallelModuleExecutor
+        from .analysis_graph import AnalysisGraph
+        from .parallel_module_executor import get_shared_executor
         from .result_deduplicator import ResultDeduplicator
         
-        executor = ParallelModuleExecutor(max_workers=8, timeout=30.0)
+        # Один общий пул на процесс вместо нового пула на каждый запрос;
+        # backend (thread / process / inline) задаётся DEFAULT_CONFIG["executor"]
+        executor = get_shared_executor()
         deduplicator = ResultDeduplicator(similarity_threshold=0.85)
         
-        log.debug("[Phase 1] Запуск PARALLEL_BATCH_A: emotion, tone, tlp, rde_resonance, rde_fracture, rde_entropy")
-        
-        # Собираем модули для параллельного выполнения
-        parallel_batch_a_modules = []
-        parallel_batch_a_modules.append(("emotion", self.emotion.analyze, (raw,), {}))
-        parallel_batch_a_modules.append(("tone", self.tone.detect_key, (raw,), {}))
-        parallel_batch_a_modules.append(("tlp", self.tlp.analyze, (raw,), {}))
-        parallel_batch_a_modules.append(("rde_resonance", self.rde_engine.calc_resonance, (raw,), {}))
-        parallel_batch_a_modules.append(("rde_fracture", self.rde_engine.calc_fracture, (raw,), {}))
-        parallel_batch_a_modules.append(("rde_entropy", self.rde_engine.calc_entropy, (raw,), {}))
+        log.debug("[Phase 1-3] Запуск графа анализа: emotion, tone, tlp, rde_*, rhythm, vocal, integrity, color, dynamic_emotion")
         
-        # Выполняем параллельно
-        batch_a_results = executor.execute_independent_modules(parallel_batch_a_modules)
+        graph_run = AnalysisGraph(self._build_analysis_nodes(), seeds=("raw", "ctx")).run(
+            {"raw": raw, "ctx": ctx}, executor
+        )
+        # Промежуточные результаты запроса: Phase 4–5 берут их отсюда, а не вызывают движки повторно
+        memo = RequestMemo(graph_run.outputs)
         
         # Извлекаем результаты
-        emotions = batch_a_results.get("emotion", {"neutral": 1.0})
-        tone_hint = batch_a_results.get("tone", None)
-        tlp = batch_a_results.get("tlp", {})
+        emotions = graph_run.get("emotion", {"neutral": 1.0})
+        tone_hint = graph_run.get("tone")
+        tlp = graph_run.get("tlp", {})
         
         # Собираем RDE результаты
         rde_result = {
-            "resonance": batch_a_results.get("rde_resonance", 0.5),
-            "fracture": batch_a_results.get("rde_fracture", 0.5),
-            "entropy": batch_a_results.get("rde_entropy", 0.5),
+            "resonance": graph_run.get("rde_resonance", 0.5),
+            "fracture": graph_run.get("rde_fracture", 0.5),
+            "entropy": graph_run.get("rde_entropy", 0.5),
         }
         
-        log.debug(f"[Phase 1] PARALLEL_BATCH_A завершен: emotions={bool(emotions)}, tlp={bool(tlp)}, rde={bool(rde_result)}")
-        
-        # ============================================================
-        # PHASE 2: SEQUENTIAL_DEPENDENT
-        # Критическая зависимость. Ждем данные из Batch A.
-        # Rhythm запускается ТОЛЬКО после завершения Emotion и TLP.
-        # ============================================================
-        log.debug("[Phase 2] Запуск SEQUENTIAL_DEPENDENT: rhythm (требует emotions и tlp)")
-        
-        cf = tlp.get("conscious_frequency") if tlp else None
-        
-        # Rhythm требует emotions и tlp из Phase 1
-        rhythm_analysis = self.rhythm.analyze(
-            raw,
-            emotions=emotions,
-            tlp=tlp,
-            cf=cf
-        )
-        
+        rhythm_analysis = graph_run.get("rhythm")
         bpm = int(round(rhythm_analysis.get("global_bpm", DEFAULT_CONFIG.FALLBACK_BPM)))
-        log.debug(f"[Phase 2] SEQUENTIAL_DEPENDENT завершен: bpm={bpm}")
         
-        # Извлечение key из tone_hint (нужно для Phase 3)
+        # Извлечение key из tone_hint
         if tone_hint and isinstance(tone_hint, dict):
             key = tone_hint.get("key") or DEFAULT_CONFIG.FALLBACK_KEY
         else:
@@ -1385,37 +1433,7 @@ class StudioCore:
         if not key or key == "auto":
             key = DEFAULT_CONFIG.FALLBACK_KEY
         
-        # ============================================================
-        # PHASE 3: PARALLEL_BATCH_B
-        # Зависимые от ритма и эмоций движки. Запускать одновременно.
-        # ============================================================
-        log.debug("[Phase 3] Запуск PARALLEL_BATCH_B: vocal, integrity, annotation, color, dynamic_emotion")
-        
-        # Собираем модули для параллельного выполнения
-        parallel_batch_b_modules = []
-        
-        # Vocal Allocator
-        parallel_batch_b_modules.append(("vocal", self.vocal_allocator.analyze, (emotions, tlp, bpm, raw), {}))
-        
-        # Integrity Scan
-        parallel_batch_b_modules.append(("integrity", self.integrity.analyze, (raw,), {"emotions": emotions, "tlp": tlp}))
-        
-        # Text Annotation: УДАЛЕНО из Phase 3 - будет вызван в Phase 4 после построения semantic_sections
-        # Это устраняет двойную работу и улучшает производительность
-        
-        # Color Resolution
-        intermediate_result = {"emotions": emotions, "tlp": tlp, "style": {}}
-        parallel_batch_b_modules.append(("color", self.color_engine.resolve_color_wave, (intermediate_result,), {}))
-        
-        # Dynamic Emotion Engine
-        if self.dynamic_emotion_engine:
-            parallel_batch_b_modules.append(("dynamic_emotion", self.dynamic_emotion_engine.emotion_profile, (raw,), {}))
-        
-        # Выполняем параллельно
-        batch_b_results = executor.execute_independent_modules(parallel_batch_b_modules)
-        
-        # Извлекаем результаты
-        vocal_result = batch_b_results.get("vocal", {})
+        vocal_result = graph_run.get("vocal", {})
         if not isinstance(vocal_result, dict):
             vocal_result = {}
         
@@ -1434,12 +1452,12 @@ class StudioCore:
             # Добавляем section_techniques если есть semantic_sections
             # (будет добавлено позже в Phase 4, когда semantic_sections будут готовы)
         
-        integrity_result = batch_b_results.get("integrity", {})
+        integrity_result = graph_run.get("integrity", {})
         # Annotation будет вызван в Phase 4 после построения semantic_sections
         annotated_text_ui, annotated_text_suno = "", ""
         
-        color_resolution = batch_b_results.get("color", None)
-        emotion_profile_7axis = batch_b_results.get("dynamic_emotion", None)
+        color_resolution = graph_run.get("color")
+        emotion_profile_7axis = graph_run.get("dynamic_emotion")
         
         # Извлечение color_wave
         if color_resolution and hasattr(color_resolution, 'colors') and color_resolution.colors:
@@ -1447,7 +1465,10 @@ class StudioCore:
         else:
             color_wave = ["#FFFFFF", "#B0BEC5"]
         
-        log.debug(f"[Phase 3] PARALLEL_BATCH_B завершен: vocal={bool(vocal_result)}, integrity={bool(integrity_result)}, color={bool(color_wave)}")
+        log.debug(
+            f"[Phase 1-3] Граф анализа завершен: bpm={bpm}, skipped={graph_run.skipped}, "
+            f"failed={graph_run.failed}, timings_ms={graph_run.timings_ms}"
+        )
         
         # ============================================================
         # PHASE 4: CORE_LOGIC
@@ -1521,7 +1542,7 @@ class StudioCore:
                 # Extract pain, energy, density from TLP and text analysis
                 pain_score = tlp.get("pain", 0.0)
                 # Calculate energy from text structure
-                text_lines = [l for l in raw.split('\n') if l.strip()]
+                text_lines = ctx.nonempty_lines
                 avg_line_len = sum(len(l) for l in text_lines) / len(text_lines) if text_lines else 50
                 energy_score = min(1.0, (avg_line_len / 60.0) + (bpm / 200.0))
                 density_score = min(1.0, len(text_lines) / 10.0)
@@ -1937,6 +1958,7 @@ class StudioCore:
                         "tlp": tlp,
                         "style": style,
                     }
+                    # Новый вход (style) — единственный пересчёт за запрос
                     color_resolution = self.color_engine.resolve_color_wave(intermediate_result)
                     if color_resolution and hasattr(color_resolution, 'colors') and color_resolution.colors:
                         color_wave = color_resolution.colors
@@ -2078,7 +2100,8 @@ class StudioCore:
         # Добавляем emotion_vector если TLP доступен
         if tlp and "emotion_vector" not in rde_result:
             try:
-                rde_emotion_vector = self.rde_engine.export_emotion_vector(raw)
+                # Из TLP узла графа, без повторного tlp.analyze
+                rde_emotion_vector = self.rde_engine.emotion_vector_from_tlp(tlp)
                 rde_result["emotion_vector"] = {
                     "valence": rde_emotion_vector.valence,
                     "arousal": rde_emotion_vector.arousal,
@@ -2150,8 +2173,14 @@ class StudioCore:
                 # Get dominant emotion for genre routing
                 dominant_emotion = max(emotions, key=emotions.get) if emotions and isinstance(emotions, dict) else "neutral"
                 
-                # Get genre route from GenreRoutingEngineV64
-                genre_route = self.genre_routing_engine.route(emotions or {}, dominant_emotion)
+                # Get genre route from GenreRoutingEngineV64 (результат переиспользуется ниже)
+                genre_route = memo.get_or_compute(
+                    "genre_route",
+                    self.genre_routing_engine.route,
+                    emotions or {},
+                    dominant_emotion,
+                    key=memo_key((emotions, dominant_emotion)),
+                )
                 log.debug(f"[Fusion Engine] Genre route: {genre_route}")
                 
                 # 🗺️ МАППИНГ: Also use SUNO_STYLE mapping directly to enhance style
@@ -2293,6 +2322,7 @@ class StudioCore:
             "section_profiles": section_profiles if isinstance(section_profiles, list) else [],
             # Task 10.2: Add runtime metrics for diagnostics
             "runtime_ms": runtime_ms if isinstance(runtime_ms, (int, float)) else 0,
+            "node_timings_ms": dict(graph_run.timings_ms),
         }
         
         # Добавляем метаданные о дедупликации
@@ -2331,13 +2361,9 @@ class StudioCore:
         genre_selection_data = {}
         # Try to get clusters and genre_scores from EmotionEngine
         # Note: self.emotion is AutoEmotionalAnalyzer, not EmotionEngine
-        # We need to create EmotionEngine instance to get clusters and genre_scores
+        # build_emotion_profile(raw) уже посчитан узлом графа "emotion_profile"
         try:
-            from .emotion import EmotionEngine
-            
-            # Create EmotionEngine instance for getting clusters and genre_scores
-            emotion_engine = EmotionEngine()
-            emotion_profile = emotion_engine.build_emotion_profile(raw)
+            emotion_profile = memo.get("emotion_profile")
             
             if isinstance(emotion_profile, dict):
                 clusters = emotion_profile.get("clusters", {})
@@ -2386,7 +2412,13 @@ class StudioCore:
         if self.genre_routing_engine and emotions:
             try:
                 dominant_emotion = max(emotions, key=emotions.get) if emotions and isinstance(emotions, dict) else "neutral"
-                genre_route = self.genre_routing_engine.route(emotions or {}, dominant_emotion)
+                genre_route = memo.get_or_compute(
+                    "genre_route",
+                    self.genre_routing_engine.route,
+                    emotions or {},
+                    dominant_emotion,
+                    key=memo_key((emotions, dominant_emotion)),
+                )
                 if genre_route and isinstance(genre_route, dict):
                     result["genre_routing"] = genre_route
             except Exception as e:
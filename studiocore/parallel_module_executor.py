@@ -0,0 +1,552 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Parallel execution of independent StudioCore modules (PARALLEL_BATCH_A / B).
+
+Все запросы используют один долгоживущий пул потоков на процесс: пул
+создаётся лениво при первом обращении и закрывается при завершении
+интерпретатора (atexit). Каждый модуль получает собственный таймаут,
+модули, не успевшие стартовать к истечению таймаута, отменяются, а
+счётчики (глубина очереди, активные задачи, загрузка пула) доступны через
+``stats()``.
+
+Бэкенд выбирается конфигом ``DEFAULT_CONFIG["executor"]["backend"]`` или
+переменной окружения ``STUDIOCORE_EXECUTOR_BACKEND``:
+
+* ``thread``  — общий пул потоков (по умолчанию);
+* ``process`` — CPU-bound движки Phase 1 (emotion, tlp, tone, rde_*)
+  выполняются в пуле процессов, обходя GIL. Рабочие процессы один раз
+  прогревают движки с уже скомпилированными лексиконами и получают только
+  нормализованный текст; остальные модули идут в пул потоков;
+* ``inline``  — последовательное выполнение в вызывающем потоке.
+
+Целые элементы батча (``StudioCoreV6.analyze_many``) идут не в пул модулей,
+а в отдельный ограниченный пул ``get_batch_pool`` (``batch_workers``): узлы
+графа каждого элемента попадают в общий пул модулей (и в пул процессов при
+``process``) наравне с одиночными запросами, поэтому батч не занимает весь
+пул и не задерживает узлы параллельных ``/analyze``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .analysis_context import AnalysisContext, context_text
+from .config import DEFAULT_CONFIG
+
+log = logging.getLogger(__name__)
+
+# (name, fn, args, kwargs) или (name, fn, args, kwargs, timeout)
+ModuleSpec = Tuple[Any, ...]
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_BATCH_WORKERS = 2
+DEFAULT_TIMEOUT = 30.0
+BACKENDS = ("thread", "process", "inline")
+
+_SHARED_POOL: Optional[ThreadPoolExecutor] = None
+_SHARED_POOL_SIZE = 0
+_SHARED_POOL_LOCK = threading.Lock()
+_SHARED_EXECUTOR: Optional["ParallelModuleExecutor"] = None
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_SIZE = 0
+_BATCH_POOL: Optional[ThreadPoolExecutor] = None
+
+# Помечает потоки пула: вложенный вызов из рабочего потока выполняется
+# inline, иначе пул может заблокироваться, ожидая сам себя.
+_WORKER_STATE = threading.local()
+
+
+class _PoolCounters:
+    """Process-wide counters for the shared module pool."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.peak_active = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.cancelled = 0
+        self.busy_seconds = 0.0
+
+    def on_submit(self) -> None:
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+
+    def on_rejected(self) -> None:
+        with self._lock:
+            self.submitted -= 1
+            self.queued -= 1
+
+    def on_start(self) -> None:
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def on_finish(self, elapsed: float, ok: bool) -> None:
+        with self._lock:
+            self.active -= 1
+            self.busy_seconds += elapsed
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def on_process_start(self) -> None:
+        # Очередь пула процессов снаружи не видна: задача активна с отправки до завершения
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def on_process_rejected(self) -> None:
+        with self._lock:
+            self.active -= 1
+            self.queued += 1
+
+    def on_process_cancel(self) -> None:
+        with self._lock:
+            self.active -= 1
+            self.cancelled += 1
+
+    def on_process_done(self, ok: bool) -> None:
+        with self._lock:
+            self.active -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def on_cancel(self) -> None:
+        with self._lock:
+            self.cancelled += 1
+            self.queued -= 1
+
+    def on_timeout(self) -> None:
+        with self._lock:
+            self.timed_out += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self.queued,
+                "active": self.active,
+                "peak_active": self.peak_active,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timed_out": self.timed_out,
+                "cancelled": self.cancelled,
+                "busy_seconds": round(self.busy_seconds, 4),
+            }
+
+
+_COUNTERS = _PoolCounters()
+
+
+def executor_settings() -> Dict[str, Any]:
+    """Executor settings from DEFAULT_CONFIG with the env backend override applied."""
+    settings: Dict[str, Any] = {
+        "backend": "thread",
+        "max_workers": DEFAULT_MAX_WORKERS,
+        "timeout": DEFAULT_TIMEOUT,
+        "process_workers": 0,
+        "batch_workers": DEFAULT_BATCH_WORKERS,
+    }
+    settings.update(DEFAULT_CONFIG.get("executor", {}) or {})
+    env_backend = os.getenv("STUDIOCORE_EXECUTOR_BACKEND")
+    if env_backend:
+        settings["backend"] = env_backend.strip().lower()
+    if settings["backend"] not in BACKENDS:
+        log.warning(f"[ParallelModuleExecutor] Неизвестный backend '{settings['backend']}', используем thread")
+        settings["backend"] = "thread"
+    return settings
+
+
+# ----------------------------------------------------------------------
+# Process backend
+# ----------------------------------------------------------------------
+# Движки Phase 1 не хранят состояния между вызовами и зависят только от
+# текста, поэтому в дочернем процессе их можно собрать один раз и вызывать
+# по имени модуля: через границу процесса передаётся только строка.
+PROCESS_TASKS: Dict[str, Tuple[str, str]] = {
+    "emotion": ("emotion", "analyze"),
+    "tlp": ("tlp", "analyze"),
+    "tone": ("tone", "detect_key"),
+    "rde_resonance": ("rde", "calc_resonance"),
+    "rde_fracture": ("rde", "calc_fracture"),
+    "rde_entropy": ("rde", "calc_entropy"),
+}
+
+_WORKER_ENGINES: Dict[str, Any] = {}
+
+
+def _warm_process_worker() -> None:
+    """Process-pool initializer: build Phase 1 engines (compiled lexicons) once per worker."""
+    from .engine_registry import get_engine
+
+    _WORKER_ENGINES.update(
+        emotion=get_engine("emotion.auto"),
+        tlp=get_engine("tlp"),
+        tone=get_engine("tone"),
+        rde=get_engine("rde"),
+    )
+
+
+def _run_process_task(task: str, text: str) -> Any:
+    """Execute a PROCESS_TASKS entry inside a pre-warmed worker process."""
+    if not _WORKER_ENGINES:
+        _warm_process_worker()
+    engine_key, method = PROCESS_TASKS[task]
+    return getattr(_WORKER_ENGINES[engine_key], method)(text)
+
+
+def get_process_pool(max_workers: int = 0) -> ProcessPoolExecutor:
+    """Return the process-wide worker-process pool, creating it on first use."""
+    global _PROCESS_POOL, _PROCESS_POOL_SIZE
+
+    with _SHARED_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            workers = int(max_workers) or (os.cpu_count() or 1)
+            _PROCESS_POOL = ProcessPoolExecutor(max_workers=workers, initializer=_warm_process_worker)
+            _PROCESS_POOL_SIZE = workers
+            log.debug(f"[ParallelModuleExecutor] Пул процессов создан: workers={workers}")
+        return _PROCESS_POOL
+
+
+def _reset_process_pool() -> None:
+    global _PROCESS_POOL, _PROCESS_POOL_SIZE
+
+    with _SHARED_POOL_LOCK:
+        pool = _PROCESS_POOL
+        _PROCESS_POOL = None
+        _PROCESS_POOL_SIZE = 0
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _on_module_done(future: Future) -> None:
+    # Отменённая задача (таймаут, отмена графом, shutdown(cancel_futures=True))
+    # так и не стартовала: снимаем её с очереди здесь, а не в _run_module
+    if future.cancelled():
+        _COUNTERS.on_cancel()
+
+
+def _on_process_done(future: Future) -> None:
+    if future.cancelled():
+        _COUNTERS.on_process_cancel()
+        return
+    _COUNTERS.on_process_done(future.exception() is None)
+
+
+def get_shared_pool(max_workers: int = DEFAULT_MAX_WORKERS) -> ThreadPoolExecutor:
+    """Return the process-wide module pool, creating it on first use."""
+    global _SHARED_POOL, _SHARED_POOL_SIZE
+
+    with _SHARED_POOL_LOCK:
+        if _SHARED_POOL is None:
+            _SHARED_POOL_SIZE = max(1, int(max_workers))
+            _SHARED_POOL = ThreadPoolExecutor(
+                max_workers=_SHARED_POOL_SIZE,
+                thread_name_prefix="studiocore-module",
+            )
+            log.debug(f"[ParallelModuleExecutor] Общий пул создан: workers={_SHARED_POOL_SIZE}")
+        return _SHARED_POOL
+
+
+def get_batch_pool(max_workers: int = 0) -> ThreadPoolExecutor:
+    """Return the bounded pool for whole batch items, separate from the module pool."""
+    global _BATCH_POOL
+
+    with _SHARED_POOL_LOCK:
+        if _BATCH_POOL is None:
+            workers = max(1, int(max_workers or executor_settings()["batch_workers"]))
+            _BATCH_POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="studiocore-batch")
+            log.debug(f"[ParallelModuleExecutor] Пул батчей создан: workers={workers}")
+        return _BATCH_POOL
+
+
+def _run_batch_item(fn: Callable[..., Any], args: Sequence[Any]) -> Any:
+    # Поток батча не помечается как рабочий поток модулей: граф элемента
+    # отправляет узлы в общий пул, а не выполняет их inline
+    _WORKER_STATE.batch = True
+    try:
+        return fn(*args)
+    finally:
+        _WORKER_STATE.batch = False
+
+
+def submit_batch_item(fn: Callable[..., Any], *args: Any) -> Future:
+    """Run ``fn(*args)`` (one whole batch analysis) on the batch pool."""
+    return get_batch_pool().submit(_run_batch_item, fn, args)
+
+
+def in_batch_thread() -> bool:
+    """True when called from inside a batch-pool worker."""
+    return bool(getattr(_WORKER_STATE, "batch", False))
+
+
+def shutdown_shared_executor(wait: bool = True) -> None:
+    """Shut down the shared pools; the next request lazily creates new ones."""
+    global _SHARED_POOL, _SHARED_POOL_SIZE, _SHARED_EXECUTOR, _PROCESS_POOL, _PROCESS_POOL_SIZE, _BATCH_POOL
+
+    with _SHARED_POOL_LOCK:
+        pool = _SHARED_POOL
+        process_pool = _PROCESS_POOL
+        batch_pool = _BATCH_POOL
+        _SHARED_POOL = None
+        _SHARED_POOL_SIZE = 0
+        _SHARED_EXECUTOR = None
+        _PROCESS_POOL = None
+        _PROCESS_POOL_SIZE = 0
+        _BATCH_POOL = None
+    if batch_pool is not None:
+        batch_pool.shutdown(wait=wait, cancel_futures=True)
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+        log.debug("[ParallelModuleExecutor] Общий пул остановлен")
+    if process_pool is not None:
+        process_pool.shutdown(wait=wait, cancel_futures=True)
+        log.debug("[ParallelModuleExecutor] Пул процессов остановлен")
+
+
+atexit.register(shutdown_shared_executor)
+
+
+def _run_module(name: str, fn: Callable[..., Any], args: Sequence[Any], kwargs: Dict[str, Any]) -> Any:
+    """Worker-side wrapper: tracks counters and marks the thread as a pool worker."""
+    _COUNTERS.on_start()
+    _WORKER_STATE.active = True
+    started = time.perf_counter()
+    ok = False
+    try:
+        result = fn(*args, **kwargs)
+        ok = True
+        return result
+    finally:
+        _WORKER_STATE.active = False
+        _COUNTERS.on_finish(time.perf_counter() - started, ok)
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, float]:
+    """``(fn(*args, **kwargs), run time in seconds)`` measured where the call executes."""
+    started = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return value, time.perf_counter() - started
+
+
+def in_worker_thread() -> bool:
+    """True when called from inside a shared-pool worker."""
+    return bool(getattr(_WORKER_STATE, "active", False))
+
+
+class ParallelModuleExecutor:
+    """Run independent analysis modules on the shared pool and collect results by name."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: float = DEFAULT_TIMEOUT,
+        module_timeouts: Optional[Dict[str, float]] = None,
+        backend: str = "thread",
+        process_workers: int = 0,
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown executor backend: {backend!r}")
+        self.max_workers = max(1, int(max_workers))
+        self.timeout = float(timeout)
+        self.module_timeouts: Dict[str, float] = dict(module_timeouts or {})
+        self.backend = backend
+        self.process_workers = int(process_workers)
+
+    # ------------------------------------------------------------------
+    def _timeout_for(self, spec: ModuleSpec) -> float:
+        if len(spec) > 4 and spec[4] is not None:
+            return float(spec[4])
+        return float(self.module_timeouts.get(spec[0], self.timeout))
+
+    @staticmethod
+    def _process_eligible(spec: ModuleSpec) -> bool:
+        """Only text-only Phase 1 engine calls can be shipped to worker processes."""
+        name, fn, args, kwargs = spec[:4]
+        task = PROCESS_TASKS.get(name)
+        return (
+            task is not None
+            and getattr(fn, "__name__", None) == task[1]
+            and len(args or ()) == 1
+            and isinstance(args[0], (str, AnalysisContext))
+            and not kwargs
+        )
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        return get_shared_pool(self.max_workers)
+
+    def _submit(self, spec: ModuleSpec, timed: bool = False) -> Future:
+        name, fn, args, kwargs = spec[:4]
+        if self.backend == "process" and self._process_eligible(spec):
+            call: Tuple[Any, ...] = (_run_process_task, name, context_text(args[0]))
+            if timed:
+                call = (_timed_call, *call)
+            # Активной задача становится до submit: рабочий процесс может успеть её завершить
+            _COUNTERS.on_process_start()
+            try:
+                future = get_process_pool(self.process_workers).submit(*call)
+            except RuntimeError:
+                _COUNTERS.on_process_rejected()
+                raise
+            future.add_done_callback(_on_process_done)
+            return future
+        args = tuple(args or ())
+        if timed:
+            fn, args = _timed_call, (fn, *args)
+        future = self._thread_pool().submit(_run_module, name, fn, args, dict(kwargs or {}))
+        future.add_done_callback(_on_module_done)
+        return future
+
+    def submit(self, spec: ModuleSpec, timed: bool = False) -> Future:
+        """
+        Submit a single module spec and return its future (used by the graph scheduler).
+
+        С ``timed=True`` future возвращает ``(результат, время выполнения в секундах)``:
+        время меряется внутри рабочего потока / процесса, без ожидания в очереди.
+        """
+        # Счётчик увеличиваем до submit: задача может стартовать сразу.
+        _COUNTERS.on_submit()
+        try:
+            return self._submit(spec, timed)
+        except RuntimeError:
+            _COUNTERS.on_rejected()
+            raise
+
+    @staticmethod
+    def abandon(future: Future) -> bool:
+        """Cancel a timed-out future if it has not started yet; record the timeout."""
+        _COUNTERS.on_timeout()
+        return future.cancel()
+
+    @staticmethod
+    def cancel(future: Future) -> bool:
+        """Cancel a future that has not started yet (no timeout recorded)."""
+        return future.cancel()
+
+    def run_inline(self, modules: Sequence[ModuleSpec]) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        for spec in modules:
+            name, fn, args, kwargs = spec[:4]
+            try:
+                results[name] = fn(*args, **(kwargs or {}))
+            except Exception as exc:
+                log.warning(f"[ParallelModuleExecutor] Модуль {name} завершился с ошибкой: {exc}")
+        return results
+
+    def execute_independent_modules(self, modules: Sequence[ModuleSpec]) -> Dict[str, Any]:
+        """
+        Execute ``(name, fn, args, kwargs[, timeout])`` specs concurrently.
+
+        Returns a dict ``name -> result``. Failed or timed-out modules are
+        omitted, so callers keep using ``results.get(name, default)``.
+        """
+        if not modules:
+            return {}
+        if self.backend == "inline" or in_worker_thread():
+            return self.run_inline(modules)
+
+        submitted_at = time.monotonic()
+        pending: List[Tuple[ModuleSpec, Future, float]] = []
+        results: Dict[str, Any] = {}
+
+        for spec in modules:
+            try:
+                future = self.submit(spec)
+            except RuntimeError:
+                # Пул остановлен (завершение интерпретатора) — выполняем inline.
+                results.update(self.run_inline([spec]))
+                continue
+            pending.append((spec, future, submitted_at + self._timeout_for(spec)))
+
+        for spec, future, deadline in pending:
+            name = spec[0]
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except BrokenProcessPool:
+                log.warning(f"[ParallelModuleExecutor] Пул процессов упал на модуле {name}, выполняем inline")
+                _reset_process_pool()
+                results.update(self.run_inline([spec]))
+            except FutureTimeoutError:
+                cancelled = self.abandon(future)
+                log.warning(
+                    f"[ParallelModuleExecutor] Таймаут модуля {name} "
+                    f"({'отменён до старта' if cancelled else 'результат отброшен'})"
+                )
+            except Exception as exc:
+                log.warning(f"[ParallelModuleExecutor] Модуль {name} завершился с ошибкой: {exc}")
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of the shared pool plus current utilization."""
+        snapshot = _COUNTERS.snapshot()
+        pool_size = _SHARED_POOL_SIZE
+        if self.backend == "process":
+            # Задачи Phase 1 считаются в рабочих процессах, остальные — в пуле потоков
+            snapshot["process_pool_size"] = _PROCESS_POOL_SIZE
+            pool_size += _PROCESS_POOL_SIZE
+        snapshot["pool_size"] = pool_size
+        snapshot["backend"] = self.backend
+        snapshot["utilization"] = round(snapshot["active"] / pool_size, 3) if pool_size else 0.0
+        return snapshot
+
+
+def get_shared_executor(
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> ParallelModuleExecutor:
+    """Return the process-wide executor configured from ``executor_settings()``."""
+    global _SHARED_EXECUTOR
+
+    settings = executor_settings()
+    with _SHARED_POOL_LOCK:
+        if _SHARED_EXECUTOR is None:
+            _SHARED_EXECUTOR = ParallelModuleExecutor(
+                max_workers=max_workers or settings["max_workers"],
+                timeout=timeout or settings["timeout"],
+                backend=settings["backend"],
+                process_workers=settings["process_workers"],
+            )
+        return _SHARED_EXECUTOR
+
+
+__all__ = [
+    "ParallelModuleExecutor",
+    "get_shared_executor",
+    "get_shared_pool",
+    "get_process_pool",
+    "get_batch_pool",
+    "submit_batch_item",
+    "executor_settings",
+    "PROCESS_TASKS",
+    "shutdown_shared_executor",
+    "in_worker_thread",
+    "in_batch_thread",
+]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -11,7 +11,9 @@ import re
 from dataclasses import dataclass
 from typing import Any, Dict, Sequence
 
+from studiocore.analysis_context import TextOrContext, as_context
 from studiocore.emotion_profile import EmotionVector
+from studiocore.engine_registry import get_engine
 from studiocore.tlp_engine import TruthLovePainEngine  # Import required engine
 
 
@@ -31,7 +33,7 @@ class RhythmDynamicsEmotionEngine:
 
     def __init__(self) -> None:
         """Initialize the engine with a shared TLP engine instance."""
-        self._tlp_engine = TruthLovePainEngine()
+        self._tlp_engine: TruthLovePainEngine = get_engine("tlp")
 
     def compose(
         self,
@@ -71,25 +73,30 @@ class RhythmDynamicsEmotionEngine:
         """
         return self._tlp_engine.export_emotion_vector(text)
 
-    def calc_resonance(self, text: str) -> float:
+    def emotion_vector_from_tlp(self, tlp: Dict[str, Any]) -> EmotionVector:
+        """``export_emotion_vector`` from an already computed TLP profile."""
+        return self._tlp_engine.emotion_vector_from(tlp)
+
+    def calc_resonance(self, text: TextOrContext) -> float:
         if not text:
             return 0.0
-        sentences = re.split(r"[.!?]+", text)
+        sentences = re.split(r"[.!?]+", as_context(text).text)
         density = sum(len(s.strip()) for s in sentences if s.strip())
         normalized = min(1.0, max(0.0, density / 500.0))
         return round(normalized, 4)
 
-    def calc_fracture(self, text: str) -> float:
+    def calc_fracture(self, text: TextOrContext) -> float:
         if not text:
             return 0.0
-        fractures = len(re.findall(r"(\.{3}|--|—)", text)) + text.count("!")
-        tokens = max(1, len(re.findall(r"\b\w+\b", text)))
+        ctx = as_context(text)
+        fractures = len(re.findall(r"(\.{3}|--|—)", ctx.text)) + ctx.char_counts["!"]
+        tokens = max(1, len(ctx.words))
         return round(min(1.0, fractures / tokens), 4)
 
-    def calc_entropy(self, text: str) -> float:
+    def calc_entropy(self, text: TextOrContext) -> float:
         if not text:
             return 0.0
-        tokens = re.findall(r"\b\w+\b", text.lower())
+        tokens = as_context(text).lowered_words
         unique = len(set(tokens))
         total = max(1, len(tokens))
         return round(min(1.0, unique / total), 4)
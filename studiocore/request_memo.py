@@ -0,0 +1,70 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Request-scoped store of intermediate engine results.
+
+Живёт ровно один вызов ``analyze()``: результаты графа Phase 1–3 кладутся
+сюда как готовые значения, а Phase 5 берёт их по имени вместо повторного
+вызова движка. Для значений, зависящих от аргументов (например, цветовая
+волна после появления ``style``), используется явный ``key`` — одинаковый
+вход вычисляется один раз. Счётчик ``invocations`` показывает, сколько раз
+реально вызывался каждый движок.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Mapping, Tuple
+
+_MISSING = object()
+
+
+def memo_key(value: Any) -> str:
+    """Stable digest of a JSON-like engine input (dicts, lists, tuples, scalars)."""
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+
+class RequestMemo:
+    """Memoized intermediate results for a single analysis request."""
+
+    def __init__(self, seed: Mapping[str, Any] | None = None) -> None:
+        self._values: Dict[Tuple[str, Hashable], Any] = {}
+        self.invocations: Counter = Counter()
+        if seed:
+            self.seed(seed)
+
+    def seed(self, values: Mapping[str, Any]) -> None:
+        """Register already computed outputs (e.g. ``GraphRun.outputs``)."""
+        for name, value in values.items():
+            self._values[(name, None)] = value
+
+    def get(self, name: str, default: Any = None, *, key: Hashable = None) -> Any:
+        return self._values.get((name, key), default)
+
+    def __contains__(self, name: str) -> bool:
+        return (name, None) in self._values
+
+    def get_or_compute(
+        self, name: str, fn: Callable[..., Any], *args: Any, key: Hashable = None, **kwargs: Any
+    ) -> Any:
+        """Return the stored value for ``(name, key)``, calling ``fn`` only on the first request."""
+        value = self._values.get((name, key), _MISSING)
+        if value is _MISSING:
+            self.invocations[name] += 1
+            value = fn(*args, **kwargs)
+            self._values[(name, key)] = value
+        return value
+
+
+__all__ = ["RequestMemo", "memo_key"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -0,0 +1,126 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Bounded LRU + TTL cache for complete ``analyze()`` results.
+
+Повторный анализ одного и того же текста (повторная отправка формы, ретраи
+клиентов, идентичные тексты в батче) возвращает готовый результат вместо
+прогона всех фаз. Ключ — SHA-256 от нормализованного текста, признака
+агрессивного фильтра, ``preferred_gender``, ``semantic_hints``, запрошенной
+версии и версии движка / конфига. Результаты хранятся и выдаются глубокими
+копиями, поэтому вызывающий код может свободно их модифицировать.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from .bounded_cache import BoundedCache
+from .config import DEFAULT_CONFIG, STUDIOCORE_VERSION, config_fingerprint
+from .text_utils import normalize_text_preserve_symbols
+
+log = logging.getLogger(__name__)
+
+
+def estimate_result_bytes(result: Any) -> int:
+    """Approximate memory footprint of a result via its JSON size."""
+    try:
+        return len(json.dumps(result, default=str, ensure_ascii=False).encode("utf-8"))
+    except (TypeError, ValueError):
+        return len(repr(result).encode("utf-8"))
+
+
+class AnalysisResultCache:
+    """LRU cache with TTL and entry / byte limits on top of ``BoundedCache``."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl_seconds: Optional[float] = 900.0,
+    ) -> None:
+        self._cache = BoundedCache(
+            "analysis.results",
+            capacity=max_entries,
+            policy="lru",
+            ttl_seconds=ttl_seconds,
+            max_bytes=max(1, int(max_bytes)),
+            size_of=estimate_result_bytes,
+        )
+
+    @classmethod
+    def from_config(cls) -> Optional["AnalysisResultCache"]:
+        """Build the cache from DEFAULT_CONFIG["result_cache"]; None when disabled."""
+        settings = dict(DEFAULT_CONFIG.get("result_cache", {}) or {})
+        env_enabled = os.getenv("STUDIOCORE_RESULT_CACHE")
+        if env_enabled is not None:
+            settings["enabled"] = env_enabled.strip().lower() not in ("0", "false", "no", "off")
+        if not settings.get("enabled", True):
+            return None
+        return cls(
+            max_entries=settings.get("max_entries", 256),
+            max_bytes=settings.get("max_bytes", 32 * 1024 * 1024),
+            ttl_seconds=settings.get("ttl_seconds", 900.0),
+        )
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def make_key(
+        text: str,
+        preferred_gender: str = "auto",
+        semantic_hints: Optional[Dict[str, Any]] = None,
+        version: Optional[str] = None,
+    ) -> str:
+        """Digest of everything that influences the analysis result."""
+        normalized = normalize_text_preserve_symbols(text or "")
+        # Фильтр агрессии в ядре смотрит на исходный текст, а не на нормализованный
+        text_lower = (text or "").lower()
+        aggressive = any(kw.lower() in text_lower for kw in DEFAULT_CONFIG.AGGRESSION_KEYWORDS)
+        payload = json.dumps(
+            {
+                "text": normalized,
+                "aggressive": aggressive,
+                "preferred_gender": preferred_gender,
+                "semantic_hints": semantic_hints or {},
+                "version": version,
+                "engine": [STUDIOCORE_VERSION, DEFAULT_CONFIG.get("MONOLITH_VERSION")],
+                "config": config_fingerprint(),
+            },
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._cache.get(key)
+        return copy.deepcopy(value) if value is not None else None
+
+    def put(self, key: str, result: Dict[str, Any]) -> bool:
+        """Store a defensive copy; results larger than ``max_bytes`` are not cached."""
+        stored = self._cache.put(key, copy.deepcopy(result))
+        if not stored:
+            log.debug("[ResultCache] Результат превышает лимит по размеру, не кэшируем")
+        return stored
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+__all__ = ["AnalysisResultCache", "estimate_result_bytes"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
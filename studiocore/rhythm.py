@@ -19,7 +19,8 @@ import math
 import re
 import statistics
 import logging
-from typing import Dict, List, Optional, Tuple, TypedDict, Any
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, TypedDict
 
 # StudioCore Signature Block (Do Not Remove)
 # Author: Сергей Бауэр (@Sbauermaner)
@@ -29,8 +30,11 @@ from typing import Dict, List, Optional, Tuple, TypedDict, Any
 # AI_TRAINING_PROHIBITED: Redistribution or training of AI models on this codebase
 # without explicit written permission from the Author is prohibited.
 
-from .text_utils import extract_sections
+from .analysis_context import AnalysisContext, TextOrContext, as_context
 from .config import DEFAULT_CONFIG
+from .bounded_cache import get_cache
+from .lyrics_lexer import BPM_HEADER
+from .syllables import VOWELS, syllable_count, syllable_counts
 
 # Task 5.1: Logger for error reporting
 log = logging.getLogger(__name__)
@@ -38,9 +42,6 @@ log = logging.getLogger(__name__)
 # Task 4.2: Используем PUNCT_WEIGHTS из config.py вместо локального словаря
 PUNCT_WEIGHTS = DEFAULT_CONFIG.PUNCT_WEIGHTS
 
-HEADER_BPM_RE = re.compile(
-    r"\[\s*BPM\s*:?\s*(?P<bpm>[0-9]{2,3}(?:\.[0-9]+)?)\s*\]", re.I
-)
 SECTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
     "INTRO": ("intro", "интро", "start", "opening"),
     "VERSE": ("verse", "куплет", "kup", "strofa", "куплет"),
@@ -118,6 +119,60 @@ def resolve_global_bpm(
     return DEFAULT_CONFIG.rhythm["DEFAULT_BPM"]
 
 
+@dataclass(frozen=True)
+class LineStats:
+    """Statistics of one stripped lyric line, computed once per distinct line."""
+
+    syllables: int
+    length: int
+    words: int  # max(1, len(line.split()))
+    # Веса PUNCT_WEIGHTS в порядке текста: сумма с нуля по любому набору строк
+    # бит-в-бит равна прежнему sum(...) по символам этого текста
+    punct: Tuple[float, ...]
+    commas: int
+    stops: int  # ";" + ":"
+    accents: int  # "!" + "?"
+    dashes: int  # "—" + "-"
+    ellipses: int
+    breaths: int  # "/"
+
+    @property
+    def energy(self) -> float:
+        return sum(self.punct)
+
+
+@dataclass(frozen=True)
+class LineStatsTable:
+    """Per - line statistics of a text (stripped non - empty lines, in order)."""
+
+    lines: Tuple[str, ...]
+    rows: Tuple[LineStats, ...]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @property
+    def syllables(self) -> List[int]:
+        return [row.syllables for row in self.rows]
+
+    @property
+    def words(self) -> List[int]:
+        return [row.words for row in self.rows]
+
+    @property
+    def energy(self) -> float:
+        return sum(weight for row in self.rows for weight in row.punct)
+
+
+@dataclass(frozen=True)
+class SectionRhythmStats:
+    """Part of a section's rhythm that depends only on its body (cached by body hash)."""
+
+    table: LineStatsTable
+    density_bpm: float
+    heuristic_bpm: float
+
+
 def calc_tension(curve: List[float]) -> float:
     """Normalised rhythmic tension based on micro - curve variance."""
 
@@ -130,36 +185,77 @@ def calc_tension(curve: List[float]) -> float:
 class LyricMeter:
     """Adaptive rhythm analyser with per - section awareness."""
 
-    vowels = set("aeiouyауоыиэяюёеAEIOUYАУОЫИЭЯЮЁЕ")
+    vowels = set(VOWELS)
 
     def __init__(self):
         # Task 9.1: Hash-based cache to prevent re-analyzing the same text multiple times
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # (общий ограниченный кэш процесса, namespace "rhythm.analysis")
+        self._cache = get_cache("rhythm.analysis")
+        # Секции по md5 тела: при правке одного куплета пересчитываются только
+        # изменённые секции и глобальное смешивание
+        self._section_cache = get_cache("rhythm.sections")
 
     def _syllables(self, s: str) -> int:
-        return max(1, sum(1 for ch in s if ch in self.vowels))
+        return syllable_count(s)
 
     def _punct_energy(self, text: str) -> float:
         return sum(PUNCT_WEIGHTS.get(ch, 0.0) for ch in text)
 
-    def _extract_header_bpm(self, text: str) -> Optional[float]:
-        match = HEADER_BPM_RE.search(text)
-        if not match:
+    def _line_stats(self, line: str, syllables: Optional[int] = None) -> LineStats:
+        return LineStats(
+            syllables=self._syllables(line) if syllables is None else syllables,
+            length=len(line),
+            words=max(1, len(line.split())),
+            punct=tuple(PUNCT_WEIGHTS[ch] for ch in line if ch in PUNCT_WEIGHTS),
+            commas=line.count(", "),
+            stops=line.count(";") + line.count(":"),
+            accents=line.count("!") + line.count("?"),
+            dashes=line.count("—") + line.count("-"),
+            ellipses=line.count("…"),
+            breaths=line.count("/"),
+        )
+
+    def line_table(
+        self, text: TextOrContext, memo: Optional[Dict[str, LineStats]] = None
+    ) -> LineStatsTable:
+        """
+        Statistics of every stripped non - empty line of ``text``.
+
+        ``memo`` (строка → LineStats) разделяется между таблицами одного
+        анализа: строки, общие для всего текста и его секций (и повторы
+        припевов), разбираются один раз.
+        """
+        if isinstance(text, AnalysisContext):
+            lines = text.stripped_lines
+        else:
+            # Тело секции: без построения контекста ради одной таблицы строк
+            lines = tuple(line.strip() for line in (text or "").split("\n") if line.strip())
+        if memo is None:
+            memo = {}
+        # Слоги новых строк считаются одной пачкой (syllables.vowel_counts)
+        missing = list(dict.fromkeys(line for line in lines if line not in memo))
+        for line, syllables in zip(missing, syllable_counts(missing)):
+            memo[line] = self._line_stats(line, syllables)
+        return LineStatsTable(lines, tuple(memo[line] for line in lines))
+
+    def _extract_header_bpm(self, text: TextOrContext) -> Optional[float]:
+        headers = as_context(text).tokens.of(BPM_HEADER)
+        if not headers:
             return None
         try:
-            return float(match.group("bpm"))
+            return float(headers[0].value)
         except (TypeError, ValueError) as e:
             # Task 5.1: Log error instead of silent failure
-            log.error(f"Rhythm error: Failed to parse BPM from header '{match.group('bpm')}': {e}")
+            log.error(f"Rhythm error: Failed to parse BPM from header '{headers[0].value}': {e}")
             return None
 
-    def _strip_header_lines(self, text: str) -> str:
-        lines = []
-        for ln in text.split("\n"):
-            if HEADER_BPM_RE.search(ln):
-                continue
-            lines.append(ln)
-        return "\n".join(lines).strip()
+    def _strip_header_lines(self, text: TextOrContext) -> str:
+        ctx = as_context(text)
+        # Строка выпадает, если заголовок [BPM: ...] целиком в ней
+        header_lines = {token.line for token in ctx.tokens.of(BPM_HEADER) if "\n" not in token.text}
+        if not header_lines:
+            return ctx.text.strip()
+        return "\n".join(ln for idx, ln in enumerate(ctx.lines) if idx not in header_lines).strip()
 
     def _normalize_section_name(
         self, tag: str, counters: Dict[str, int], index: int
@@ -196,25 +292,41 @@ class LyricMeter:
             return f"{base}_{counters[base]}"
         return base
 
-    def _build_sections(self, text: str) -> Dict[str, str]:
-        sections = extract_sections(text)
+    def _build_sections(self, text: TextOrContext) -> Dict[str, str]:
+        ctx = as_context(text)
+        sections = ctx.section_table
         if not sections:
-            clean_lines = [ln for ln in text.split("\n") if ln.strip()]
+            clean_lines = list(ctx.nonempty_lines)
             return {"BODY": "\n".join(clean_lines)} if clean_lines else {}
 
         counters: Dict[str, int] = {}
         structured: Dict[str, str] = {}
         for idx, section in enumerate(sections):
-            tag = section.get("tag", f"Section {idx + 1}")
-            key = self._normalize_section_name(tag, counters, idx)
-            body_lines = [ln for ln in section.get("lines", []) if ln.strip()]
+            key = self._normalize_section_name(section.tag, counters, idx)
+            body_lines = [ln for ln in section.lines if ln.strip()]
             if body_lines:
                 structured[key] = "\n".join(body_lines)
         return structured
 
     def _density_bpm(
         self,
-        text: str,
+        text: TextOrContext,
+        emotions: Optional[Dict[str, float]] = None,
+        cf: Optional[float] = None,
+        tlp: Optional[Dict[str, float]] = None,
+        emotion_weight: Optional[float] = None,
+    ) -> float:
+        return self._density_from_table(
+            self.line_table(text),
+            emotions=emotions,
+            cf=cf,
+            tlp=tlp,
+            emotion_weight=emotion_weight,
+        )
+
+    def _density_from_table(
+        self,
+        table: LineStatsTable,
         emotions: Optional[Dict[str, float]] = None,
         cf: Optional[float] = None,
         tlp: Optional[Dict[str, float]] = None,
@@ -226,12 +338,11 @@ class LyricMeter:
         
         emotions = emotions or {}
         tlp = tlp or {}
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
-        if not lines:
+        if not table:
             return 0.0
 
-        syllables = [self._syllables(line) for line in lines]
-        avg_syll = sum(syllables) / len(lines)
+        syllables = table.syllables
+        avg_syll = sum(syllables) / len(table)
 
         # Task 4.1: Используем значения из config.py
         r = DEFAULT_CONFIG.rhythm
@@ -243,7 +354,8 @@ class LyricMeter:
             )
         )
 
-        p_energy = self._punct_energy(text)
+        # Пробелы и пустые строки весов не имеют: энергия строк = энергия текста
+        p_energy = table.energy
         base += min(r["PUNCT_ENERGY_MAX"], p_energy * r["PUNCT_ENERGY_MULTIPLIER"])
 
         anger = emotions.get("anger", 0.0)
@@ -284,7 +396,7 @@ class LyricMeter:
             truth_drive = tlp.get("Truth", 0.0) * r["TRUTH_DRIVE_MULTIPLIER"] * emotion_weight
             bpm += pain_boost + truth_drive - love_smooth
 
-        n_lines = len(lines)
+        n_lines = len(table)
         # Task 4.1: Используем значения из config.py
         if n_lines <= r["SHORT_SECTION_LINE_COUNT"]:
             bpm += r["SHORT_SECTION_BPM_BOOST"]
@@ -293,24 +405,25 @@ class LyricMeter:
 
         return clamp(bpm, MIN_BPM, MAX_BPM)
 
-    def _heuristic_section_bpm(self, section_text: str) -> float:
-        lines = [line.strip() for line in section_text.split("\n") if line.strip()]
-        if not lines:
+    def _heuristic_section_bpm(self, section_text: TextOrContext) -> float:
+        return self._heuristic_from_table(self.line_table(section_text))
+
+    def _heuristic_from_table(self, table: LineStatsTable) -> float:
+        if not table:
             return 0.0
 
-        phrase_lengths = [max(1, len(line.split())) for line in lines]
+        rows = table.rows
+        phrase_lengths = table.words
         total_words = sum(phrase_lengths)
         avg_words = total_words / len(phrase_lengths)
-        char_count = sum(len(line) for line in lines)
+        char_count = sum(row.length for row in rows)
         avg_word_len = char_count / max(total_words, 1)
 
-        punctuation_hits = sum(
-            line.count(", ") + line.count(";") + line.count(":") for line in lines
-        )
-        accent_hits = sum(line.count("!") + line.count("?") for line in lines)
-        dash_hits = sum(line.count("—") + line.count("-") for line in lines)
-        ellipsis_hits = sum(line.count("…") for line in lines)
-        breath_pauses = sum(line.count("/") for line in lines)
+        punctuation_hits = sum(row.commas + row.stops for row in rows)
+        accent_hits = sum(row.accents for row in rows)
+        dash_hits = sum(row.dashes for row in rows)
+        ellipsis_hits = sum(row.ellipses for row in rows)
+        breath_pauses = sum(row.breaths for row in rows)
 
         variation = (
             statistics.pstdev(phrase_lengths) if len(phrase_lengths) > 1 else 0.0
@@ -338,6 +451,49 @@ class LyricMeter:
             MAX_BPM + r["BPM_CLAMP_OFFSET_MAX"]
         )
 
+    def _section_stats(
+        self, body: str, memo: Dict[str, LineStats]
+    ) -> Tuple[str, SectionRhythmStats]:
+        """``(body digest, stats)``; rows of a cached table are added to ``memo``."""
+        digest = hashlib.md5(body.encode("utf-8")).hexdigest()
+        stats = self._section_cache.get(("stats", digest))
+        if stats is None:
+            table = self.line_table(body, memo)
+            stats = SectionRhythmStats(
+                table=table,
+                density_bpm=self._density_from_table(table, emotion_weight=0.0),
+                heuristic_bpm=self._heuristic_from_table(table),
+            )
+            self._section_cache.put(("stats", digest), stats)
+        else:
+            memo.update(zip(stats.table.lines, stats.table.rows))
+        return digest, stats
+
+    def _section_rhythm(
+        self, digest: str, stats: SectionRhythmStats, density_global: float
+    ) -> RhythmSection:
+        # Смешивание зависит от глобальной плотности: она входит в ключ
+        key = ("section", digest, density_global)
+        section = self._section_cache.get(key)
+        if section is None:
+            section_bpm = self._blend_section_bpm(
+                stats.density_bpm, stats.heuristic_bpm, density_global
+            )
+            micro_curve = self._micro_curve_from_table(stats.table, section_bpm)
+            section = {
+                "mean_bpm": section_bpm,
+                "micro_curve": micro_curve,
+                "tension": calc_tension(micro_curve),
+                "phrase_pattern": stats.table.words,
+                "line_count": len(stats.table),
+            }
+            self._section_cache.put(key, section)
+        return {
+            **section,
+            "micro_curve": list(section["micro_curve"]),
+            "phrase_pattern": list(section["phrase_pattern"]),
+        }
+
     def _blend_section_bpm(
         self,
         density_bpm: float,
@@ -364,22 +520,24 @@ class LyricMeter:
         blended = sum(val * weight for val, weight in values) / total_weight
         return clamp(blended, MIN_BPM - 10.0, MAX_BPM + 15.0)
 
-    def _build_micro_curve(self, section_text: str, section_bpm: float) -> List[float]:
-        lines = [line.strip() for line in section_text.split("\n") if line.strip()]
-        if not lines:
+    def _build_micro_curve(self, section_text: TextOrContext, section_bpm: float) -> List[float]:
+        return self._micro_curve_from_table(self.line_table(section_text), section_bpm)
+
+    def _micro_curve_from_table(self, table: LineStatsTable, section_bpm: float) -> List[float]:
+        if not table:
             return []
 
-        phrase_lengths = [max(1, len(line.split())) for line in lines]
+        phrase_lengths = table.words
         avg_phrase = sum(phrase_lengths) / len(phrase_lengths)
         curve: List[float] = []
 
-        for idx, line in enumerate(lines):
+        for idx, row in enumerate(table.rows):
             length = phrase_lengths[idx]
-            energy = self._punct_energy(line)
-            accent = line.count("!") + line.count("?")
-            ellipsis = line.count("…")
-            dash = line.count("—") + line.count("-")
-            comma_breaks = line.count(", ")
+            energy = row.energy
+            accent = row.accents
+            ellipsis = row.ellipses
+            dash = row.dashes
+            comma_breaks = row.commas
 
             shift = 0.0
             shift += (avg_phrase - length) * 2.0
@@ -404,16 +562,12 @@ class LyricMeter:
 
         return curve
 
-    def _phrase_pattern(self, section_text: str) -> List[int]:
-        return [
-            max(1, len(line.split()))
-            for line in section_text.split("\n")
-            if line.strip()
-        ]
+    def _phrase_pattern(self, section_text: TextOrContext) -> List[int]:
+        return self.line_table(section_text).words
 
     def analyze(
         self,
-        text: str,
+        text: TextOrContext,
         *,
         structured_sections: Optional[Dict[str, str]] = None,
         header_bpm: Optional[float] = None,
@@ -422,6 +576,8 @@ class LyricMeter:
         tlp: Optional[Dict[str, float]] = None,
         emotion_weight: Optional[float] = None,
     ) -> RhythmAnalysis:
+        ctx = as_context(text)
+        text = ctx.text
         # Task 9.1: Use hash-based cache to prevent re-analyzing the same text
         # Create cache key from text and parameters that affect the result
         cache_key_parts = [
@@ -436,9 +592,9 @@ class LyricMeter:
         cache_key_str = "|".join(cache_key_parts)
         text_hash = hashlib.md5(cache_key_str.encode("utf-8")).hexdigest()
         
-        if text_hash in self._cache:
+        cached_result = self._cache.get(text_hash)
+        if cached_result is not None:
             # Return cached result
-            cached_result = self._cache[text_hash].copy()
             return RhythmAnalysis(**cached_result)
         
         # Task 4.1: Используем значение из config.py если не передано
@@ -448,16 +604,26 @@ class LyricMeter:
         tlp = tlp or {}
 
         header = (
-            header_bpm if header_bpm is not None else self._extract_header_bpm(text)
+            header_bpm if header_bpm is not None else self._extract_header_bpm(ctx)
         )
-        text_without_header = self._strip_header_lines(text)
+        text_without_header = self._strip_header_lines(ctx)
+
+        # Без строк [BPM: ...] набор непустых строк совпадает с исходным текстом,
+        # поэтому переиспользуем таблицу строк из контекста запроса
+        density_ctx = ctx if text_without_header == text.strip() else AnalysisContext(text_without_header)
+        # Токены секций — тоже из контекста, если текст совпадает дословно
+        section_ctx = density_ctx if density_ctx.text == text_without_header else AnalysisContext(text_without_header)
 
-        sections = structured_sections or self._build_sections(text_without_header)
+        sections = structured_sections or self._build_sections(section_ctx)
         if not sections:
             sections = {"BODY": text_without_header}
-
-        density_global = self._density_bpm(
-            text_without_header,
+        # Таблица строк строится один раз: глобальная плотность и все эвристики
+        # секций — агрегаты по строкам, общим через memo. Неизменённые секции
+        # берутся из кэша по хэшу тела, их строки не разбираются заново
+        memo: Dict[str, LineStats] = {}
+        section_stats = {name: self._section_stats(body, memo) for name, body in sections.items()}
+        density_global = self._density_from_table(
+            self.line_table(density_ctx, memo),
             emotions=emotions,
             cf=cf,
             tlp=tlp,
@@ -466,20 +632,9 @@ class LyricMeter:
 
         section_results: Dict[str, RhythmSection] = {}
         section_bpms: List[float] = []
-        for name, body in sections.items():
-            density_section = self._density_bpm(body, emotion_weight=0.0)
-            heuristic_section = self._heuristic_section_bpm(body)
-            section_bpm = self._blend_section_bpm(
-                density_section, heuristic_section, density_global
-            )
-            micro_curve = self._build_micro_curve(body, section_bpm)
-            section_results[name] = {
-                "mean_bpm": section_bpm,
-                "micro_curve": micro_curve,
-                "tension": calc_tension(micro_curve),
-                "phrase_pattern": self._phrase_pattern(body),
-                "line_count": len([ln for ln in body.split("\n") if ln.strip()]),
-            }
+        for name, (digest, stats) in section_stats.items():
+            section_results[name] = self._section_rhythm(digest, stats, density_global)
+            section_bpm = section_results[name]["mean_bpm"]
             if section_bpm > 0:
                 section_bpms.append(section_bpm)
 
@@ -523,7 +678,7 @@ class LyricMeter:
         )
         
         # Task 9.1: Cache the result using hash
-        self._cache[text_hash] = dict(result)
+        self._cache.put(text_hash, dict(result))
         
         return result
 
@@ -550,6 +705,9 @@ class LyricMeter:
 
 __all__ = [
     "LyricMeter",
+    "LineStats",
+    "LineStatsTable",
+    "SectionRhythmStats",
     "RhythmAnalysis",
     "RhythmSection",
     "RhythmConflict",
@@ -11,9 +11,10 @@ from collections import Counter
 from typing import Any, Dict, List, Sequence, Tuple
 import re
 
+from .analysis_context import TextOrContext, as_context
 from .emotion import EmotionEngine
 from .structures import PhraseEmotionPacket, SectionEmotionWave
-from .text_utils import extract_phrases_from_section, extract_sections
+from .text_utils import extract_phrases_from_section
 
 
 class SectionIntelligenceEngine:
@@ -213,23 +214,26 @@ class SectionIntelligenceEngine:
 
     def analyze(
         self,
-        text: str,
+        text: TextOrContext,
         sections: Sequence[str] | None,
         emotion_curve: Sequence[float] | None = None,
         emotion_engine: EmotionEngine | None = None,
     ) -> Dict[str, Any]:
+        ctx = as_context(text)
+        text = ctx.text
         sections = self._prepare_sections(sections, text)
         structure_tension = self.compute_structure_tension(sections)
         phrase_packets: List[Dict[str, Any]] = []
         section_waves: List[SectionEmotionWave] = []
 
-        structured_sections = extract_sections(text)
+        # Секции только читаются — берём общую таблицу запроса без копии
+        structured_sections = ctx.section_table
         resolved_sections: List[Tuple[str, str]] = []
 
         if structured_sections:
             for idx, item in enumerate(structured_sections):
-                tag = item.get("tag") or f"Section {idx + 1}"
-                section_text = "\n".join(item.get("lines", [])).strip()
+                tag = item.tag or f"Section {idx + 1}"
+                section_text = item.text
                 if section_text:
                     resolved_sections.append((tag, section_text))
 
@@ -268,8 +272,8 @@ class SectionIntelligenceEngine:
 
             section_packets: List[PhraseEmotionPacket] = []
             if emotion_engine:
-                for phrase in unique_phrases:
-                    packet: PhraseEmotionPacket = emotion_engine.analyze_phrase(phrase)
+                # Один проход словарей по всей секции вместо прохода на каждую фразу
+                for packet in emotion_engine.analyze_phrases(unique_phrases):
                     phrase_packets.append(packet.to_dict())
                     section_packets.append(packet)
 
@@ -354,7 +358,7 @@ class SectionIntelligence:
         self.engine = engine or EmotionEngine()
         self._engine = SectionIntelligenceEngine()
 
-    def parse(self, text: str, sections: Sequence[str] | None = None) -> Dict[str, Any]:
+    def parse(self, text: TextOrContext, sections: Sequence[str] | None = None) -> Dict[str, Any]:
         self.engine.reset_phrase_packets()
         result = self._engine.analyze(
             text, sections, emotion_curve=None, emotion_engine=self.engine
@@ -10,6 +10,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any, Dict, List, Sequence
 
+from .analysis_context import TextOrContext, as_context
 from .logical_engines import TextStructureEngine
 from .sections import SectionTagAnalyzer
 
@@ -54,14 +55,18 @@ class SectionParser:
         return round(min(1.0, exclaim_weight + caps_weight), 3)
 
     def parse(
-        self, text: str, *, sections: Sequence[str] | None = None
+        self, text: TextOrContext, *, sections: Sequence[str] | None = None
     ) -> SectionParseResult:
         # Reset text engine state and perform structural analysis
         self._safe_reset_engine()
+        # Секции разбираются один раз на текст (SectionTable контекста);
+        # повторный auto_section_split ниже берёт ту же таблицу
+        ctx = as_context(text)
+        text = ctx.text
         resolved_sections = (
             list(sections)
             if sections is not None
-            else self._text_engine.auto_section_split(text)
+            else self._text_engine.auto_section_split(ctx)
         )
         prefer_strict_boundary = False
 
@@ -79,7 +84,7 @@ class SectionParser:
             ):
                 # Пытаемся получить метаданные, вызвав auto_section_split для
                 # обновления состояния
-                self._text_engine.auto_section_split(text)
+                self._text_engine.auto_section_split(ctx)
                 metadata = self._text_engine.section_metadata()
         else:
             metadata = self._text_engine.section_metadata()
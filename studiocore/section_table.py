@@ -0,0 +1,154 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Immutable per-request section table.
+
+Раньше ``extract_sections`` вызывался заново в каждом потребителе
+(``TextStructureEngine.auto_section_split``, ``LyricMeter._build_sections``,
+``SectionIntelligenceEngine.analyze``, ``SectionParser``), а группировка
+повторяющихся секций была скопирована в несколько мест. ``SectionTable``
+строится один раз на текст (``AnalysisContext.section_table``, кэш
+"sections.table" по md5) и хранит теги, строки, диапазоны строк в исходном
+тексте, ключи / хэши нормализованного содержимого и группы повторов.
+Потребителям, которые меняют секции, ``as_dicts`` отдаёт свежие копии.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .analysis_context import AnalysisContext, TextOrContext, as_context
+from .bounded_cache import get_cache
+from .text_utils import _extract_sections, _section_content_key, extract_raw_blocks
+
+
+@dataclass(frozen=True)
+class SectionEntry:
+    """One parsed section: tag, lines and their place in the source text."""
+
+    tag: str
+    lines: Tuple[str, ...]
+    # Полуинтервал номеров строк ``text.split("\n")`` от первой до последней
+    # строки секции (маркеры и пустые строки между ними входят); (-1, -1) у
+    # секции без строк
+    start: int
+    end: int
+    content_key: str  # _section_content_key(lines)
+    digest: str  # md5 content_key
+    group: int  # индекс в SectionTable.duplicate_groups, -1 — без повторов
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines).strip()
+
+
+@dataclass(frozen=True)
+class SectionTable:
+    """Sections of one text (as ``extract_sections`` returns them), read - only."""
+
+    text: str
+    sections: Tuple[SectionEntry, ...]
+    # Группы повторяющихся непустых секций (индексы по порядку появления)
+    duplicate_groups: Tuple[Tuple[int, ...], ...]
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def __iter__(self) -> Iterator[SectionEntry]:
+        return iter(self.sections)
+
+    @property
+    def tags(self) -> List[str]:
+        return [section.tag for section in self.sections]
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """Fresh ``[{"tag": ..., "lines": [...]}]`` copies (the ``extract_sections`` format)."""
+        return [{"tag": section.tag, "lines": list(section.lines)} for section in self.sections]
+
+    def content_groups(self) -> Dict[str, List[int]]:
+        """Same mapping as ``text_utils._group_sections_by_content``, without re - normalizing."""
+        groups: Dict[str, List[int]] = {}
+        for index, section in enumerate(self.sections):
+            groups.setdefault(section.content_key, []).append(index)
+        return groups
+
+    @cached_property
+    def blocks(self) -> Tuple[str, ...]:
+        """Blank - line blocks without hints (``extract_raw_blocks``)."""
+        return tuple(extract_raw_blocks(self.text))
+
+
+def _line_ranges(text_lines: Sequence[str], sections: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    # Строки секций — исходные строки текста в том же порядке (без маркеров
+    # и пустых), поэтому достаточно одного прохода по тексту
+    ranges: List[Tuple[int, int]] = []
+    pos = 0
+    total = len(text_lines)
+    for section in sections:
+        start = end = -1
+        for line in section["lines"]:
+            while pos < total and text_lines[pos] != line:
+                pos += 1
+            if pos == total:
+                break
+            if start < 0:
+                start = pos
+            pos += 1
+            end = pos
+        ranges.append((start, end))
+    return ranges
+
+
+def _build_table(ctx: AnalysisContext) -> SectionTable:
+    parsed = _extract_sections(ctx)
+    keys = [_section_content_key(section["lines"]) for section in parsed]
+    grouped: Dict[str, List[int]] = {}
+    for index, key in enumerate(keys):
+        if key:
+            grouped.setdefault(key, []).append(index)
+    duplicate_groups = tuple(tuple(indices) for indices in grouped.values() if len(indices) > 1)
+    group_of = {index: number for number, indices in enumerate(duplicate_groups) for index in indices}
+
+    entries = tuple(
+        SectionEntry(
+            tag=section["tag"],
+            lines=tuple(section["lines"]),
+            start=start,
+            end=end,
+            content_key=key,
+            digest=hashlib.md5(key.encode("utf-8")).hexdigest(),
+            group=group_of.get(index, -1),
+        )
+        for index, (section, key, (start, end)) in enumerate(zip(parsed, keys, _line_ranges(ctx.lines, parsed)))
+    )
+    return SectionTable(text=ctx.text, sections=entries, duplicate_groups=duplicate_groups)
+
+
+def section_table(text: TextOrContext) -> SectionTable:
+    """
+    ``SectionTable`` of ``text``.
+
+    Таблица кэшируется по md5 текста (namespace "sections.table"): движки,
+    получающие строку, а не ``AnalysisContext``, не разбирают секции заново.
+    """
+    ctx = as_context(text)
+    cache = get_cache("sections.table")
+    table = cache.get(ctx.digest)
+    if table is None:
+        table = _build_table(ctx)
+        cache.put(ctx.digest, table)
+    return table
+
+
+__all__ = ["SectionEntry", "SectionTable", "section_table"]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
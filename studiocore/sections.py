@@ -7,7 +7,7 @@ import re
 from typing import List, Dict, Any
 
 ANNOTATION_PATTERN = re.compile(
-    r"\[(?P < section > [A - Za - zА - Яа - я0 - 9\s\-]+)\s * [-–]\s * (?P < tags > [^\]]+)\]",
+    r"\[(?P<section>[A-Za-zА-Яа-я0-9\s\-]+)\s*[-–]\s*(?P<tags>[^\]]+)\]",
     flags=re.I,
 )
 
@@ -0,0 +1,96 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
+
+"""
+Shared vowel / syllable counting for Latin and Cyrillic lyrics.
+
+Слог оценивается по числу гласных (``VOWELS``, оба регистра). Все ритмические
+модули (``LyricMeter``, ``bpm_engine.BPMEngine``, ``logical_engines.BPMEngine``)
+считают через эти функции, чтобы оценки не расходились.
+
+``vowel_counts`` считает сразу пачку строк: с NumPy текст кодируется в массив
+кодовых точек, гласные отмечаются маской по таблице, а суммы по строкам
+берутся одним ``np.add.reduceat`` по границам строк. Без NumPy (и для коротких
+пачек, где накладные расходы массива больше выигрыша) — ``re.findall`` по строке.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+VOWELS = "aeiouyауоыиэяюёеAEIOUYАУОЫИЭЯЮЁЕ"
+
+_VOWEL_RE = re.compile(f"[{VOWELS}]")
+
+# Ниже этого объёма (символов в пачке) построчный regex быстрее массива
+VECTOR_MIN_CHARS = 1024
+
+if NUMPY_AVAILABLE:
+    # Все гласные лежат ниже U+0452 ('ё' = U+0451); старшие кодовые точки
+    # сводятся к последней ячейке, которая гласной не является
+    _TABLE_SIZE = max(map(ord, VOWELS)) + 2
+    _VOWEL_TABLE = np.zeros(_TABLE_SIZE, dtype=np.int32)
+    _VOWEL_TABLE[[ord(ch) for ch in VOWELS]] = 1
+else:
+    _TABLE_SIZE = 0
+    _VOWEL_TABLE = None
+
+
+def count_vowels(text: str) -> int:
+    """Number of vowels in ``text``."""
+    return len(_VOWEL_RE.findall(text)) if text else 0
+
+
+def syllable_count(text: str) -> int:
+    """Syllable estimate of one line: its vowel count, at least 1."""
+    return max(1, count_vowels(text))
+
+
+def _vowel_counts_vectorized(lines: Sequence[str]) -> List[int]:
+    # Каждая строка + "\n": сегменты непустые, разделитель не гласная
+    codes = np.frombuffer(("\n".join(lines) + "\n").encode("utf-32-le"), dtype=np.uint32)
+    mask = _VOWEL_TABLE[np.minimum(codes, _TABLE_SIZE - 1)]
+    starts = np.empty(len(lines), dtype=np.intp)
+    starts[0] = 0
+    np.cumsum(np.fromiter((len(line) + 1 for line in lines[:-1]), dtype=np.intp, count=len(lines) - 1), out=starts[1:])
+    return np.add.reduceat(mask, starts).tolist()
+
+
+def vowel_counts(lines: Sequence[str]) -> List[int]:
+    """Vowel count of every line in ``lines`` (one batch)."""
+    if not lines:
+        return []
+    if NUMPY_AVAILABLE and sum(map(len, lines)) >= VECTOR_MIN_CHARS:
+        return _vowel_counts_vectorized(lines)
+    return [count_vowels(line) for line in lines]
+
+
+def syllable_counts(lines: Sequence[str]) -> List[int]:
+    """``syllable_count`` of every line in ``lines`` (one batch)."""
+    return [max(1, count) for count in vowel_counts(lines)]
+
+
+__all__ = [
+    "NUMPY_AVAILABLE",
+    "VOWELS",
+    "VECTOR_MIN_CHARS",
+    "count_vowels",
+    "syllable_count",
+    "vowel_counts",
+    "syllable_counts",
+]
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore - FP - 2025 - SB - 9fd72e27
+# Hash: 22ae - df91 - bc11 - 6c7e
@@ -21,7 +21,9 @@ This module provides functions for:
 import logging
 import re
 
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple, Optional
+
+from .analysis_context import AnalysisContext, TextOrContext, as_context
 
 log = logging.getLogger(__name__)
 
@@ -53,19 +55,31 @@ ELLIPSIS_RE = re.compile(r"\.{3,}")
 DASH_RE = re.compile(r"[–—-]{2,}")  # цепочки тире / дефисов
 PHRASE_BOUNDARY_RE = re.compile(r"[.!?…]+|\n")
 
+# Весь текст обрабатывается целиком (а не построчно): каждый шаг — одна
+# C - level замена по шаблону; ни один шаблон не пересекает перевод строки
+INVISIBLE_CHARS_RE = re.compile(r"[\u0000-\u0008\u000B\u000C\u000E-\u001F\u200B\u200C\u200D\u2060\uFEFF]")
+_EM_DASH_SPACING_RE = re.compile(r"[^\S\n]*—[^\S\n]*")
+# Табы и кратные пробелы (одиночный пробел не трогаем — замена была бы no-op)
+_SPACE_RUN_RE = re.compile(r"\t[ \t]*| [ \t]+")
+# Пробелы по краям строк; больше двух пустых строк подряд
+_LINE_EDGES_RE = re.compile(r"[^\S\n]*\n[^\S\n]*")
+_BLANK_LINES_RE = re.compile(r"\n{4,}")
 
-def _normalize_typography(line: str) -> str:
-    """Локальная типографика без потери смысла."""
+
+def _typography(text: str) -> str:
     # многоточия
-    line = ELLIPSIS_RE.sub("…", line)
+    text = ELLIPSIS_RE.sub("…", text)
     # длинные цепочки тире -> одно длинное тире
-    line = DASH_RE.sub("—", line)
+    text = DASH_RE.sub("—", text)
     # одиночные дефисы между словами оставляем; тире окружаем пробелами
-    # корректно
-    line = re.sub(r"\s*—\s*", " — ", line)
+    text = _EM_DASH_SPACING_RE.sub(" — ", text)
     # убрать двойные пробелы
-    line = re.sub(r"[ \t]+", " ", line)
-    return line.strip()
+    return _SPACE_RUN_RE.sub(" ", text)
+
+
+def _normalize_typography(line: str) -> str:
+    """Локальная типографика без потери смысла."""
+    return _typography(line).strip()
 
 
 def normalize_text_preserve_symbols(text: str) -> str:
@@ -81,63 +95,40 @@ def normalize_text_preserve_symbols(text: str) -> str:
     text = text.replace("\r\n", "\n").replace("\r", "\n")
 
     # Удаляем управляющие и zero - width
-    text = CTRL_CHARS_RE.sub("", text)
-    text = ZERO_WIDTH_RE.sub("", text)
+    text = INVISIBLE_CHARS_RE.sub("", text)
 
-    # Нормализуем построчно
-    lines = []
-    for raw in text.split("\n"):
-        ln = _normalize_typography(raw)
-        lines.append(ln)
+    # Нормализуем типографику (шаблоны не пересекают перевод строки, поэтому
+    # весь текст сразу равен построчной обработке)
+    text = _typography(text)
 
-    # Схлопываем кратные пустые строки, но сохраняем двойные пустые строки как разделители секций
+    # Обрезаем края строк и схлопываем кратные пустые строки, но сохраняем
+    # двойные пустые строки как разделители секций (не больше 2 подряд)
     # ВАЖНО: двойные пустые строки (2+ подряд) используются для разбиения на
     # секции
-    out_lines: List[str] = []
-    blank_count = 0
-    for ln in lines:
-        if ln == "":
-            blank_count += 1
-            # Сохраняем максимум 2 пустые строки подряд (для разделителей секций)
-            # Если уже есть одна пустая строка, добавляем еще одну для
-            # разделителя
-            if blank_count <= 2:
-                out_lines.append("")
-        else:
-            blank_count = 0
-            out_lines.append(ln)
-
-    return "\n".join(out_lines).strip()
+    text = _LINE_EDGES_RE.sub("\n", text)
+    return _BLANK_LINES_RE.sub("\n\n\n", text).strip()
 
 
-def extract_commands_and_tags(raw_text: str) -> Tuple[str, Dict[str, Any], List[str]]:
+def extract_commands_and_tags(raw_text: TextOrContext) -> Tuple[str, Dict[str, Any], List[str]]:
     """Выделяет команды и сохраняет исходные теги до нормализации."""
+    from .lyrics_lexer import COMMAND, TAG
 
-    if raw_text is None:
-        source = ""
+    if isinstance(raw_text, AnalysisContext):
+        ctx = raw_text
     else:
-        source = str(raw_text)
-    preserved_tags: List[str] = []
-    detected: List[Dict[str, Any]] = []
-    command_pattern = re.compile(
-        r"^(?P < name > [A - Z_]+)\s*:?[\s] * (?P < value>.+)$"
-    )
-    for match in COMMAND_BLOCK_RE.finditer(source):
-        token = match.group(0)
-        preserved_tags.append(token)
-        body = (match.group("body") or "").strip()
-        command_match = command_pattern.match(body)
-        if command_match:
-            command_type = command_match.group("name").lower()
-            command_value = command_match.group("value").strip()
-            detected.append(
-                {
-                    "type": command_type,
-                    "value": command_value,
-                    "raw": token,
-                    "position": match.start(),
-                }
-            )
+        ctx = AnalysisContext("" if raw_text is None else str(raw_text))
+    source = ctx.text
+    # Блоки [...] и команды [NAME: value] — из общего потока токенов
+    preserved_tags: List[str] = [token.text for token in ctx.tokens.of(TAG)]
+    detected: List[Dict[str, Any]] = [
+        {
+            "type": token.name.lower(),
+            "value": token.value,
+            "raw": token.text,
+            "position": token.start,
+        }
+        for token in ctx.tokens.of(COMMAND)
+    ]
     command_map: Dict[str, Any] = {}
     for command in detected:
         ctype = command.get("type")
@@ -153,6 +144,24 @@ def extract_commands_and_tags(raw_text: str) -> Tuple[str, Dict[str, Any], List[
     return clean_text, {"detected": detected, "map": command_map}, unique_tags
 
 
+def _section_content_key(lines: Iterable[str]) -> str:
+    """Ключ сравнения секций: содержимое без пробелов и переводов строк, в нижнем регистре."""
+    return "\n".join(lines).strip().lower().replace(" ", "").replace("\n", "")
+
+
+def _group_sections_by_content(sections: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+    """
+    Группирует секции по нормализованному содержимому (``_section_content_key``).
+
+    Returns:
+        Словарь: {ключ_содержимого: [индексы секций по порядку появления]}
+    """
+    groups: Dict[str, List[int]] = {}
+    for i, sec in enumerate(sections):
+        groups.setdefault(_section_content_key(sec.get("lines", [])), []).append(i)
+    return groups
+
+
 def _detect_duplicate_sections(sections: List[Dict[str, Any]]) -> Dict[int, List[int]]:
     """
     Определяет повторяющиеся секции по их содержимому.
@@ -161,31 +170,45 @@ def _detect_duplicate_sections(sections: List[Dict[str, Any]]) -> Dict[int, List
         Словарь: {индекс_секции: [список_индексов_повторений]}
     """
     duplicates: Dict[int, List[int]] = {}
-    normalized_sections: List[str] = []
+    for key, indices in _group_sections_by_content(sections).items():
+        # Пустые секции повторами не считаются
+        if key and len(indices) > 1:
+            for i in indices:
+                duplicates[i] = [j for j in indices if j != i]
+    return dict(sorted(duplicates.items()))
 
-    # Нормализуем секции для сравнения (убираем пробелы, приводим к нижнему
-    # регистру)
-    for sec in sections:
-        lines = sec.get("lines", [])
-        text = "\n".join(lines).strip()
-        normalized = text.lower().replace(" ", "").replace("\n", "")
-        normalized_sections.append(normalized)
-
-    # Находим повторения
-    for i, norm_text in enumerate(normalized_sections):
-        if not norm_text:  # Пропускаем пустые секции
-            continue
-        matches = [
-            j
-            for j, other_norm in enumerate(normalized_sections)
-            if j != i and other_norm == norm_text and other_norm
-        ]
-        if matches:
-            # Сохраняем только первое вхождение как основное
-            if i not in duplicates:
-                duplicates[i] = matches
 
-    return duplicates
+def _annotate_duplicate_sections(
+    sections: List[Dict[str, Any]], groups: Optional[Dict[str, List[int]]] = None
+) -> None:
+    """
+    Аннотирует повторяющиеся секции как "Chorus 1", "Chorus 2", ...
+    (или "<первое слово тега> N", если первая секция группы — не припев).
+
+    ``groups`` — готовая группировка ``_group_sections_by_content`` (например,
+    из ``SectionTable``); строки секций с тех пор не должны меняться.
+    """
+    if groups is None:
+        groups = _group_sections_by_content(sections)
+    # Нет повторений непустых секций - теги не трогаем
+    if not any(key and len(indices) > 1 for key, indices in groups.items()):
+        return
+
+    # Аннотируем только те группы, где есть повторения (больше 1 секции)
+    for indices in groups.values():
+        if len(indices) > 1:
+            # Определяем базовое имя из первой секции (порядок появления)
+            first_tag = sections[indices[0]].get("tag", "Section")
+            base_name = (
+                "Chorus"
+                if "chorus" in first_tag.lower() or "припев" in first_tag.lower()
+                else first_tag.split()[0]
+                if first_tag.split()
+                else "Section"
+            )
+
+            for idx, sec_idx in enumerate(indices, 1):
+                sections[sec_idx]["tag"] = f"{base_name} {idx}"
 
 
 def _assign_section_names(sections: List[Dict[str, Any]]) -> None:
@@ -356,43 +379,7 @@ def _assign_section_names(sections: List[Dict[str, Any]]) -> None:
 
     # После присвоения всех имен проверяем повторяющиеся секции
     # и аннотируем их как "Chorus 1", "Chorus 2", "Chorus 3" и т.д.
-    duplicates = _detect_duplicate_sections(sections)
-    if not duplicates:
-        return  # Нет повторений - выходим
-
-    # Группируем повторяющиеся секции по их нормализованному содержимому
-    # Ключ: нормализованный текст, значение: список индексов одинаковых секций
-    section_groups: Dict[str, List[int]] = {}
-
-    # Сначала собираем все секции и их нормализованные тексты
-    for i, sec in enumerate(sections):
-        lines = sec.get("lines", [])
-        text = "\n".join(lines).strip()
-        normalized = text.lower().replace(" ", "").replace("\n", "")
-
-        if normalized not in section_groups:
-            section_groups[normalized] = []
-        section_groups[normalized].append(i)
-
-    # Аннотируем только те группы, где есть повторения (больше 1 секции)
-    for normalized, indices in section_groups.items():
-        if len(indices) > 1:  # Есть повторения
-            indices.sort()  # Сортируем по порядку появления
-            # Определяем базовое имя из первой секции (если это Chorus,
-            # используем "Chorus", иначе "Section")
-            first_tag = sections[indices[0]].get("tag", "Section")
-            base_name = (
-                "Chorus"
-                if "chorus" in first_tag.lower() or "припев" in first_tag.lower()
-                else first_tag.split()[0]
-                if first_tag.split()
-                else "Section"
-            )
-
-            for idx, sec_idx in enumerate(indices, 1):
-                # Обновляем тег на "Chorus N" (или "Section N") для всех
-                # повторений
-                sections[sec_idx]["tag"] = f"{base_name} {idx}"
+    _annotate_duplicate_sections(sections)
 
 
 def _parse_section_marker(line: str) -> Optional[str]:
@@ -581,7 +568,18 @@ def _clean_section_lines(sections: List[Dict[str, Any]]) -> None:
         s["lines"] = [line for line in s["lines"] if line.strip()]
 
 
-def extract_sections(text: str) -> List[Dict[str, Any]]:
+def extract_sections(text: TextOrContext) -> List[Dict[str, Any]]:
+    """
+    Делит текст на секции (см. ``_extract_sections``).
+
+    Разбор выполняется один раз на текст: результат берётся из
+    ``AnalysisContext.section_table`` и возвращается как новый список словарей,
+    который вызывающий код может менять.
+    """
+    return as_context(text).section_table.as_dicts()
+
+
+def _extract_sections(ctx: AnalysisContext) -> List[Dict[str, Any]]:
     """
     Делит текст на секции. Поддерживает три типа маркеров:
       1) Квадратные скобки:   [Verse 1 – soft], [Chorus], [Bridge x2]
@@ -593,12 +591,18 @@ def extract_sections(text: str) -> List[Dict[str, Any]]:
     Автоматическое разбиение работает только для монолитного текста (без пустых строк).
 
     Refactored to reduce complexity by extracting logical blocks into separate functions.
+    Маркеры берутся из потока токенов ``lyrics_lexer`` (общего для запроса).
     """
+    from .lyrics_lexer import BLANK, SECTION
+
+    text = ctx.text
+    line_tokens = ctx.tokens.lines
     sections: List[Dict[str, Any]] = []
     current = {"tag": "Body", "lines": []}
 
-    for ln in text.split("\n"):
-        tag = _parse_section_marker(ln)
+    for token in line_tokens:
+        ln = token.text
+        tag = token.value if token.kind == SECTION else None
 
         if tag:
             # Закрыть текущую секцию, если там есть строки
@@ -620,7 +624,7 @@ def extract_sections(text: str) -> List[Dict[str, Any]]:
     # информацию о разделителях
     if not sections or (len(sections) == 1 and sections[0].get("tag") == "Body"):
         # Проверяем, есть ли в тексте пустые строки (структурированный текст)
-        has_empty_lines = any(not line.strip() for line in text.split("\n"))
+        has_empty_lines = any(token.kind == BLANK for token in line_tokens)
 
         # Если текст уже структурирован (есть пустые строки) - разбиваем по ним
         # Если текст монолитный (нет пустых строк) - оставляем как одну секцию
@@ -653,39 +657,7 @@ def extract_sections(text: str) -> List[Dict[str, Any]]:
     # ВАЖНО: Проверяем повторяющиеся секции и аннотируем их, даже если есть пользовательские маркеры
     # Это нужно делать ПОСЛЕ очистки строк, чтобы нормализация работала
     # правильно
-    duplicates = _detect_duplicate_sections(sections)
-    if duplicates:
-        # Группируем повторяющиеся секции по их нормализованному содержимому
-        section_groups: Dict[str, List[int]] = {}
-
-        # Собираем все секции и их нормализованные тексты
-        for i, sec in enumerate(sections):
-            lines = sec.get("lines", [])
-            text_content = "\n".join(lines).strip()
-            normalized = text_content.lower().replace(" ", "").replace("\n", "")
-
-            if normalized not in section_groups:
-                section_groups[normalized] = []
-            section_groups[normalized].append(i)
-
-        # Аннотируем только те группы, где есть повторения (больше 1 секции)
-        for normalized, indices in section_groups.items():
-            if len(indices) > 1:  # Есть повторения
-                indices.sort()  # Сортируем по порядку появления
-                # Определяем базовое имя из первой секции
-                first_tag = sections[indices[0]].get("tag", "Section")
-                base_name = (
-                    "Chorus"
-                    if "chorus" in first_tag.lower() or "припев" in first_tag.lower()
-                    else first_tag.split()[0]
-                    if first_tag.split()
-                    else "Section"
-                )
-
-                for idx, sec_idx in enumerate(indices, 1):
-                    # Обновляем тег на "Chorus N" (или "Section N") для всех
-                    # повторений
-                    sections[sec_idx]["tag"] = f"{base_name} {idx}"
+    _annotate_duplicate_sections(sections)
 
     return sections
 
@@ -727,6 +699,10 @@ def extract_phrases_from_section(section_text: str) -> List[str]:
 # Эта функция была в monolith_v4_3_1.py, но monolith v6 вызывает ее отсюда.
 
 
+_HINT_RE = re.compile(r"\s*\([^\)]+\)")
+_BLANK_LINE_SPLIT_RE = re.compile(r"\n\s*\n")
+
+
 def extract_raw_blocks(text: str) -> List[str]:
     """
     Разделяет текст на блоки по пустой строке,
@@ -737,10 +713,10 @@ def extract_raw_blocks(text: str) -> List[str]:
     # preserved as block content.
 
     # Удаляем ТОЛЬКО hints / commentary in parenthesis () as they are noise.
-    text_no_hints = re.sub(r"\s*\([^\)]+\)", "", text)
+    text_no_hints = _HINT_RE.sub("", text) if "(" in text else text
 
     # Разделяем по пустой строке
-    blocks = re.split(r"\n\s*\n", text_no_hints.strip())
+    blocks = _BLANK_LINE_SPLIT_RE.split(text_no_hints.strip())
 
     # Очищаем блоки от пустых строк и пробелов
     cleaned_blocks = []
@@ -767,6 +743,36 @@ def detect_language(text: str) -> Dict[str, Any]:
     return {"language": language, "confidence": confidence}
 
 
+# Алфавиты для маршрутизации словарей: в отличие от detect_language (какой
+# алфавит преобладает) здесь важно, встречается ли алфавит в тексте вообще
+_SCRIPT_CHAR_RES = {
+    "cyrillic": re.compile("[\u0400-\u052f\u1c80-\u1c8f\u2de0-\u2dff\ua640-\ua69f]"),
+    "latin": re.compile("[A-Za-z\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u024f\u1e00-\u1eff]"),
+}
+OTHER_SCRIPT = "other"
+
+
+def detect_scripts(text: str) -> FrozenSet[str]:
+    """Scripts present in ``text`` ("cyrillic", "latin"); each is one C - level regex search."""
+    return frozenset(script for script, pattern in _SCRIPT_CHAR_RES.items() if pattern.search(text))
+
+
+def stem_script(stem: str) -> str:
+    """Script of a lexicon stem's letters; ``OTHER_SCRIPT`` for mixed / unknown / letterless stems."""
+    scripts = {
+        next((script for script, pattern in _SCRIPT_CHAR_RES.items() if pattern.match(ch)), OTHER_SCRIPT)
+        for ch in stem
+        if ch.isalpha()
+    }
+    return scripts.pop() if len(scripts) == 1 else OTHER_SCRIPT
+
+
+def route_stems(stems: Iterable[str], scripts: FrozenSet[str]) -> List[str]:
+    """Stems that can occur in a text containing only ``scripts`` (order preserved)."""
+    allowed = scripts | {OTHER_SCRIPT}
+    return [stem for stem in stems if stem_script(stem) in allowed]
+
+
 def translate_text_for_analysis(text: str, language: str) -> Tuple[str, bool]:
     """Активированный хук перевода для StudioCore v6 (Multilingual Enablement).
 
@@ -5,10 +5,11 @@
 
 """Public wrapper for the Truth × Love × Pain engine."""
 
-import hashlib
 import math
 from typing import Any, Dict, List, Tuple, Optional
 
+from .analysis_context import TextOrContext, as_context
+from .bounded_cache import get_cache
 from .config import DEFAULT_CONFIG
 
 from studiocore.emotion_profile import EmotionVector
@@ -31,32 +32,29 @@ class TruthLovePainEngine(_TruthLovePainEngine):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Task 8.1: Hash-based cache to prevent re-analyzing the same text multiple times
-        self._cache: Dict[str, Dict[str, Any]] = {}
+        # (общий ограниченный кэш процесса, namespace "tlp")
+        self._cache = get_cache("tlp")
 
-    def analyze(self, text: str) -> Dict[str, Any]:
+    def analyze(self, text: TextOrContext) -> Dict[str, Any]:
         """
         Task 13.1: Override analyze() to add hash-based caching.
         This prevents re-analyzing the same text when analyze() is called directly.
         """
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if text_hash in self._cache:
+        ctx = as_context(text)
+        cached = self._cache.get(ctx.digest)
+        if cached is not None:
             # Return cached result
-            return self._cache[text_hash].copy()
+            return cached.copy()
         
         # Call parent analyze() and cache the result
-        profile = super().analyze(text)
-        self._cache[text_hash] = profile.copy()
+        profile = super().analyze(ctx)
+        self._cache.put(ctx.digest, profile.copy())
         return profile
 
     def describe(self, text: str) -> Dict[str, Any]:
         # Task 8.1: Use hash-based cache to prevent re-analyzing the same text
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if text_hash in self._cache:
-            profile = self._cache[text_hash].copy()
-        else:
-            profile = self.analyze(text)
-            # Cache the result using hash
-            self._cache[text_hash] = profile.copy()
+        # analyze() сам читает и пополняет общий кэш
+        profile = self.analyze(text)
         ordered: List[Tuple[str, float]] = sorted(
             profile.items(), key=lambda item: item[1], reverse=True
         )
@@ -73,37 +71,19 @@ class TruthLovePainEngine(_TruthLovePainEngine):
         # Task 8.1: Accept optional profile argument or use hash-based cache
         if profile is not None:
             return float(profile.get("truth", 0.0))
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if text_hash in self._cache:
-            return float(self._cache[text_hash].get("truth", 0.0))
-        profile = self.analyze(text)
-        # Cache the result using hash
-        self._cache[text_hash] = profile.copy()
-        return float(profile.get("truth", 0.0))
+        return float(self.analyze(text).get("truth", 0.0))
 
     def love_score(self, text: str, profile: Optional[Dict[str, Any]] = None) -> float:
         # Task 8.1: Accept optional profile argument or use hash-based cache
         if profile is not None:
             return float(profile.get("love", 0.0))
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if text_hash in self._cache:
-            return float(self._cache[text_hash].get("love", 0.0))
-        profile = self.analyze(text)
-        # Cache the result using hash
-        self._cache[text_hash] = profile.copy()
-        return float(profile.get("love", 0.0))
+        return float(self.analyze(text).get("love", 0.0))
 
     def pain_score(self, text: str, profile: Optional[Dict[str, Any]] = None) -> float:
         # Task 8.1: Accept optional profile argument or use hash-based cache
         if profile is not None:
             return float(profile.get("pain", 0.0))
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if text_hash in self._cache:
-            return float(self._cache[text_hash].get("pain", 0.0))
-        profile = self.analyze(text)
-        # Cache the result using hash
-        self._cache[text_hash] = profile.copy()
-        return float(profile.get("pain", 0.0))
+        return float(self.analyze(text).get("pain", 0.0))
 
     def tlp_vector(
         self, text: str, emotion_matrix: Dict[str, float]
@@ -177,13 +157,12 @@ class TruthLovePainEngine(_TruthLovePainEngine):
         Calculates dynamic Valence and Arousal based on TLP scores.
         """
         # Task 8.1: Use hash-based cache to prevent re-analyzing the same text
-        text_hash = hashlib.md5(text.encode("utf-8")).hexdigest()
-        if text_hash in self._cache:
-            profile = self._cache[text_hash].copy()
-        else:
-            profile = self.analyze(text)
-            # Cache the result using hash
-            self._cache[text_hash] = profile.copy()
+        # analyze() сам читает и пополняет общий кэш
+        return self.emotion_vector_from(self.analyze(text))
+
+    @staticmethod
+    def emotion_vector_from(profile: Dict[str, Any]) -> EmotionVector:
+        """``export_emotion_vector`` for an already computed TLP profile (no re - analysis)."""
         truth = profile.get("truth", 0.0)
         love = profile.get("love", 0.0)
         pain = profile.get("pain", 0.0)
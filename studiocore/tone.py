@@ -13,8 +13,10 @@ StudioCore v5 — ToneSyncEngine
 Unified color–resonance engine for emotional frequency visualization.
 """
 
-import re
 from typing import Any, Dict
+
+from studiocore.analysis_context import TextOrContext, as_context
+from studiocore.lyrics_lexer import KEY
 from studiocore.color_engine_adapter import (
     EMOTION_COLOR_MAP,
     KEY_COLOR_PALETTE,
@@ -185,7 +187,7 @@ class ToneSyncEngine:
             "signature_id": signature_id,
         }
 
-    def detect_key(self, text: str) -> Dict[str, Any]:
+    def detect_key(self, text: TextOrContext) -> Dict[str, Any]:
         """
         Определяет тональность из текста.
         ВАЖНО: Не использует цвета из лирики, только явные указания тональности.
@@ -194,18 +196,14 @@ class ToneSyncEngine:
         if not text:
             return {"key": "auto", "confidence": 0.0}
 
-        # Ищем только явные музыкальные обозначения тональности
-        # Паттерн: начало строки или пробел, затем нота (C, D, E, F, G, A, B), опционально #, затем пробел или конец
-        # Также ищем в квадратных скобках [C minor], [F# major] и т.д.
-        key_pattern = re.compile(
-            r"(?:^|[\s\[(])([CDEFGAB]#?)\s*(?:minor|major|maj|min|m|M)?(?=[\s\]),.!?]|$)",
-            re.IGNORECASE,
-        )
-
-        matches = key_pattern.findall(text)
+        # Только явные музыкальные обозначения тональности — токены KEY из
+        # lyrics_lexer: нота после пробела / начала текста / "[" / "(",
+        # опционально лад, затем пробел, скобка, знак препинания или конец.
+        # Например: "C", "F# major", "[C minor]", "(Am)"
+        matches = as_context(text).tokens.of(KEY)
         if matches:
             # Берем первую найденную ноту и нормализуем
-            base_note = matches[0].upper()
+            base_note = matches[0].name.upper()
             # Проверяем, что это валидная нота из нашего списка
             if base_note in self.KEY_STEPS or base_note.replace("#", "") in [
                 "C",
@@ -216,17 +214,13 @@ class ToneSyncEngine:
                 "A",
                 "B",
             ]:
-                # Ищем mode (minor / major) рядом с нотой
-                mode_match = re.search(
-                    r"(?:^|[\s\[(])"
-                    + re.escape(base_note)
-                    + r"\s*(minor|major|maj|min|m|M)",
-                    text,
-                    re.IGNORECASE,
+                # Лад — у первого упоминания этой ноты, где он указан
+                mode_text = next(
+                    (token.value.lower() for token in matches if token.value and token.name.upper() == base_note),
+                    "",
                 )
                 mode = ""
-                if mode_match:
-                    mode_text = mode_match.group(1).lower()
+                if mode_text:
                     if mode_text in ("minor", "min", "m"):
                         mode = " minor"
                     elif mode_text in ("major", "maj", "M"):
@@ -16,7 +16,9 @@ v9: Исправлена ошибка 'list' object has no attribute 'get'
 from typing import Dict, Any, List, Tuple, Optional
 
 # v15: Исправлен ImportError (имена классов теперь правильные)
+from .analysis_context import TextOrContext, as_context
 from .emotion import AutoEmotionalAnalyzer, TruthLovePainEngine
+from .engine_registry import get_engine
 import logging
 
 log = logging.getLogger(__name__)
@@ -166,8 +168,9 @@ class VocalProfileRegistry:
         self.map = vocal_map or DEFAULT_VOCAL_MAP
         try:
             # v15: Исправлен ImportError
-            self.emo_analyzer = AutoEmotionalAnalyzer()
-            self.tlp_analyzer = TruthLovePainEngine()
+            # Общие экземпляры из реестра движков (без повторной компиляции словарей)
+            self.emo_analyzer: Optional[AutoEmotionalAnalyzer] = get_engine("emotion.auto")
+            self.tlp_analyzer: Optional[TruthLovePainEngine] = get_engine("tlp")
             log.debug("VocalProfileRegistry успешно инициализировал Emo / TLP движки.")
         except Exception as e:
             log.error(f"VocalProfileRegistry НЕ СМОГ инициализировать Emo / TLP: {e}")
@@ -175,11 +178,11 @@ class VocalProfileRegistry:
             self.tlp_analyzer = None
 
     def _detect_ensemble_hints(
-        self, text: str, sections: List[Dict[str, Any]]
+        self, text: TextOrContext, sections: List[Dict[str, Any]]
     ) -> Dict[str, bool]:
         """Ищет прямые указания на ансамбль (хор, дуэт и т.д.)"""
         log.debug("Вызов функции: _detect_ensemble_hints")
-        s = (text + " " + " ".join(s.get("tag", "") for s in sections)).lower()
+        s = as_context(text).lowered + " " + " ".join(s.get("tag", "") for s in sections).lower()
         hints = {
             "wants_choir": any(
                 k in s for k in ["choir", "хор", "group", "chorus", "anthem"]
@@ -195,7 +198,7 @@ class VocalProfileRegistry:
         return hints
 
     def _auto_form(
-        self, emo: Dict[str, float], tlp: Dict[str, float], text: str
+        self, emo: Dict[str, float], tlp: Dict[str, float], text: TextOrContext
     ) -> str:
         """Автоматически определяет форму (solo / duet/...) на основе плотности и энергии"""
         log.debug("Вызов функции: _auto_form")
@@ -203,7 +206,7 @@ class VocalProfileRegistry:
             log.warning("_auto_form не получил emo / tlp, возврат 'solo'")
             return "solo"
 
-        wc = len(text.split())
+        wc = len(as_context(text).whitespace_tokens)
         cf = tlp.get("conscious_frequency", 0.5)
         energy = (tlp.get("love", 0) + tlp.get("pain", 0) + tlp.get("truth", 0)) / 3
 
@@ -225,14 +228,14 @@ class VocalProfileRegistry:
         )
         return form
 
-    def _mixed_code(self, form: str, preferred_gender: str, text: str) -> str:
+    def _mixed_code(self, form: str, preferred_gender: str, text: TextOrContext) -> str:
         """
         v8: Исправлена логика 'duet_ff'.
         """
         log.debug(
             f"Вызов функции: _mixed_code (Form={form}, PrefGender={preferred_gender})"
         )
-        t = text.lower()
+        t = as_context(text).lowered
         has_f = any(x in t for x in [" she ", "her ", "женщин", "девушк"])
         has_m = any(x in t for x in [" he ", "his ", "мужчин", "парень"])
 
@@ -288,7 +291,7 @@ class VocalProfileRegistry:
         self,
         genre_full: str,
         preferred_gender: str,
-        text: str,
+        text: TextOrContext,
         sections: List[Dict[str, Any]],  # (Устарело, но оставлено для API)
         # v4.3: Приходит из monolith (СПИСОК)
         vocal_profile_tags: List[Dict[str, Any]],
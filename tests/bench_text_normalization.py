@@ -0,0 +1,66 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+"""
+Benchmark: text normalization vs the line-by-line reference.
+
+Запуск: ``python tests/bench_text_normalization.py`` (pytest его не собирает).
+Время на символ должно оставаться постоянным с ростом текста.
+"""
+
+import pathlib
+import random
+import sys
+import time
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+
+from studiocore.text_utils import extract_raw_blocks, normalize_text_preserve_symbols  # noqa: E402
+from test_text_utils import FUZZ_ALPHABET, reference_normalize  # noqa: E402
+
+STANZA = (
+    "[Verse 1]\r\n"
+    "Я помню правду... но любовь -- сильней —  чем боль!\r\n"
+    "(шепотом)  Тише,\tтише\u200b\r\n"
+    "\r\n\r\n\r\n\r\n"
+    "[Chorus]\r\n"
+    "Light in the dark -- we rise...\r\n"
+)
+
+
+def _best(fn, text, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    rng = random.Random(0)
+    fuzz = "".join(rng.choice(FUZZ_ALPHABET) for _ in range(20000))
+    print(f"{'corpus':<10}{'chars':>10}{'reference ms':>15}{'normalize ms':>15}{'ns/char':>10}{'blocks ms':>12}")
+    for name, base, sizes in (("lyrics", STANZA, (1, 10, 100, 1000)), ("fuzz", fuzz, (1, 10))):
+        for copies in sizes:
+            text = base * copies
+            assert normalize_text_preserve_symbols(text) == reference_normalize(text)
+            reference = _best(reference_normalize, text)
+            current = _best(normalize_text_preserve_symbols, text)
+            blocks = _best(extract_raw_blocks, normalize_text_preserve_symbols(text))
+            print(
+                f"{name:<10}{len(text):>10}{reference * 1e3:>15.3f}{current * 1e3:>15.3f}"
+                f"{current * 1e9 / len(text):>10.1f}{blocks * 1e3:>12.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -0,0 +1,65 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import re
+
+from studiocore.analysis_context import AnalysisContext, as_context
+from studiocore.emotion import AutoEmotionalAnalyzer, TruthLovePainEngine
+from studiocore.integrity import IntegrityScanEngine
+from studiocore.rde_engine import RhythmDynamicsEmotionEngine
+from studiocore.rhythm import LyricMeter
+from studiocore.vocals import VocalProfileRegistry
+
+
+TEXT = """[Verse 1]
+Я помню свет, и ты со мной — вдвоем!
+Мы шли сквозь боль... но правда сильнее.
+
+[Chorus]
+We rise together, burning bright!
+  Love is still the fire inside  
+"""
+
+
+def test_context_views_match_plain_string_operations():
+    ctx = AnalysisContext(TEXT)
+    assert ctx.lowered == TEXT.lower()
+    assert list(ctx.nonempty_lines) == [l for l in TEXT.split("\n") if l.strip()]
+    assert list(ctx.stripped_lines) == [l.strip() for l in TEXT.split("\n") if l.strip()]
+    assert list(ctx.words) == re.findall(r"\b\w+\b", TEXT)
+    assert all(TEXT[start:end] == word for (start, end), word in zip(ctx.word_spans, ctx.words))
+    assert list(ctx.whitespace_tokens) == re.findall(r"[^\s]+", TEXT)
+    assert ctx.char_classes["cyrillic"] > 0 and ctx.char_classes["latin"] > 0
+    assert as_context(ctx) is ctx
+
+
+def test_engines_accept_context_with_identical_results():
+    ctx = AnalysisContext(TEXT)
+    tlp = TruthLovePainEngine()
+    emotion = AutoEmotionalAnalyzer()
+    rde = RhythmDynamicsEmotionEngine()
+    assert tlp.analyze(ctx) == tlp.analyze(TEXT)
+    assert emotion.analyze(ctx) == emotion.analyze(TEXT)
+    for method in ("calc_resonance", "calc_fracture", "calc_entropy"):
+        assert getattr(rde, method)(ctx) == getattr(rde, method)(TEXT)
+
+    emotions, tlp_profile = emotion.analyze(TEXT), tlp.analyze(TEXT)
+    integrity = IntegrityScanEngine()
+    assert integrity.analyze(ctx, emotions=emotions, tlp=tlp_profile) == integrity.analyze(
+        TEXT, emotions=emotions, tlp=tlp_profile
+    )
+    vocals = VocalProfileRegistry()
+    assert vocals.get("pop", "auto", ctx, [], [], emotions=emotions, tlp=tlp_profile) == vocals.get(
+        "pop", "auto", TEXT, [], [], emotions=emotions, tlp=tlp_profile
+    )
+    assert LyricMeter().analyze(ctx, emotions=emotions, tlp=tlp_profile) == LyricMeter().analyze(
+        TEXT, emotions=emotions, tlp=tlp_profile
+    )
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -0,0 +1,165 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from studiocore.analysis_graph import AnalysisGraph, AnalysisNode
+from studiocore.parallel_module_executor import ParallelModuleExecutor
+
+
+class _SmallPoolExecutor(ParallelModuleExecutor):
+    """Executor над собственным маленьким пулом: очередь узлов предсказуема."""
+
+    def __init__(self, pool):
+        super().__init__(timeout=5.0)
+        self.pool = pool
+
+    def _thread_pool(self):
+        return self.pool
+
+
+def test_node_starts_when_its_own_inputs_are_ready():
+    release_slow = threading.Event()
+
+    def slow(raw):
+        assert release_slow.wait(2.0)
+        return "slow"
+
+    def integrity(tlp):
+        # Стартует до завершения slow: иначе slow никогда не отпустят.
+        release_slow.set()
+        return f"integrity:{tlp}"
+
+    graph = AnalysisGraph(
+        [
+            AnalysisNode("slow", slow, ("raw",)),
+            AnalysisNode("tlp", str.upper, ("raw",)),
+            AnalysisNode("integrity", integrity, ("tlp",)),
+        ],
+        seeds=("raw",),
+    )
+    run = graph.run({"raw": "text"}, ParallelModuleExecutor(timeout=5.0))
+    assert run.outputs == {"slow": "slow", "tlp": "TEXT", "integrity": "integrity:TEXT"}
+    assert set(run.timings_ms) == {"slow", "tlp", "integrity"}
+
+
+def test_skipped_and_failed_nodes_use_defaults():
+    def broken(raw):
+        raise RuntimeError("boom")
+
+    graph = AnalysisGraph(
+        [
+            AnalysisNode("optional", len, ("raw",), default=-1, skip_if=lambda raw: not raw),
+            AnalysisNode("broken", broken, ("raw",), default={}),
+            AnalysisNode("after", lambda value: value, ("broken",)),
+        ],
+        seeds=("raw",),
+    )
+    run = graph.run({"raw": ""})
+    assert run.outputs == {"optional": -1, "broken": {}, "after": {}}
+    assert run.skipped == ["optional"]
+    assert run.failed == ["broken"]
+
+
+def test_required_node_failure_propagates():
+    def broken(raw):
+        raise RuntimeError("rhythm failed")
+
+    graph = AnalysisGraph([AnalysisNode("rhythm", broken, ("raw",), required=True)], seeds=("raw",))
+    with pytest.raises(RuntimeError):
+        graph.run({"raw": "x"}, ParallelModuleExecutor())
+
+
+def test_required_failure_cancels_queued_nodes():
+    release = threading.Event()
+    ran = []
+
+    def blocker(raw):
+        release.wait(2.0)
+        return "blocker"
+
+    def broken(raw):
+        raise RuntimeError("rhythm failed")
+
+    graph = AnalysisGraph(
+        [
+            AnalysisNode("blocker", blocker, ("raw",)),
+            AnalysisNode("rhythm", broken, ("raw",), required=True),
+            AnalysisNode("queued", ran.append, ("raw",)),
+        ],
+        seeds=("raw",),
+    )
+    pool = ThreadPoolExecutor(max_workers=2)
+    executor = _SmallPoolExecutor(pool)
+    cancelled = executor.stats()["cancelled"]
+    with pytest.raises(RuntimeError):
+        graph.run({"raw": "x"}, executor)
+    release.set()
+    pool.shutdown(wait=True)
+    assert ran == []
+    assert executor.stats()["cancelled"] == cancelled + 1
+
+
+def test_node_timeout_starts_when_the_node_runs():
+    def first(raw):
+        time.sleep(0.3)
+        return "first"
+
+    graph = AnalysisGraph(
+        [
+            AnalysisNode("first", first, ("raw",)),
+            # В очереди за first дольше собственного таймаута
+            AnalysisNode("second", str.upper, ("raw",), timeout=0.2, required=True),
+        ],
+        seeds=("raw",),
+    )
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        run = graph.run({"raw": "x"}, _SmallPoolExecutor(pool))
+    finally:
+        pool.shutdown(wait=True)
+    assert run.outputs == {"first": "first", "second": "X"}
+    assert run.failed == []
+
+
+def test_node_timing_excludes_queue_wait():
+    def first(raw):
+        time.sleep(0.3)
+        return "first"
+
+    def second(raw):
+        time.sleep(0.02)
+        return "second"
+
+    graph = AnalysisGraph(
+        [AnalysisNode("first", first, ("raw",)), AnalysisNode("second", second, ("raw",))],
+        seeds=("raw",),
+    )
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        run = graph.run({"raw": "x"}, _SmallPoolExecutor(pool))
+    finally:
+        pool.shutdown(wait=True)
+    assert run.outputs == {"first": "first", "second": "second"}
+    assert run.timings_ms["first"] >= 290
+    # second ждал first в очереди ~300 мс, но в его время входит только выполнение
+    assert 15 <= run.timings_ms["second"] < 150
+
+
+def test_graph_rejects_cycles_and_unknown_inputs():
+    with pytest.raises(ValueError):
+        AnalysisGraph([AnalysisNode("a", len, ("b",)), AnalysisNode("b", len, ("a",))])
+    with pytest.raises(ValueError):
+        AnalysisGraph([AnalysisNode("a", len, ("missing",))], seeds=("raw",))
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
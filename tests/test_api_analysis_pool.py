@@ -0,0 +1,86 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")  # fastapi.testclient
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import api  # noqa: E402
+
+
+@pytest.fixture
+def blocked_core(monkeypatch):
+    """core.analyze, который висит до release; свой пул анализа на каждый тест."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def analyze(**kwargs):
+        started.set()
+        release.wait(5.0)
+        return {"ok": True}
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(api, "ANALYSIS_BACKEND", "thread")
+    monkeypatch.setattr(api, "_analysis_pool", pool)
+    monkeypatch.setattr(api.core, "analyze", analyze)
+    yield started, release
+    release.set()
+    pool.shutdown(wait=True)
+
+
+def test_health_answers_while_analysis_is_blocked(blocked_core):
+    started, release = blocked_core
+    responses = []
+    with TestClient(api.app) as client:
+        worker = threading.Thread(
+            target=lambda: responses.append(client.post("/analyze", json={"text": "тихий текст"}))
+        )
+        worker.start()
+        assert started.wait(5.0)
+        health = client.get("/health")
+        assert health.status_code == 200
+        assert health.json()["status"] == "ok"
+        # /health ответил, пока анализ в том же event loop ещё висит
+        assert worker.is_alive()
+        release.set()
+        worker.join(5.0)
+    assert responses[0].status_code == 200
+
+
+def test_timeout_covers_slot_wait_and_analysis(blocked_core, monkeypatch):
+    started, release = blocked_core
+    monkeypatch.setattr(api, "ANALYSIS_TIMEOUT", 0.2)
+    monkeypatch.setattr(api, "_analysis_slots", asyncio.Semaphore(1))
+    with TestClient(api.app) as client:
+        first = client.post("/analyze", json={"text": "первый"})
+        assert first.status_code == 504
+        # Анализ первого запроса всё ещё занимает единственный слот
+        second = client.post("/analyze", json={"text": "второй"})
+        assert second.status_code == 503
+        release.set()
+
+
+def test_stream_gives_up_when_no_slot_frees(blocked_core, monkeypatch):
+    monkeypatch.setattr(api, "ANALYSIS_BATCH_TIMEOUT", 0.2)
+    monkeypatch.setattr(api, "_analysis_slots", asyncio.Semaphore(0))
+    with TestClient(api.app) as client:
+        response = client.post("/analyze/batch", json={"texts": ["один", "два"], "stream": True})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["index"], line["ok"]) for line in lines] == [(0, False), (1, False)]
+    assert "no slot" in lines[0]["error"]
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
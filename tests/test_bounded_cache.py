@@ -0,0 +1,85 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import time
+
+import pytest
+
+from studiocore.bounded_cache import BoundedCache, cache_stats, get_cache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = BoundedCache("test.lru", capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lfu_evicts_least_frequently_used():
+    cache = BoundedCache("test.lfu", capacity=2, policy="lfu")
+    cache.put("a", 1)
+    cache.put("b", 2)
+    for _ in range(3):
+        cache.get("b")
+    cache.get("a")
+    cache.put("c", 3)
+    assert "a" not in cache
+    assert "b" in cache and "c" in cache
+
+
+def test_ttl_expiry_and_stats():
+    cache = BoundedCache("test.ttl", ttl_seconds=0.01)
+    cache.put("k", "v")
+    assert cache.get("k") == "v"
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["expirations"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_max_bytes_limits_entries():
+    cache = BoundedCache("test.bytes", capacity=100, max_bytes=10, size_of=len)
+    assert cache.put("a", "xxxx")
+    assert cache.put("b", "yyyy")
+    assert cache.put("c", "zzzz")
+    assert len(cache) == 2 and "a" not in cache
+    assert not cache.put("big", "x" * 11)
+    assert cache.memory_estimate() <= 10
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        BoundedCache("test.bad", policy="fifo")
+
+
+def test_registry_returns_shared_instance():
+    cache = get_cache("test.registry", capacity=3)
+    assert get_cache("test.registry") is cache
+    assert cache.capacity == 3
+    assert "test.registry" in cache_stats()
+
+
+def test_tlp_engines_share_bounded_cache():
+    from studiocore.tlp_engine import TruthLovePainEngine
+
+    text = "Я помню свет и боль, но всё равно люблю"
+    first = TruthLovePainEngine()
+    second = TruthLovePainEngine()
+    assert first._cache is second._cache is get_cache("tlp")
+    profile = first.analyze(text)
+    hits = first._cache.hits
+    assert second.analyze(text) == profile
+    assert first._cache.hits == hits + 1
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
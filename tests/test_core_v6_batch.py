@@ -0,0 +1,81 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import threading
+import time
+
+from studiocore.core_v6 import StudioCoreV6
+
+
+class _RecordingCore(StudioCoreV6):
+    """StudioCoreV6 with a lightweight analyze() to exercise batching only."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def analyze(self, text, preferred_gender="auto", version=None, semantic_hints=None):
+        with self._lock:
+            self.calls.append(text)
+        if text == "boom":
+            raise RuntimeError("engine failure")
+        if text == "bad":
+            return {"ok": False, "error": "rejected"}
+        # Первый элемент самый медленный — проверяем порядок выдачи
+        time.sleep(0.05 if text == "slow" else 0.0)
+        return {"text": text, "gender": preferred_gender}
+
+
+def test_analyze_many_keeps_input_order_and_isolates_errors():
+    core = _RecordingCore()
+    items = list(core.analyze_many(["slow", "boom", "fast", "bad"], preferred_gender="female"))
+    assert [item["index"] for item in items] == [0, 1, 2, 3]
+    assert items[0] == {"index": 0, "ok": True, "result": {"text": "slow", "gender": "female"}}
+    assert items[1]["ok"] is False and "engine failure" in items[1]["error"]
+    assert items[2]["ok"] is True and items[2]["result"]["text"] == "fast"
+    assert items[3] == {"index": 3, "ok": False, "error": "rejected"}
+
+
+def test_analyze_many_as_completed_and_deduplicates():
+    core = _RecordingCore()
+    items = list(core.analyze_many(["slow", "same", "same", "other"], ordered=False))
+    assert sorted(item["index"] for item in items) == [0, 1, 2, 3]
+    assert items[-1]["index"] == 0  # медленный элемент приходит последним
+    assert sorted(core.calls) == ["other", "same", "slow"]
+    results = {item["index"]: item["result"] for item in items}
+    assert results[1] == results[2] and results[1] is not results[2]
+
+
+def test_analyze_many_runs_on_bounded_batch_pool():
+    from studiocore.parallel_module_executor import executor_settings, in_worker_thread
+
+    class _PoolCore(_RecordingCore):
+        def __init__(self):
+            super().__init__()
+            self.running = self.peak = 0
+            self.threads = set()
+
+        def analyze(self, text, **kwargs):
+            with self._lock:
+                self.running += 1
+                self.peak = max(self.peak, self.running)
+                # Элемент батча не занимает поток пула модулей
+                self.threads.add((threading.current_thread().name.split("_")[0], in_worker_thread()))
+            time.sleep(0.02)
+            with self._lock:
+                self.running -= 1
+            return {"text": text}
+
+    core = _PoolCore()
+    items = list(core.analyze_many([f"text {i}" for i in range(8)]))
+    assert [item["result"]["text"] for item in items] == [f"text {i}" for i in range(8)]
+    assert core.threads == {("studiocore-batch", False)}
+    assert 1 <= core.peak <= executor_settings()["batch_workers"]
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -0,0 +1,38 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import pytest
+
+from studiocore.dynamic_emotion_engine import DynamicEmotionEngine
+from studiocore.engine_registry import get_engine
+
+TEXTS = [
+    "I hate you, rage and anger burn, fury!",
+    "Я люблю тебя, нежность и свет, но боль не уходит.",
+    "Тело, мягкий шелк, touch, embrace, soft body...",
+    "",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_profile_from_payloads_matches_text_path(text):
+    engine = DynamicEmotionEngine()
+    emotions = get_engine("emotion.auto").analyze(text)
+    tlp = get_engine("tlp").analyze(text)
+    snapshot = dict(emotions)
+    assert engine.emotion_profile_from(emotions, tlp) == engine.emotion_profile(text)
+    assert emotions == snapshot  # фильтры не трогают результат Phase 1
+
+
+def test_profile_from_empty_payloads_is_neutral():
+    profile = DynamicEmotionEngine().emotion_profile_from(None, None)
+    assert set(profile) == set(DynamicEmotionEngine.AXES)
+    assert len(set(profile.values())) == 1
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -4,8 +4,9 @@
 # Hash: 22ae-df91-bc11-6c7e
 
 import math
+import random
 
-from studiocore.emotion_genre_matrix import compute_genre_bias
+from studiocore.emotion_genre_matrix import _genre_bias_rules, compute_genre_bias, compute_genre_bias_batch
 
 
 def test_compute_genre_bias_neutral_vector():
@@ -24,6 +25,28 @@ def test_compute_genre_bias_variant_a_rules():
     assert all(0.0 <= val <= 1.0 for val in bias.values())
 
 
+def test_compute_genre_bias_threshold_boosts():
+    damped = {"sadness": 1.0, "pain": 1.0, "anger": 1.0}
+    at_threshold = compute_genre_bias(dict(damped, joy=0.5))
+    above = compute_genre_bias(dict(damped, joy=1.0))
+    assert math.isclose(at_threshold["pop"], round(1.0 + 0.30 - 0.28 - 0.50 - 0.35, 3))
+    assert math.isclose(above["pop"], round(1.0 + 0.60 - 0.28 - 0.50 - 0.35 + 0.15 * 0.5, 3))
+
+
+def test_compute_genre_bias_batch_matches_rule_loop():
+    rng = random.Random(13)
+    axes = ("anger", "sadness", "awe", "joy", "pain", "love")
+    vectors = [{axis: rng.random() for axis in axes if rng.random() < 0.8} for _ in range(500)]
+    vectors += [{}, None, {"joy": 0.5, "love": 0.75}]
+    batch = compute_genre_bias_batch(vectors)
+    assert compute_genre_bias_batch([]) == []
+    for vector, bias in zip(vectors, batch):
+        expected = _genre_bias_rules(vector)
+        assert compute_genre_bias(vector) == bias
+        assert list(bias) == list(expected)
+        assert all(math.isclose(bias[g], expected[g], abs_tol=1e-3) for g in expected)
+
+
 # StudioCore Signature Block (Do Not Remove)
 # Author: Сергей Бауэр (@Sbauermaner)
 # Fingerprint: StudioCore-FP-2025-SB-9fd72e27
@@ -0,0 +1,65 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import pytest
+
+from studiocore.emotion_dictionary_extended import EmotionLexiconExtended
+
+TEXTS = [
+    "Я люблю тебя, нежность и свет, но ярость и страх — буря, огонь, кровь!!!",
+    "Эй, чувак, ну да, ага... тихо, шёпот, мягкий лёгкий шёпот.",
+    "Уважаемый господин, о мой владыка, внемли: торжественно, в тишине и покое.",
+    "Не покорюсь! Бунт, революция — взрывно и критично, шторм и порыв, дрожь.",
+    "Soft light, quiet breath, no Cyrillic at all!",
+    "",
+]
+
+
+def _reference(lex, text):
+    """Прежняя логика: отдельный ``any(word in text)`` на каждую группу."""
+    lowered = text.lower()
+
+    def first(family):
+        for key, words in family.items():
+            if any(word in lowered for word in words):
+                return key
+        return "neutral"
+
+    hits = {level: sum(lowered.count(w) for w in words) for level, words in lex.intensity_markers.items()}
+    base = hits["high"] * 0.3 + hits["medium"] * 0.15 + hits["low"] * 0.05
+    bonus = min(lowered.count("!") / 5, 1.0) * 0.2
+    return {
+        "emotions": {k: any(w in lowered for w in ws) for k, ws in lex.emotion_words.items()},
+        "register": first(lex.speech_registers),
+        "tone": first(lex.tone_markers),
+        "drama_level": first(lex.drama_levels),
+        "intensity": round(min(1.0, base + bonus), 3),
+    }
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_single_pass_matches_per_family_checks(text):
+    lex = EmotionLexiconExtended()
+    assert lex.get_emotion(text) == _reference(lex, text)
+
+
+def test_priority_order_and_rebuilt_index():
+    lex = EmotionLexiconExtended()
+    # Оба регистра присутствуют: побеждает первый по порядку ключей
+    assert lex.get_emotion("Ага, уважаемый")["register"] == "formal"
+    # Слово в двух семействах засчитывается обоим
+    result = lex.get_emotion("тишина")
+    assert result["emotions"]["calm"] and result["tone"] == "meditative"
+
+    lex.intensity_markers["high"].append("буря")  # повтор удваивает вклад
+    lex._build_index()
+    assert lex.get_emotion("буря") == _reference(lex, "буря")
+    assert lex._estimate_intensity("буря") == 0.6
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -3,7 +3,11 @@
 # Fingerprint: StudioCore-FP-2025-SB-9fd72e27
 # Hash: 22ae-df91-bc11-6c7e
 
-from studiocore.emotion import EmotionEngine, load_emotion_model
+import re
+
+import pytest
+
+from studiocore.emotion import EmotionEngine, load_emotion_model, load_emotion_model_index
 
 
 def test_emotion_model_loads_clusters():
@@ -56,6 +60,72 @@ def test_integration_aggression_and_love():
     assert str(love_profile.get("key", {}).get("scale", "")).startswith("major")
 
 
+def test_model_index_matches_per_emotion_scan():
+    engine = EmotionEngine()
+    index = load_emotion_model_index()
+    assert index is load_emotion_model_index()
+    assert list(index.emotions) == engine._base_emotions
+    text = "cosmic wonder and sacred fear; joy, joy and more joyful love — Я люблю"
+    lowered = text.lower()
+    expected = [len(re.findall(re.escape(e.replace("_", " ")), lowered)) for e in index.emotions]
+    assert index.token_hits(lowered) == expected
+    assert [index.emotions[i] for i in index.bucket_targets("fear")] == [
+        e for e in index.emotions if "fear" in e
+    ]
+
+
+def test_matrix_scoring_matches_dict_path():
+    engine = EmotionEngine()
+    texts = [
+        "I hate this rage, fury and anger",
+        "Я люблю тебя, нежность и надежда",
+        "cosmic wonder, awe and sacred fear",
+        "",
+    ]
+    raws = [engine.build_raw_emotion_vector(text) for text in texts]
+    batch = engine.compute_genre_scores_batch(raws)
+    projections = engine.project_to_clusters_many(raws)
+    assert engine.compute_genre_scores_batch([]) == []
+    assert engine.project_to_clusters_many([]) == []
+    for raw, scores, clusters in zip(raws, batch, projections):
+        expected_clusters = engine._project_to_clusters_dict(raw)
+        assert engine.project_to_clusters(raw) == clusters
+        assert list(clusters) == list(expected_clusters)
+        # BLAS суммирует в другом порядке: на границе round(x, 3) возможен сдвиг на 0.001
+        assert all(abs(clusters[name] - expected_clusters[name]) <= 0.001 + 1e-9 for name in expected_clusters)
+
+        expected_scores = engine._genre_scores_dict(expected_clusters)
+        assert engine.compute_genre_scores(clusters) == scores
+        assert list(scores) == list(expected_scores)
+        assert all(abs(scores[genre] - expected_scores[genre]) <= 0.01 for genre in expected_scores)
+
+        model_clusters = engine._model["clusters"]
+        expected_delta = sum(value * float(model_clusters[name].get("bpm_delta", 0.0)) for name, value in clusters.items())
+        assert engine._bpm_delta(clusters) == pytest.approx(expected_delta)
+
+
+def test_profile_reuses_precomputed_auto_scores():
+    engine = EmotionEngine()
+    text = "Я помню свет в окне, и боль уходит прочь. Hope and love!"
+    auto_scores = engine.auto_analyzer.analyze(text)
+    assert engine.build_emotion_profile(text, auto_scores=auto_scores) == engine.build_emotion_profile(text)
+
+
+def test_model_matrices_follow_cluster_model():
+    np = pytest.importorskip("numpy")
+    index = load_emotion_model_index()
+    model = load_emotion_model()["clusters"]
+    assert index.membership.shape == (len(index.emotions), len(index.clusters))
+    assert index.genre_bias.shape == (len(index.clusters), len(index.genres))
+    for c, (name, cluster) in enumerate(model.items()):
+        assert index.clusters[c] == name
+        members = [index.emotions[e] for e in np.flatnonzero(index.membership[:, c])]
+        assert sorted(members) == sorted(set(cluster["emotions"]))
+        assert index.bpm_delta[c] == float(cluster.get("bpm_delta", 0.0))
+    onehot = np.eye(len(index.clusters))
+    assert list(index.bpm_deltas(onehot)) == list(index.bpm_delta)
+
+
 # StudioCore Signature Block (Do Not Remove)
 # Author: Сергей Бауэр (@Sbauermaner)
 # Fingerprint: StudioCore-FP-2025-SB-9fd72e27
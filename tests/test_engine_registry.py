@@ -0,0 +1,51 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import pytest
+
+from studiocore import engine_registry
+from studiocore.engine_registry import get_engine, register_engine, registered_engines
+
+
+def test_sub_engines_share_registry_instances():
+    from studiocore.emotion import EmotionEngine
+    from studiocore.rde_engine import RhythmDynamicsEmotionEngine
+    from studiocore.vocals import VocalProfileRegistry
+
+    tlp = get_engine("tlp")
+    vocals = VocalProfileRegistry()
+    assert vocals.tlp_analyzer is tlp
+    assert vocals.emo_analyzer is get_engine("emotion.auto")
+    assert RhythmDynamicsEmotionEngine()._tlp_engine is tlp
+
+    # EmotionEngine хранит _phrase_packets — сам не общий, но под-движки общие
+    first, second = EmotionEngine(), EmotionEngine()
+    assert first is not second
+    assert first.tlp_engine is second.tlp_engine is tlp
+    assert first.lexicon is second.lexicon
+
+
+def test_register_and_unknown_engines(monkeypatch):
+    # Реестр общий на процесс — регистрируем в копиях, monkeypatch вернёт оригиналы
+    monkeypatch.setattr(engine_registry, "_FACTORIES", dict(engine_registry._FACTORIES))
+    monkeypatch.setattr(engine_registry, "_INSTANCES", dict(engine_registry._INSTANCES))
+    register_engine("test.engine", object)
+    assert "test.engine" in registered_engines()
+    assert get_engine("test.engine") is get_engine("test.engine")
+    with pytest.raises(ValueError):
+        register_engine("test.engine", object)
+    with pytest.raises(KeyError):
+        get_engine("test.missing")
+
+
+def test_registered_test_engine_does_not_leak():
+    # Запускается после test_register_and_unknown_engines
+    assert "test.engine" not in registered_engines()
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -0,0 +1,89 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import random
+
+import pytest
+
+from studiocore.emotion import AutoEmotionalAnalyzer, TruthLovePainEngine, lexicon_fields
+from studiocore.engine_registry import get_engine
+from studiocore.lexicon_matcher import LexiconMatcher, field_pattern
+
+LYRICS = [
+    "Я помню правду, но любовь сильней, чем боль и страх.\nЯ сам иду домой.",
+    "I remember the truth, I feel my heart — love and pain, I know.",
+    "Тоска и слёзы, одиночество в ночи; я сама не знаю, где свет.",
+    "RAGE! Fire in the BLOOD, ANGER and FEAR, i'm BROKEN... HOPE shines bright.",
+    "Солнце, смех и радость — мы вместе, счастье на двоих, улыбка в окне.",
+    "ſorrow, ᲀера и Любовь: IGNORECASE-эквивалентности не должны теряться.",
+    "",
+]
+
+
+def _reference_counts(text):
+    return {field: len(field_pattern(stems).findall(text)) for field, stems in lexicon_fields().items()}
+
+
+@pytest.mark.parametrize("text", LYRICS)
+def test_counts_match_regex_findall_on_lyrics(text):
+    matcher = get_engine("lexicon.matcher")
+    for variant in (text, text.lower(), text.upper()):
+        assert matcher.count(variant) == _reference_counts(variant)
+
+
+def test_leftmost_first_alternative_semantics():
+    lexicon = {"a": ["he", "she", "hers", "h"], "b": ["я ", "я сам", "s"]}
+    matcher = LexiconMatcher(lexicon)
+    rng = random.Random(7)
+    alphabet = "hersя смſSHİ"
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 24)))
+        spans = matcher.spans(text)
+        for field, stems in lexicon.items():
+            assert spans[field] == [m.span() for m in field_pattern(stems).finditer(text)]
+
+
+def test_engines_share_one_automaton():
+    tlp = TruthLovePainEngine()
+    emo = AutoEmotionalAnalyzer()
+    assert tlp._matcher is emo._matcher is get_engine("lexicon.matcher")
+    profile = tlp.analyze(LYRICS[0])
+    assert profile["truth"] > 0 and profile["love"] > 0 and profile["pain"] > 0
+
+
+def test_non_literal_stems_rejected():
+    with pytest.raises(ValueError):
+        LexiconMatcher({"bad": ["a|b"]})
+
+
+
+def test_count_segments_matches_per_segment_counts():
+    matcher = get_engine("lexicon.matcher")
+    segments = [text.lower() for text in LYRICS] + ["я", " сам", "боль\nболь"]
+    assert matcher.count_segments(segments) == [matcher.count(s) for s in segments]
+    assert matcher.count_segments(segments[:1]) == [matcher.count(segments[0])]
+    # Разделитель из символов словаря: откат на отдельные проходы
+    spaced = LexiconMatcher({"a": ["я сам"]})
+    assert spaced.count_segments(["я", "сам"], separator=" ") == [{"a": 0}, {"a": 0}]
+    with pytest.raises(ValueError):
+        matcher.count_segments(segments, separator="")
+
+
+
+def test_scan_is_skipped_for_absent_scripts(monkeypatch):
+    matcher = LexiconMatcher({"en": ["soft", "kill"], "ru": ["тиш", "боль"]})
+    assert matcher.scripts == {"latin", "cyrillic"}
+    # Эквивалентности IGNORECASE сворачиваются до проверки алфавита
+    assert matcher.count("ſoft \u212aill") == {"en": 2, "ru": 0}
+
+    english = LexiconMatcher({"en": ["cosmic wonder"]}, ignore_case=False, escaped=True)
+    monkeypatch.setattr(english, "_occurrences", lambda folded: pytest.fail("scanned"))
+    assert english.count("космическое чудо, 42!") == {"en": 0}
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -0,0 +1,76 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import pytest
+
+from studiocore import lexicon_snapshot as snapshot
+from studiocore.emotion import (
+    EmotionModelIndex,
+    emotion_index_buckets,
+    lexicon_fields,
+    load_emotion_model,
+)
+from studiocore.lexicon_matcher import LexiconMatcher
+
+TEXTS = [
+    "Я помню правду, но любовь сильней, чем боль и страх.\nЯ сам иду домой.",
+    "RAGE! Fire in the BLOOD, ſorrow and ᲀера, cosmic wonder and joy...",
+    "",
+]
+
+
+@pytest.fixture
+def snapshot_file(tmp_path):
+    path = str(tmp_path / "lexicon_snapshot.json")
+    snapshot.build_snapshot(path)
+    yield path
+    snapshot.reset_snapshot()
+
+
+def test_restored_tables_match_fresh_build(snapshot_file):
+    fields = lexicon_fields()
+    fresh = LexiconMatcher(fields)
+    restored = snapshot.matcher_from_snapshot("lexicon.matcher", fields, path=snapshot_file)
+    assert restored.scripts == fresh.scripts
+    for text in TEXTS:
+        assert restored.spans(text) == fresh.spans(text)
+
+    model = load_emotion_model()
+    buckets = emotion_index_buckets()
+    state = snapshot.snapshot_entry("emotion.model_index", snapshot.source_digest(model, buckets), snapshot_file)
+    index = EmotionModelIndex.from_state(state, model)
+    reference = EmotionModelIndex.from_model(model, buckets)
+    assert (index.emotions, index.clusters, index.genres) == (reference.emotions, reference.clusters, reference.genres)
+    for text in TEXTS:
+        assert index.token_hits(text.lower()) == reference.token_hits(text.lower())
+
+
+def test_stale_or_corrupt_snapshot_falls_back(snapshot_file, monkeypatch):
+    # Другие словари → запись устарела, автомат строится заново
+    lexicon = {"a": ["любовь"]}
+    monkeypatch.setattr(LexiconMatcher, "from_state", classmethod(lambda cls, state: pytest.fail("restored")))
+    assert snapshot.matcher_from_snapshot("lexicon.matcher", lexicon, path=snapshot_file).count("любовь") == {"a": 1}
+    monkeypatch.undo()
+
+    with open(snapshot_file, "r+b") as fp:
+        fp.seek(-3, 2)
+        fp.write(b"]]}")
+    snapshot.reset_snapshot()
+    assert snapshot.load_snapshot(snapshot_file) == {}
+    assert snapshot.load_snapshot(snapshot_file + ".missing") == {}
+
+
+def test_snapshot_can_be_disabled(monkeypatch):
+    monkeypatch.setenv(snapshot.SNAPSHOT_ENV, "off")
+    assert snapshot.snapshot_path() is None
+    assert snapshot.load_snapshot() == {}
+    monkeypatch.delenv(snapshot.SNAPSHOT_ENV)
+    assert snapshot.snapshot_path() == snapshot.DEFAULT_SNAPSHOT_PATH
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
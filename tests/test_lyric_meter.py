@@ -0,0 +1,89 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+from studiocore.analysis_context import AnalysisContext
+from studiocore.bounded_cache import clear_caches
+from studiocore.rhythm import LyricMeter
+
+LYRICS = """[Verse 1]
+Я помню правду... но любовь — сильней, чем боль!
+  Тише, тише; шёпот: / вдох
+
+[Chorus]
+Light in the dark - we rise… we rise?!
+Light in the dark - we rise… we rise?!
+
+[Chorus]
+Light in the dark - we rise… we rise?!
+"""
+
+
+def test_line_table_matches_per_line_helpers():
+    meter = LyricMeter()
+    table = meter.line_table(AnalysisContext(LYRICS))
+    lines = [line.strip() for line in LYRICS.split("\n") if line.strip()]
+    assert list(table.lines) == lines
+    for line, row in zip(table.lines, table.rows):
+        assert row.syllables == meter._syllables(line)
+        assert row.energy == meter._punct_energy(line)
+        assert row.words == max(1, len(line.split()))
+        assert row.dashes == line.count("—") + line.count("-")
+    # Энергия таблицы — та же сумма в том же порядке, что и по всему тексту
+    assert table.energy == meter._punct_energy(LYRICS)
+    assert meter.line_table(LYRICS).rows == table.rows
+    assert not meter.line_table("  \n\n")
+
+
+def test_sections_share_rows_and_match_text_helpers():
+    meter = LyricMeter()
+    memo = {}
+    whole = meter.line_table(LYRICS, memo)
+    chorus = meter.line_table("Light in the dark - we rise… we rise?!\n" * 2, memo)
+    assert chorus.rows[0] is chorus.rows[1] is whole.rows[-1]
+
+    analysis = meter.analyze(LYRICS, emotions={"joy": 0.4, "sadness": 0.1}, cf=0.6)
+    density = meter._density_bpm(LYRICS, emotions={"joy": 0.4, "sadness": 0.1}, cf=0.6)
+    assert analysis["density_bpm"] == density
+    for section in analysis["sections"].values():
+        assert section["line_count"] == len(section["phrase_pattern"])
+    body = "Я помню правду... но любовь — сильней, чем боль!\n  Тише, тише; шёпот: / вдох"
+    section = analysis["sections"][analysis["section_order"][0]]
+    expected_bpm = meter._blend_section_bpm(
+        meter._density_bpm(body, emotion_weight=0.0), meter._heuristic_section_bpm(body), density
+    )
+    assert section["mean_bpm"] == expected_bpm
+    assert section["micro_curve"] == meter._build_micro_curve(body, expected_bpm)
+    assert section["phrase_pattern"] == meter._phrase_pattern(body)
+
+
+def test_edit_recomputes_only_the_changed_section(monkeypatch):
+    clear_caches()
+    meter = LyricMeter()
+    meter.analyze(LYRICS, emotions={"joy": 0.4})
+
+    parsed = []
+    original = meter._line_stats
+    monkeypatch.setattr(meter, "_line_stats", lambda line, *args: parsed.append(line) or original(line, *args))
+    edited = LYRICS.replace("шёпот: / вдох", "шёпот: / выдох")
+    result = meter.analyze(edited, emotions={"joy": 0.4})
+    # Заново разобран только изменённый куплет (и строки-теги общей таблицы);
+    # строки припевов взяты из кэша секций
+    assert parsed == [
+        "Я помню правду... но любовь — сильней, чем боль!",
+        "Тише, тише; шёпот: / выдох",
+        "[Verse 1]",
+        "[Chorus]",
+    ]
+
+    monkeypatch.undo()
+    clear_caches()
+    assert result == LyricMeter().analyze(edited, emotions={"joy": 0.4})
+    clear_caches()
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
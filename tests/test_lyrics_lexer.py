@@ -0,0 +1,97 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+from studiocore.analysis_context import AnalysisContext
+from studiocore.logical_engines import CommandInterpreter
+from studiocore.lyrics_lexer import BLANK, BPM_HEADER, COMMAND, HINT, KEY, LYRIC, SECTION, TAG, lex
+from studiocore.rhythm import LyricMeter
+from studiocore.text_utils import extract_commands_and_tags, extract_sections
+from studiocore.tone import ToneSyncEngine
+
+LYRICS = """[BPM: 96]
+[Verse 1]
+Я помню правду (тихо) в ля миноре Am
+[MOOD: dark][TEMPO: 90]
+
+Chorus:
+Light in the dark, F# major!"""
+
+
+def test_stream_covers_every_line_in_order():
+    stream = lex(LYRICS)
+    lines = LYRICS.split("\n")
+    assert [token.text for token in stream.lines] == lines
+    assert [LYRICS[token.start:token.end] for token in stream] == [token.text for token in stream]
+    assert [token.start for token in stream.lines] == sorted(token.start for token in stream.lines)
+    # Встроенные токены идут за токеном своей строки
+    line = -1
+    for token in stream:
+        if token.kind in (SECTION, BLANK, LYRIC):
+            line = token.line
+        assert token.line == line
+
+    assert [token.kind for token in stream.lines] == [SECTION, SECTION, LYRIC, LYRIC, BLANK, LYRIC, LYRIC]
+    assert [token.value for token in stream.of(SECTION)] == ["BPM: 96", "Verse 1"]
+    assert len(stream.of(LYRIC)) == 4 and len(stream.of(BLANK)) == 1
+    assert lex(LYRICS) is stream
+    assert AnalysisContext(LYRICS).tokens is stream
+    assert not lex("").of(TAG) and len(lex(None).lines) == 1
+
+
+def test_inline_markup_tokens():
+    stream = lex(LYRICS)
+    assert [token.text for token in stream.of(TAG)] == ["[BPM: 96]", "[Verse 1]", "[MOOD: dark]", "[TEMPO: 90]"]
+    # Как и прежний _COMMAND_RE: двоеточие необязательно, "[Verse 1]" — тоже команда
+    assert [(token.name, token.value) for token in stream.of(COMMAND)] == [
+        ("BPM", "96"),
+        ("V", "erse 1"),
+        ("MOOD", "dark"),
+        ("TEMPO", "90"),
+    ]
+    assert [token.value for token in stream.of(BPM_HEADER)] == ["96"]
+    assert [token.value for token in stream.of(HINT)] == ["тихо"]
+    assert [(token.name, token.value) for token in stream.of(KEY)] == [("A", "m"), ("F#", "major")]
+
+
+def test_consumers_read_the_shared_stream():
+    ctx = AnalysisContext(LYRICS)
+    commands = CommandInterpreter().detect_commands_in_text(ctx)
+    assert commands == CommandInterpreter().detect_commands_in_text(LYRICS)
+    assert [(command["type"], command["position"]) for command in commands] == [
+        ("bpm", 0),
+        ("v", 10),
+        ("mood", 57),
+        ("tempo", 69),
+    ]
+
+    cleaned, extracted, tags = extract_commands_and_tags(LYRICS)
+    assert cleaned == LYRICS
+    assert extracted["detected"] == commands
+    assert extracted["map"]["mood"] == "dark"
+    assert tags == ["[BPM: 96]", "[Verse 1]", "[MOOD: dark]", "[TEMPO: 90]"]
+
+    sections = extract_sections(ctx)
+    assert sections == extract_sections(LYRICS)
+    assert [section["tag"] for section in sections] == ["BPM: 96", "Verse 1"]
+    assert sections[1]["lines"][-1] == "Light in the dark, F# major!"
+
+    assert LyricMeter()._extract_header_bpm(ctx) == 96.0
+
+
+def test_detect_key_needs_a_standalone_mention():
+    tone = ToneSyncEngine()
+    assert tone.detect_key("[C minor] rain") == {"key": "C minor", "confidence": 0.75}
+    assert tone.detect_key("in (Am) tonight") == {"key": "A minor", "confidence": 0.75}
+    assert tone.detect_key(AnalysisContext("F# major!"))["key"] == "F# major"
+    # Слова, начинающиеся с ноты, ладом не считаются
+    assert tone.detect_key("a minimal amazing song")["key"] == "A"
+    assert tone.detect_key("любовь")["key"] == "auto"
+    assert tone.detect_key("")["key"] == "auto"
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
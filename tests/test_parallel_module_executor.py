@@ -0,0 +1,131 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import threading
+import time
+
+from studiocore.parallel_module_executor import (
+    ParallelModuleExecutor,
+    get_shared_executor,
+    get_shared_pool,
+    shutdown_shared_executor,
+)
+
+
+def _boom():
+    raise ValueError("boom")
+
+
+def test_executor_collects_results_by_name_and_isolates_errors():
+    executor = ParallelModuleExecutor(max_workers=4, timeout=5.0)
+    results = executor.execute_independent_modules([
+        ("sum", sum, ([1, 2, 3],), {}),
+        ("upper", str.upper, ("abc",), {}),
+        ("broken", _boom, (), {}),
+    ])
+    assert results == {"sum": 6, "upper": "ABC"}
+    assert executor.stats()["failed"] >= 1
+
+
+def test_shared_pool_is_reused_between_executors_and_requests():
+    pool = get_shared_pool()
+    ParallelModuleExecutor().execute_independent_modules([("a", len, ("xy",), {})])
+    ParallelModuleExecutor().execute_independent_modules([("b", len, ("xyz",), {})])
+    assert get_shared_pool() is pool
+    assert get_shared_executor() is get_shared_executor()
+
+
+def test_per_module_timeout_drops_only_slow_module():
+    release = threading.Event()
+    executor = ParallelModuleExecutor(timeout=5.0)
+    started = time.monotonic()
+    results = executor.execute_independent_modules([
+        ("slow", release.wait, (2.0,), {}, 0.05),
+        ("fast", len, ("abcd",), {}),
+    ])
+    release.set()
+    assert results == {"fast": 4}
+    assert time.monotonic() - started < 1.5
+    assert executor.stats()["timed_out"] >= 1
+
+
+def test_shutdown_cancelled_modules_leave_the_queue():
+    shutdown_shared_executor()
+    executor = ParallelModuleExecutor(max_workers=1)
+    release = threading.Event()
+    blocker = executor.submit(("blocker", release.wait, (2.0,), {}))
+    queued = [executor.submit((f"queued_{i}", len, ("x",), {})) for i in range(3)]
+    deadline = time.monotonic() + 2.0
+    while not blocker.running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    before = executor.stats()
+    assert before["queue_depth"] >= 3
+
+    shutdown_shared_executor(wait=False)
+    release.set()
+    blocker.result(timeout=2.0)
+    after = executor.stats()
+    assert all(future.cancelled() for future in queued)
+    assert after["queue_depth"] == before["queue_depth"] - 3
+    assert after["cancelled"] == before["cancelled"] + 3
+
+
+def test_nested_batches_run_inline_inside_workers():
+    executor = ParallelModuleExecutor()
+
+    def outer():
+        return executor.execute_independent_modules([("inner", len, ("abc",), {})])
+
+    results = executor.execute_independent_modules([("outer", outer, (), {})])
+    assert results == {"outer": {"inner": 3}}
+
+
+def test_inline_backend_runs_in_calling_thread():
+    executor = ParallelModuleExecutor(backend="inline")
+    caller = threading.get_ident()
+    results = executor.execute_independent_modules([
+        ("thread", threading.get_ident, (), {}),
+    ])
+    assert results == {"thread": caller}
+
+
+def test_process_backend_matches_thread_backend_for_phase1_engines():
+    from studiocore.emotion import AutoEmotionalAnalyzer, TruthLovePainEngine
+
+    text = "Я помню боль и свет, но правда сильнее страха!"
+    emotion, tlp = AutoEmotionalAnalyzer(), TruthLovePainEngine()
+    modules = [
+        ("emotion", emotion.analyze, (text,), {}),
+        ("tlp", tlp.analyze, (text,), {}),
+    ]
+    threaded = ParallelModuleExecutor(backend="thread").execute_independent_modules(modules)
+    processed = ParallelModuleExecutor(backend="process", process_workers=1).execute_independent_modules(modules)
+    assert processed == threaded
+
+
+def test_process_backend_counts_active_tasks():
+    from studiocore.emotion import TruthLovePainEngine
+
+    tlp = TruthLovePainEngine()
+    text = "Я помню боль и свет, но правда сильнее страха! " * 300
+    executor = ParallelModuleExecutor(backend="process", process_workers=1)
+    before = executor.stats()
+    futures = [executor.submit(("tlp", tlp.analyze, (text,), {})) for _ in range(3)]
+    during = executor.stats()
+    assert during["active"] >= before["active"] + 1
+    assert during["utilization"] > 0
+    assert during["process_pool_size"] >= 1
+    for future in futures:
+        future.result(timeout=30)
+    after = executor.stats()
+    assert after["active"] == before["active"]
+    assert after["queue_depth"] == before["queue_depth"]
+    assert after["completed"] == before["completed"] + 3
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -47,6 +47,24 @@ def test_phrase_engine_neutral_on_empty():
     assert packet.weight <= 0.2
 
 
+
+def test_batch_phrases_match_single_phrase_packets():
+    phrases = [
+        "Как лошадь, загнанная в мыле",
+        "",
+        "Любовь! какой чаруйный звук!",
+        "I feel the pain and the truth, cosmic wonder",
+        "   ",
+        "Как лошадь, загнанная в мыле",
+    ]
+    batch_engine = EmotionEngine()
+    batch = batch_engine.analyze_phrases(phrases)
+    single = [EmotionEngine().analyze_phrase(phrase) for phrase in phrases]
+    assert [p.to_dict() for p in batch] == [p.to_dict() for p in single]
+    assert batch_engine.get_phrase_packets() == batch
+    assert batch_engine.analyze_phrases([]) == []
+
+
 # StudioCore Signature Block (Do Not Remove)
 # Author: Сергей Бауэр (@Sbauermaner)
 # Fingerprint: StudioCore-FP-2025-SB-9fd72e27
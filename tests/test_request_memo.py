@@ -0,0 +1,89 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import importlib.util
+import sys
+import types
+from collections import Counter
+
+from studiocore.request_memo import RequestMemo, memo_key
+
+
+def test_memo_computes_each_input_once():
+    calls = []
+
+    def route(emotions, dominant):
+        calls.append(dominant)
+        return {"genre": dominant}
+
+    memo = RequestMemo({"emotion": {"joy": 1.0}})
+    assert "emotion" in memo and memo.get("emotion") == {"joy": 1.0}
+    key = memo_key(({"joy": 1.0}, "joy"))
+    first = memo.get_or_compute("genre_route", route, {"joy": 1.0}, "joy", key=key)
+    second = memo.get_or_compute("genre_route", route, {"joy": 1.0}, "joy", key=key)
+    assert first is second and calls == ["joy"]
+    memo.get_or_compute("genre_route", route, {"sad": 1.0}, "sad", key=memo_key(({"sad": 1.0}, "sad")))
+    assert memo.invocations["genre_route"] == 2
+    assert memo_key({"b": 1, "a": 2}) == memo_key({"a": 2, "b": 1})
+
+
+def test_phase5_does_not_invoke_engines_twice(monkeypatch):
+    # security_patches лежит вне пакета (в сборке деплоя) — здесь достаточно
+    # пропускающей проверки ввода
+    stub = types.ModuleType("security_patches")
+    stub.validate_text_input = lambda text: text
+    monkeypatch.setitem(sys.modules, "security_patches", stub)
+    if importlib.util.find_spec("studiocore.result_deduplicator") is None:
+        # Дедупликатор тоже поставляется отдельно; пустой результат → поля
+        # собираются из значений фаз
+        dedup = types.ModuleType("studiocore.result_deduplicator")
+        dedup.ResultDeduplicator = type(
+            "ResultDeduplicator",
+            (),
+            {"__init__": lambda self, **kwargs: None, "deduplicate_results": lambda self, results: {}},
+        )
+        monkeypatch.setitem(sys.modules, "studiocore.result_deduplicator", dedup)
+    from studiocore.emotion import EmotionEngine
+    from studiocore.monolith_v4_3_1 import StudioCore
+
+    core = StudioCore()
+    counts = Counter()
+
+    def counting(name, fn):
+        def wrapper(*args, **kwargs):
+            counts[name] += 1
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(
+        EmotionEngine,
+        "build_emotion_profile",
+        counting("build_emotion_profile", EmotionEngine.build_emotion_profile),
+    )
+    monkeypatch.setattr(
+        core.color_engine, "resolve_color_wave", counting("color", core.color_engine.resolve_color_wave)
+    )
+    if core.genre_routing_engine is not None:
+        monkeypatch.setattr(
+            core.genre_routing_engine, "route", counting("genre_route", core.genre_routing_engine.route)
+        )
+    for attr, name in (("emotion", "emotion"), ("tlp", "tlp")):
+        engine = getattr(core, attr)
+        monkeypatch.setattr(engine, "analyze", counting(name, engine.analyze))
+
+    core.analyze("Я помню свет в окне,\nи боль уходит прочь.\n\nНо я люблю тебя сильней, чем ночь.")
+
+    assert counts["build_emotion_profile"] == 1
+    assert counts["emotion"] == 1
+    assert counts["tlp"] == 1
+    assert counts["color"] <= 2  # узел графа + пересчёт со style только при нейтральной волне
+    assert counts["genre_route"] <= 1
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
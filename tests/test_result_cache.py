@@ -0,0 +1,65 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import time
+
+from studiocore import config as config_module
+from studiocore.result_cache import AnalysisResultCache
+
+
+def test_key_uses_normalized_text_and_request_options():
+    key = AnalysisResultCache.make_key("Я иду домой...\r\n", "auto", {"genre": "rock"})
+    assert key == AnalysisResultCache.make_key("Я иду  домой…\n", "auto", {"genre": "rock"})
+    assert key != AnalysisResultCache.make_key("Я иду домой...", "female", {"genre": "rock"})
+    assert key != AnalysisResultCache.make_key("Я иду домой...", "auto", {"genre": "pop"})
+
+
+def test_config_change_changes_the_key(monkeypatch):
+    key = AnalysisResultCache.make_key("текст")
+    assert AnalysisResultCache.make_key("текст") == key
+
+    monkeypatch.setitem(config_module.DEFAULT_CONFIG, "suno_version", "v-test")
+    top_level = AnalysisResultCache.make_key("текст")
+    assert top_level != key
+    monkeypatch.setitem(config_module.DEFAULT_CONFIG["executor"], "backend", "inline")
+    assert AnalysisResultCache.make_key("текст") not in (key, top_level)
+
+    monkeypatch.undo()
+    assert AnalysisResultCache.make_key("текст") == key
+
+
+def test_cache_returns_defensive_copies_and_counts_hits():
+    cache = AnalysisResultCache()
+    result = {"emotions": {"joy": 0.7}, "bpm": 120}
+    cache.put("k", result)
+    result["bpm"] = 90
+
+    first = cache.get("k")
+    first["emotions"]["joy"] = 0.0
+    assert cache.get("k") == {"emotions": {"joy": 0.7}, "bpm": 120}
+    assert cache.get("missing") is None
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+
+
+def test_cache_enforces_entry_byte_and_ttl_limits():
+    cache = AnalysisResultCache(max_entries=2, max_bytes=10_000)
+    for name in ("a", "b", "c"):
+        cache.put(name, {"value": name})
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+    assert not cache.put("huge", {"text": "x" * 20_000})
+
+    short_lived = AnalysisResultCache(ttl_seconds=0.01)
+    short_lived.put("k", {"value": 1})
+    time.sleep(0.02)
+    assert short_lived.get("k") is None
+    assert short_lived.stats()["expirations"] == 1
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
@@ -0,0 +1,99 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+from studiocore import section_table as table_module
+from studiocore.analysis_context import AnalysisContext
+from studiocore.bounded_cache import clear_caches
+from studiocore.logical_engines import TextStructureEngine
+from studiocore.rhythm import LyricMeter
+from studiocore.section_intelligence import SectionIntelligenceEngine
+from studiocore.section_parser import SectionParser
+from studiocore.section_table import section_table
+from studiocore.text_utils import (
+    _annotate_duplicate_sections,
+    _detect_duplicate_sections,
+    extract_raw_blocks,
+    extract_sections,
+)
+
+LYRICS = """[Verse 1]
+Я помню правду
+и боль
+
+[Chorus]
+Light in the dark
+we rise
+
+[Verse 2]
+Тише, тише (шепотом)
+
+[Chorus]
+light in the  dark
+We rise
+"""
+
+
+def test_table_holds_ranges_hashes_and_duplicate_groups():
+    table = section_table(LYRICS)
+    lines = LYRICS.split("\n")
+    assert table.tags == ["Verse 1", "Chorus 1", "Verse 2", "Chorus 2"]
+    assert [(section.start, section.end) for section in table] == [(1, 3), (5, 7), (9, 10), (12, 14)]
+    for section in table:
+        assert tuple(lines[section.start:section.end]) == section.lines
+    chorus_1, chorus_2 = table.sections[1], table.sections[3]
+    assert chorus_1.digest == chorus_2.digest != table.sections[0].digest
+    assert table.duplicate_groups == ((1, 3),)
+    assert [section.group for section in table] == [-1, 0, -1, 0]
+    assert list(table.blocks) == extract_raw_blocks(LYRICS)
+    assert AnalysisContext(LYRICS).section_table is table
+
+
+def test_extract_sections_returns_fresh_copies():
+    sections = extract_sections(LYRICS)
+    assert sections == section_table(LYRICS).as_dicts()
+    sections[0]["tag"] = "Outro"
+    sections[0]["lines"].append("x")
+    assert extract_sections(LYRICS)[0] == {"tag": "Verse 1", "lines": ["Я помню правду", "и боль"]}
+
+
+def test_consumers_share_one_parse(monkeypatch):
+    clear_caches()
+    calls = []
+    original = table_module._extract_sections
+    monkeypatch.setattr(table_module, "_extract_sections", lambda ctx: calls.append(ctx.text) or original(ctx))
+
+    ctx = AnalysisContext(LYRICS)
+    engine = TextStructureEngine()
+    assert engine.auto_section_split(ctx) == [section.text for section in ctx.section_table]
+    assert [item["tag"] for item in engine.section_metadata()] == ctx.section_table.tags
+    assert list(LyricMeter()._build_sections(ctx)) == ["VERSE_1", "CHORUS_1", "VERSE_2", "CHORUS_2"]
+    SectionIntelligenceEngine().analyze(ctx, None)
+    assert SectionParser().parse(ctx).sections == engine.auto_section_split(LYRICS)
+    assert calls == [LYRICS]
+    clear_caches()
+
+
+def test_duplicate_helpers():
+    sections = [
+        {"tag": "Chorus", "lines": ["La la", "we rise"]},
+        {"tag": "Verse", "lines": ["Я"]},
+        {"tag": "Hook", "lines": ["la la  ", "We rise"]},
+        {"tag": "Bridge", "lines": []},
+        {"tag": "Outro", "lines": []},
+    ]
+    assert _detect_duplicate_sections(sections) == {0: [2], 2: [0]}
+    _annotate_duplicate_sections(sections)
+    # Группа пустых секций тоже нумеруется, если в тексте есть настоящие повторы
+    assert [section["tag"] for section in sections] == ["Chorus 1", "Verse", "Chorus 2", "Bridge 1", "Bridge 2"]
+
+    unique = [{"tag": "Bridge", "lines": []}, {"tag": "Outro", "lines": []}]
+    _annotate_duplicate_sections(unique)
+    assert [section["tag"] for section in unique] == ["Bridge", "Outro"]
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
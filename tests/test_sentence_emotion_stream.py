@@ -0,0 +1,54 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import pytest
+
+from studiocore.engine_registry import get_engine
+from studiocore.logical_engines import EmotionEngine, _split_sentences
+
+TEXT = (
+    "Я помню правду, но любовь сильней, чем боль! "
+    "Тело, мягкий шелк, touch and embrace... "
+    "Soft body, tender pleasure? "
+    "RAGE and FEAR 🔥🔥 — I am broken. "
+    "Солнце, смех и радость."
+)
+
+
+def test_sentence_scores_match_per_sentence_analysis():
+    engine = EmotionEngine()
+    analyzer = get_engine("emotion.auto")
+    stream = engine.sentence_stream(TEXT)
+    sentences = _split_sentences(TEXT)
+    assert stream.sentences == sentences
+    for idx, sentence in enumerate(sentences):
+        assert stream.scores(idx) == analyzer.analyze(sentence)
+    expected = [round(sum(analyzer.analyze(s).values()), 3) for s in sentences]
+    assert engine.emotion_intensity_curve(TEXT) == expected
+
+
+def test_window_curves_and_bounds():
+    engine = EmotionEngine()
+    analyzer = get_engine("emotion.auto")
+    stream = engine.sentence_stream(TEXT)
+    sentences = stream.sentences
+    curve = engine.emotion_intensity_curve(TEXT, window=2)
+    assert len(curve) == len(sentences) - 1
+    # Окно из двух предложений без пограничных совпадений = анализ их склейки
+    pair = analyzer.analyze(" ".join(sentences[:2]))
+    assert stream.scores(0, 2).keys() == pair.keys()
+    assert all(abs(stream.scores(0, 2)[k] - pair[k]) < 1e-9 for k in pair)
+    assert engine.emotion_intensity_curve(TEXT, window=99) == [
+        round(sum(stream.scores(0, len(sentences)).values()), 3)
+    ]
+    assert engine.emotion_intensity_curve("   ") == []
+    with pytest.raises(IndexError):
+        stream.scores(2, 2)
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
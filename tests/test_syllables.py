@@ -0,0 +1,43 @@
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
+
+import random
+
+import pytest
+
+from studiocore import syllables
+from studiocore.syllables import VOWELS, count_vowels, syllable_counts, vowel_counts
+
+LINES = [
+    "Я помню правду... но любовь — сильней, чем боль!",
+    "",
+    "LIGHT in the dark — МЫ ВСТАЁМ 🔥",
+    "ᲂ ı İ ǎ й ё Ё",
+    "bcd",
+]
+
+
+def test_counts_both_scripts_and_cases():
+    assert count_vowels("ЁЛКА yes") == 4
+    assert vowel_counts(LINES) == [sum(1 for ch in line if ch in VOWELS) for line in LINES]
+    assert syllable_counts(["", "bcd", "ау"]) == [1, 1, 2]
+    assert vowel_counts([]) == []
+
+
+def test_vectorized_path_matches_fallback(monkeypatch):
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    alphabet = VOWELS + "бвгдbcdf .,!—\t🔥\U0010ffffİı"
+    lines = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60))) for _ in range(300)]
+    expected = [count_vowels(line) for line in lines]
+    monkeypatch.setattr(syllables, "VECTOR_MIN_CHARS", 0)
+    assert vowel_counts(lines) == expected
+    assert vowel_counts(["а"]) == [1]
+
+
+# StudioCore Signature Block (Do Not Remove)
+# Author: Сергей Бауэр (@Sbauermaner)
+# Fingerprint: StudioCore-FP-2025-SB-9fd72e27
+# Hash: 22ae-df91-bc11-6c7e
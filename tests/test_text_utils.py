@@ -1,6 +1,16 @@
 import logging
+import random
+import re
 
-from studiocore.text_utils import translate_text_for_analysis
+from studiocore.text_utils import (
+    OTHER_SCRIPT,
+    detect_scripts,
+    extract_raw_blocks,
+    normalize_text_preserve_symbols,
+    route_stems,
+    stem_script,
+    translate_text_for_analysis,
+)
 
 
 def test_translate_text_for_analysis_passthrough_languages(caplog):
@@ -25,3 +35,69 @@ def test_translate_text_for_analysis_simulates_for_unsupported(caplog):
     assert translated == "texto"
     assert was_translated is True
     assert any("Simulating translation" in record.message for record in caplog.records)
+
+
+def test_detect_scripts_reports_presence_not_majority():
+    assert detect_scripts("Я люблю rock") == {"cyrillic", "latin"}
+    assert detect_scripts("ТИШИНА, 123!") == {"cyrillic"}
+    assert detect_scripts("Café") == {"latin"}
+    assert detect_scripts("... 42 ❤") == frozenset()
+
+
+def test_stem_script_and_routing():
+    assert stem_script("ну да") == "cyrillic"
+    assert stem_script("cosmic wonder") == "latin"
+    assert stem_script("rock-н-ролл") == OTHER_SCRIPT
+    assert stem_script("'") == OTHER_SCRIPT
+    stems = ["боль", "pain", "rock-н-ролл", "тишь"]
+    assert route_stems(stems, frozenset({"cyrillic"})) == ["боль", "rock-н-ролл", "тишь"]
+    assert route_stems(stems, frozenset()) == ["rock-н-ролл"]
+
+
+def reference_normalize(text):
+    """Прежняя построчная нормализация (эталон для проверки однопроходной)."""
+    if not text:
+        return ""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = re.sub(r"[\u0000-\u0008\u000B\u000C\u000E-\u001F]", "", text)
+    text = re.sub(r"[\u200B\u200C\u200D\u2060\uFEFF]", "", text)
+    out_lines = []
+    blank_count = 0
+    for line in text.split("\n"):
+        line = re.sub(r"\.{3,}", "…", line)
+        line = re.sub(r"[–—-]{2,}", "—", line)
+        line = re.sub(r"\s*—\s*", " — ", line)
+        line = re.sub(r"[ \t]+", " ", line).strip()
+        if line == "":
+            blank_count += 1
+            if blank_count <= 2:
+                out_lines.append("")
+        else:
+            blank_count = 0
+            out_lines.append(line)
+    return "\n".join(out_lines).strip()
+
+
+FUZZ_ALPHABET = list("aя .…-–—()\n\t!?\u00a0\u2028\u3000\x85\x00\x0b\x1f\u200b\ufeff") + [
+    "\r\n", "\r", "...", "--", " — ", " (hint) ", "\n\n", "\n \n"
+]
+
+
+def test_normalization_matches_line_by_line_reference_on_fuzzed_text():
+    rng = random.Random(20)
+    for _ in range(5000):
+        text = "".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 40)))
+        assert normalize_text_preserve_symbols(text) == reference_normalize(text), repr(text)
+        reference_blocks = [
+            block.strip()
+            for block in re.split(r"\n\s*\n", re.sub(r"\s*\([^\)]+\)", "", text).strip())
+            if block.strip()
+        ]
+        assert extract_raw_blocks(text) == reference_blocks, repr(text)
+
+
+def test_normalization_examples():
+    text = "\ufeffЯ  помню...\t\n\n\n\n\nправду -- и — боль\u200b\r\n(шепотом)\r\n\n[Chorus]"
+    assert normalize_text_preserve_symbols(text) == "Я помню…\n\n\nправду — и — боль\n(шепотом)\n\n[Chorus]"
+    assert normalize_text_preserve_symbols("— — —") == "— — —"
+    assert extract_raw_blocks(normalize_text_preserve_symbols(text)) == ["Я помню…", "правду — и — боль", "[Chorus]"]